@@ -1,2 +1,10 @@
-from flasynk._asynchronous import how_to_get_asynchronous_status, AsyncNamespaceProxy
 from flasynk.version import __version__
+
+
+def __getattr__(name):
+    # Flask related features are only imported when used
+    if name in ("how_to_get_asynchronous_status", "AsyncNamespaceProxy"):
+        from flasynk import _asynchronous
+
+        return getattr(_asynchronous, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
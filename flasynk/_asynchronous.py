@@ -1,28 +1,100 @@
+import collections
+import functools
+import hashlib
 import json
 import logging
+import math
+import queue
 import re
+import sys
+import threading
+import time
 from urllib.parse import urlparse
 
 import flask
-from flask_restplus import Resource, fields, Namespace
+from flask_restplus import Resource, fields, marshal, Namespace
+from flask_restplus.utils import merge, unpack
+
+from flasynk import _compression, _durations, _marshalling, json_encoding
+from flasynk.admission import AdmissionPolicy
+from flasynk.exceptions import ResultNotAvailable
+from flasynk.metrics import MetricsSink
+from flasynk.result_cache import ResultCache
+from flasynk.retention import RetentionPolicy
 
 
 logger = logging.getLogger("asynchronous_server")
 
 _STATUS_ENDPOINT = "status"
 _RESULT_ENDPOINT = "result"
+_EVENTS_ENDPOINT = "events"
+_NOT_CACHED = object()
 
 
 class AsyncNamespaceProxy:
     """
     Flask rest-plus Namespace proxy.
-    This proxy namespace add a decorator 'async_route' that will generate 2 extra endpoint : /status and /result
-    to query the status or the result of the huey task
+    This proxy namespace add a decorator 'async_route' that will generate 3 extra endpoint : /status, /result and /events
+    to query the status (of one or many tasks) or the result of the huey task (or to be notified of status changes)
     """
 
-    def __init__(self, namespace: Namespace, async_app):
+    def __init__(
+        self,
+        namespace: Namespace,
+        async_app,
+        max_status_wait: float = 30,
+        events_interval: float = 1,
+        result_cache: ResultCache = None,
+        result_cache_control: str = "public, max-age=31536000, immutable",
+        retry_after_floor: int = 1,
+        retry_after_ceiling: int = 60,
+        compression_min_size: int = 1024,
+        compression_level: int = 6,
+        max_result_wait: float = 0,
+        metrics: MetricsSink = None,
+    ):
+        """
+        :param namespace: Flask rest-plus Namespace that will be proxied.
+        :param async_app: Celery or Huey application.
+        :param max_status_wait: Maximum number of seconds a status request (using wait parameter)
+        or an events stream can be held. Default to 30 seconds.
+        :param events_interval: Number of seconds between two checks of tasks status watched by events streams
+        (tasks of every stream of this proxy are checked at once). Default to 1 second.
+        :param result_cache: Cache used to keep results retrieved while checking status,
+        so that they are not retrieved again from backend when requested. Default to no cache.
+        Same cache should be provided to every AsyncNamespaceProxy.
+        :param result_cache_control: Cache-Control header value sent alongside results (as results never change).
+        Default to caching for a year. Set to None to not send this header.
+        :param retry_after_floor: Minimum number of seconds advised (Retry-After header) to wait before checking
+        status of a task that is still computing. Default to 1 second.
+        :param retry_after_ceiling: Maximum number of seconds advised (Retry-After header) to wait before checking
+        status of a task that is still computing. Default to 60 seconds.
+        :param compression_min_size: Minimum size (in bytes) of results and statuses to compress
+        (according to client Accept-Encoding header, using brotli or zstd if installed, gzip otherwise).
+        Default to 1KB. Set to None to never compress.
+        :param compression_level: Compression level. Default to 6.
+        :param max_result_wait: Maximum number of seconds a result request can be held, waiting for a task that is
+        still computing. Default to not waiting (status URL is provided straight away).
+        :param metrics: flasynk.metrics sink receiving measures of asynchronous routes (such as PrometheusMetrics).
+        Default to not measuring.
+        """
         self.__namespace = namespace
-        self.__async_app = async_app
+        # Backend specifics are resolved once and for all
+        self.__backend = _Backend(async_app)
+        self.__settings = _ProxySettings(
+            max_status_wait=max_status_wait,
+            events_interval=events_interval,
+            result_cache=result_cache,
+            result_cache_control=result_cache_control,
+            retry_after_floor=retry_after_floor,
+            retry_after_ceiling=retry_after_ceiling,
+            compression_min_size=compression_min_size,
+            compression_level=compression_level,
+            max_result_wait=max_result_wait,
+            metrics=metrics,
+        )
+        # Events streams of every route share the same polling loop
+        self.__tasks_watcher = _TasksWatcher(self.__backend, events_interval)
         task_status_model = namespace.model(
             "AsyncTaskStatusModel",
             {
@@ -32,6 +104,14 @@ class AsyncNamespaceProxy:
                 ),
             },
         )
+        self.__tasks_status_request_model = namespace.model(
+            "AsyncTasksStatusRequestModel",
+            {
+                "task_ids": fields.List(
+                    fields.String, required=True, description="Tasks Ids."
+                )
+            },
+        )
         self.how_to_get_asynchronous_status_doc = {
             "responses": {
                 202: (
@@ -45,7 +125,15 @@ class AsyncNamespaceProxy:
     def __getattr__(self, name):
         return getattr(self.__namespace, name)
 
-    def asynchronous_route(self, endpoint: str, serializer=None, to_response=None):
+    def asynchronous_route(
+        self,
+        endpoint: str,
+        serializer=None,
+        to_response=None,
+        stream: bool = False,
+        admission: AdmissionPolicy = None,
+        retention: RetentionPolicy = None,
+    ):
         """
         Add an async route endpoint.
         :param endpoint: value of the exposes endpoint ex: /foo
@@ -54,10 +142,42 @@ class AsyncNamespaceProxy:
         :param to_response: In case the task result needs to be processed before returning it to client.
         This is a function taking the task result as parameter (and path parameters if needed) and returning a result.
         Default to returning unmodified task result.
+        :param stream: Only applies if serializer is a list. Each item of the result is serialized and sent
+        to the client one after the other (in a chunked response) instead of serializing the whole list at once.
+        Memory usage is lower for big results (especially if to_response returns a generator). Default to False.
+        :param admission: flasynk.admission policy deciding if the route can be called (and thus a task sent).
+        Route is answered with a 503 or a 429 (and a Retry-After header) otherwise. Default to always calling route.
+        :param retention: flasynk.retention policy deciding how long a result is kept once read (Huey only).
+        Default to Huey behavior (result is removed once read, unless stored with an expiry).
         :return: route decorator
         """
+        if stream and not isinstance(serializer, list):
+            raise ValueError("Only results serialized as a list can be streamed.")
+        if retention is not None:
+            self.__backend.module._check_retention(self.__backend.async_app, retention)
 
         def wrapper(cls):
+            route_metrics = (
+                _RouteMetrics(self.__settings.metrics, endpoint)
+                if self.__settings.metrics
+                else None
+            )
+            backend = (
+                _Backend(self.__backend.async_app, retention)
+                if retention
+                else self.__backend
+            )
+            if route_metrics:
+                backend = _MeasuredBackend(backend, route_metrics)
+            if admission is not None:
+                _admission_control(self.__namespace, backend, admission, route_metrics)(
+                    cls
+                )
+            if route_metrics:
+                cls.method_decorators = [
+                    *cls.method_decorators,
+                    _measured_acceptance(route_metrics),
+                ]
             # Create the requested route
             self.__namespace.route(endpoint)(cls)
             # Create two additional endpoints to retrieve status and result
@@ -65,40 +185,197 @@ class AsyncNamespaceProxy:
                 cls.__name__,
                 endpoint,
                 self.__namespace,
-                self.__async_app,
+                backend,
+                self.__tasks_status_request_model,
                 serializer,
                 to_response,
+                stream,
+                self.__settings,
+                self.__tasks_watcher,
+                route_metrics,
             )
             return cls
 
         return wrapper
 
 
+class _ProxySettings:
+    """
+    Settings shared by every asynchronous route of an AsyncNamespaceProxy (see AsyncNamespaceProxy for details).
+    """
+
+    def __init__(
+        self,
+        max_status_wait: float,
+        events_interval: float,
+        result_cache: ResultCache,
+        result_cache_control: str,
+        retry_after_floor: int,
+        retry_after_ceiling: int,
+        compression_min_size: int,
+        compression_level: int,
+        max_result_wait: float,
+        metrics: MetricsSink,
+    ):
+        self.max_status_wait = max_status_wait
+        self.events_interval = events_interval
+        self.result_cache = result_cache
+        self.result_cache_control = result_cache_control
+        self.retry_after_floor = retry_after_floor
+        self.retry_after_ceiling = retry_after_ceiling
+        self.compression_min_size = compression_min_size
+        self.compression_level = compression_level
+        self.max_result_wait = max_result_wait
+        self.metrics = metrics
+
+
+def _admission_control(
+    namespace: Namespace,
+    backend: "_Backend",
+    admission: AdmissionPolicy,
+    route_metrics: "_RouteMetrics",
+):
+    """
+    Answer with a Retry-After header (without calling the route) if the call is not admitted.
+    """
+
+    def admission_decorator(func):
+        @functools.wraps(func)
+        def admitted_func(*args, **kwargs):
+            retry_after = admission.admit(backend.queue_status)
+            if route_metrics:
+                route_metrics.increment(
+                    "flasynk_admissions_total",
+                    decision="admitted" if retry_after is None else "shed",
+                )
+            if retry_after is not None:
+                return _json_response(
+                    {"message": admission.message},
+                    admission.status_code,
+                    {"Retry-After": str(retry_after)},
+                )
+            return func(*args, **kwargs)
+
+        return admitted_func
+
+    def wrapper(cls):
+        cls.method_decorators = [*cls.method_decorators, admission_decorator]
+        return namespace.doc(
+            responses={
+                admission.status_code: (
+                    admission.message,
+                    None,
+                    {
+                        "headers": {
+                            "Retry-After": "Number of seconds to wait before calling again."
+                        }
+                    },
+                )
+            }
+        )(cls)
+
+    return wrapper
+
+
 def _base_url() -> str:
     """
     Return client original requested URL in order to make sure it works behind a reverse proxy as well.
     Without parameters.
     """
     if "X-Original-Request-Uri" in flask.request.headers:
-        parsed = urlparse(flask.request.headers["X-Original-Request-Uri"])
-        return f'{flask.request.scheme}://{flask.request.headers["Host"]}{parsed.path}'
+        return _original_url(
+            flask.request.scheme,
+            flask.request.headers["Host"],
+            flask.request.headers["X-Original-Request-Uri"],
+        )
     return flask.request.base_url
 
 
+def _original_url(scheme: str, host: str, original_request_uri: str) -> str:
+    """
+    URL (without parameters) requested by client, as provided by a reverse proxy (X-Original-Request-Uri).
+    """
+    return f"{scheme}://{host}{urlparse(original_request_uri).path}"
+
+
 def how_to_get_asynchronous_status(async_task) -> flask.Response:
     url = f"{_base_url()}/{_STATUS_ENDPOINT}/{async_task.id}"
-    status = flask.Response()
-    status.status_code = 202
-    status.content_type = "application/json"
+    status = _json_response({"task_id": async_task.id, "url": url}, 202)
     status.headers["location"] = url
-    status.data = json.dumps({"task_id": async_task.id, "url": url})
     return status
 
 
-def _get_asynchronous_status(async_task_id: str, async_app) -> flask.Response:
-    async_module = _module(async_app)
-    async_task = async_module._get_asynchronous_task(async_task_id, async_app)
-    if async_module._result_is_available(async_task):
+def _json_response(data, status_code: int = 200, headers=None) -> flask.Response:
+    # Ends with a new line as Flask and Flask rest-plus JSON responses
+    return flask.Response(
+        f"{json_encoding.dumps(data)}\n",
+        status_code,
+        headers,
+        mimetype="application/json",
+    )
+
+
+def _json_encoded(func):
+    """
+    Encode returned data (and optional status code and headers) as a JSON response.
+    Responses are returned as is.
+    """
+
+    @functools.wraps(func)
+    def json_func(*args, **kwargs):
+        response = func(*args, **kwargs)
+        if isinstance(response, flask.Response):
+            return response
+        return _json_response(*unpack(response))
+
+    return json_func
+
+
+def _requested_wait(max_wait: float) -> float:
+    """
+    Return the number of seconds client requested to wait for (using wait query parameter).
+    """
+    return _bounded_wait(flask.request.args.get("wait"), max_wait)
+
+
+def _bounded_wait(wait: str, max_wait: float) -> float:
+    """
+    Number of seconds to wait for, as requested by client (wait query parameter value, None if not provided).
+    Bounded between 0 and max_wait (not waiting if an invalid, infinite or NaN number of seconds is requested).
+    """
+    try:
+        wait = float(wait or 0)
+    except ValueError:
+        return 0
+    if not math.isfinite(wait):
+        return 0
+    return min(max(wait, 0), max_wait)
+
+
+def _retry_after(details: dict, floor: int, ceiling: int) -> int:
+    """
+    Number of seconds client should wait before checking status of a task that is still computing.
+    Up to the task estimated end (eta), as computed from the durations of the recent tasks with the same name.
+    """
+    eta = details.get("eta")
+    remaining = eta.timestamp() - time.time() if eta is not None else 0
+    return max(floor, min(ceiling, math.ceil(remaining)))
+
+
+def _get_asynchronous_status(
+    async_task_id: str,
+    backend: "_Backend",
+    wait: float = 0,
+    result_cache: ResultCache = None,
+    retry_after: tuple = None,
+) -> flask.Response:
+    if wait:
+        async_task = backend.wait_for_task(async_task_id, wait)
+    else:
+        async_task = backend.get_task(async_task_id)
+    if backend.result_is_available(async_task):
+        if result_cache is not None:
+            _cache_asynchronous_result(async_task_id, backend, result_cache)
         status = flask.Response()
         status.status_code = 303
         status.headers["location"] = _base_url().replace(
@@ -106,27 +383,260 @@ def _get_asynchronous_status(async_task_id: str, async_app) -> flask.Response:
         )
         return status
 
-    # TODO Add more information such as request initial time, and maybe intermediate client status
-    return flask.jsonify({"state": async_module._get_current_state(async_task)})
+    details = backend.details(async_task)
+    status = _json_response({"state": backend.current_state(async_task), **details})
+    if retry_after is not None:
+        status.headers["Retry-After"] = str(_retry_after(details, *retry_after))
+    return status
+
+
+def _cache_asynchronous_result(
+    async_task_id: str, backend: "_Backend", result_cache: ResultCache
+):
+    if async_task_id in result_cache:
+        return  # Status was already checked since result is available
+
+    try:
+        result = backend.peek_result(async_task_id)
+    except Exception:
+        # Task failure will be reported when result will be requested
+        logger.debug(f"{async_task_id} result will not be cached as task failed.")
+        return
+    result_cache.put(async_task_id, result)
+
+
+def _get_asynchronous_result(
+    async_task_id: str, backend: "_Backend", result_cache: ResultCache
+):
+    if result_cache is not None:
+        if backend.result_read_is_destructive():
+            result = result_cache.pop(async_task_id, _NOT_CACHED)
+            if result is not _NOT_CACHED:
+                # Result is consumed as it would have been without the cache
+                backend.discard_result(async_task_id)
+        else:
+            result = result_cache.get(async_task_id, _NOT_CACHED)
+        if result is not _NOT_CACHED:
+            return result
+
+    return backend.get_result(async_task_id)
+
+
+def _get_asynchronous_statuses(async_task_ids: list, backend: "_Backend") -> dict:
+    """
+    Status of every provided task (retrieved at once).
+    URL to fetch results from is provided for tasks with an available result, current state otherwise.
+    """
+    async_tasks = backend.get_tasks(async_task_ids)
+    result_url = f"{_base_url()[:-len(_STATUS_ENDPOINT)]}{_RESULT_ENDPOINT}"
+    return {
+        async_task_id: {"url": f"{result_url}/{async_task_id}"}
+        if backend.result_is_available(async_task)
+        else {"state": backend.current_state(async_task)}
+        for async_task_id, async_task in zip(async_task_ids, async_tasks)
+    }
+
+
+def _server_sent_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json_encoding.dumps(data)}\n\n"
+
+
+class _TasksWatcher:
+    """
+    Single polling loop checking the tasks of every events stream of an AsyncNamespaceProxy (within this process).
+    Every watched task is retrieved at once (per interval), each stream is then notified with the polled tasks.
+    Polling (in a daemon thread) only happens while at least one stream is subscribed.
+    """
+
+    def __init__(self, backend: "_Backend", interval: float):
+        self._backend = backend
+        self._interval = interval
+        self._subscriptions = {}
+        self._lock = threading.Lock()
+        self._polling = False
+
+    def subscribe(self, async_task_ids: list) -> queue.Queue:
+        """
+        Watch provided tasks (until unsubscribed).
+        :return: Queue providing the latest polled tasks (per task id), or the exception raised while polling.
+        """
+        subscription = queue.Queue(maxsize=1)
+        with self._lock:
+            self._subscriptions[subscription] = async_task_ids
+            if not self._polling:
+                self._polling = True
+                threading.Thread(
+                    target=self._poll, name="flasynk-events", daemon=True
+                ).start()
+        return subscription
+
+    def watch(self, subscription: queue.Queue, async_task_ids: list):
+        """
+        Change the tasks watched by a subscription.
+        """
+        with self._lock:
+            self._subscriptions[subscription] = async_task_ids
+
+    def unsubscribe(self, subscription: queue.Queue):
+        with self._lock:
+            self._subscriptions.pop(subscription, None)
+
+    def _poll(self):
+        while True:
+            time.sleep(self._interval)
+            with self._lock:
+                # Only subscriptions watching the polled tasks are notified
+                subscriptions = list(self._subscriptions)
+                async_task_ids = list(
+                    dict.fromkeys(
+                        async_task_id
+                        for async_task_ids in self._subscriptions.values()
+                        for async_task_id in async_task_ids
+                    )
+                )
+                if not async_task_ids:
+                    self._polling = False
+                    return
+            try:
+                polled = dict(
+                    zip(async_task_ids, self._backend.get_tasks(async_task_ids))
+                )
+            except Exception as e:
+                logger.exception("Unable to check status of watched tasks.")
+                polled = e
+            for subscription in subscriptions:
+                _notify(subscription, polled)
+
+
+def _notify(subscription: queue.Queue, polled):
+    """
+    Replace the polled tasks that were not consumed yet (by a slow client) by the latest ones.
+    """
+    try:
+        subscription.get_nowait()
+    except queue.Empty:
+        pass
+    subscription.put_nowait(polled)
+
+
+def _get_asynchronous_events(
+    async_task_ids: list,
+    backend: "_Backend",
+    tasks_watcher: _TasksWatcher,
+    interval: float,
+    max_duration: float,
+) -> flask.Response:
+    """
+    Stream (as Server-Sent Events) every state transition of the provided tasks.
+    A state event is sent on each transition and a result-ready event is sent once result is available.
+    Stream ends once all results are available (or after max_duration seconds, client is then expected to reconnect).
+    Tasks are checked once when stream starts, then by the polling loop shared by every stream.
+    """
+    result_url = f"{_base_url()[:-len(_EVENTS_ENDPOINT)]}{_RESULT_ENDPOINT}"
+
+    def events():
+        states = {}
+        remaining_task_ids = list(dict.fromkeys(async_task_ids))
+        end = time.monotonic() + max_duration
+        yield f"retry: {int(interval * 1000)}\n\n"
+        subscription = tasks_watcher.subscribe(list(remaining_task_ids))
+        try:
+            polled = dict(
+                zip(remaining_task_ids, backend.get_tasks(list(remaining_task_ids)))
+            )
+            while True:
+                if isinstance(polled, Exception):
+                    raise polled
+
+                for async_task_id in list(remaining_task_ids):
+                    async_task = polled[async_task_id]
+                    if backend.result_is_available(async_task):
+                        remaining_task_ids.remove(async_task_id)
+                        yield _server_sent_event(
+                            "result-ready",
+                            {
+                                "task_id": async_task_id,
+                                "url": f"{result_url}/{async_task_id}",
+                            },
+                        )
+                        continue
+
+                    state = backend.current_state(async_task)
+                    if states.get(async_task_id) != state:
+                        states[async_task_id] = state
+                        yield _server_sent_event(
+                            "state", {"task_id": async_task_id, "state": state}
+                        )
+
+                remaining_duration = end - time.monotonic()
+                if not remaining_task_ids or remaining_duration <= 0:
+                    return
+
+                tasks_watcher.watch(subscription, list(remaining_task_ids))
+                try:
+                    polled = subscription.get(timeout=remaining_duration)
+                except queue.Empty:
+                    return  # Client is expected to reconnect
+        finally:
+            tasks_watcher.unsubscribe(subscription)
+
+    return flask.Response(
+        flask.stream_with_context(events()),
+        mimetype="text/event-stream",
+        headers={"Cache-Control": "no-cache"},
+    )
 
 
 def _build_result_endpoints(
     base_class,
     endpoint_root: str,
     namespace: Namespace,
-    async_app,
+    backend: "_Backend",
+    tasks_status_request_model,
     response_model,
     to_response: callable,
+    stream: bool,
+    settings: _ProxySettings,
+    tasks_watcher: _TasksWatcher,
+    route_metrics: "_RouteMetrics",
 ):
+    result_cache = settings.result_cache
+    compressed = _conditional_compression(
+        settings.compression_min_size, settings.compression_level, result_cache
+    )
+    result_marshalling = (
+        _streamed_marshalling(namespace, response_model[0], route_metrics)
+        if stream
+        else _conditional_marshalling(namespace, response_model, route_metrics)
+    )
+    if to_response and route_metrics:
+        to_response = route_metrics.timed("flasynk_to_response_seconds", to_response)
+
     @namespace.route(f"{endpoint_root}/{_RESULT_ENDPOINT}/<string:task_id>")
+    @namespace.doc(
+        responses={
+            200: "Success",
+            202: (
+                "Task is still computing (or unknown).",
+                None,
+                {"headers": {"location": "URL to fetch computation status from."}},
+            ),
+            304: "Result was not modified since provided ETag (If-None-Match).",
+        }
+    )
     class AsyncTaskResult(Resource):
-        @_conditional_marshalling(namespace, response_model)
+        @_measured_result(route_metrics)
+        @compressed
+        @_conditional_http_caching(response_model, settings.result_cache_control)
+        @_result_availability(backend, settings.max_result_wait)
+        @_json_encoded
+        @result_marshalling
         @namespace.doc(f"get_{_snake_case(base_class)}_result")
         def get(self, task_id: str, **kwargs):
             """
             Retrieve result for provided task.
             """
-            result = _module(async_app)._get_asynchronous_result(async_app, task_id)
+            result = _get_asynchronous_result(task_id, backend, result_cache)
             return to_response(result, **kwargs) if to_response else result
 
     @namespace.route(f"{endpoint_root}/{_STATUS_ENDPOINT}/<string:task_id>")
@@ -141,9 +651,44 @@ def _build_result_endpoints(
                             description="Indicates current computation state.",
                             required=True,
                             example="PENDING",
-                        )
+                        ),
+                        "progress": fields.Nested(
+                            namespace.model(
+                                "AsyncProgress",
+                                {
+                                    "percent": fields.Float(
+                                        description="Percentage of the computation that is done."
+                                    ),
+                                    "stage": fields.String(
+                                        description="Current computation stage."
+                                    ),
+                                    "counters": fields.Raw(
+                                        description="Any other progress indicator."
+                                    ),
+                                },
+                            ),
+                            description="Progress reported by the task (if any).",
+                        ),
+                        "enqueued": fields.DateTime(
+                            description="Time at which task was sent (if known)."
+                        ),
+                        "started": fields.DateTime(
+                            description="Time at which task started computing (if started)."
+                        ),
+                        "updated": fields.DateTime(
+                            description="Time at which task state or progress last changed (if known)."
+                        ),
+                        "eta": fields.DateTime(
+                            description="Estimated time at which result will be available "
+                            "(according to the duration of recent tasks)."
+                        ),
                     },
                 ),
+                {
+                    "headers": {
+                        "Retry-After": "Number of seconds to wait before checking status again."
+                    }
+                },
             ),
             303: (
                 "Result is available.",
@@ -157,24 +702,308 @@ def _build_result_endpoints(
         }
     )
     class AsyncTaskStatus(Resource):
-        @namespace.doc(f"get_{_snake_case(base_class)}_status")
+        @namespace.doc(
+            f"get_{_snake_case(base_class)}_status",
+            params={
+                "wait": {
+                    "description": "Number of seconds to wait for the result to be available. "
+                    f"Up to {settings.max_status_wait} seconds.",
+                    "type": "number",
+                    "in": "query",
+                }
+            },
+        )
+        @compressed
+        @_measured_status(route_metrics)
         def get(self, task_id: str, **kwargs):
             """
             Retrieve status for provided task.
             """
-            return _get_asynchronous_status(task_id, async_app)
+            return _get_asynchronous_status(
+                task_id,
+                backend,
+                _requested_wait(settings.max_status_wait),
+                result_cache,
+                (settings.retry_after_floor, settings.retry_after_ceiling),
+            )
 
+    @namespace.route(f"{endpoint_root}/{_STATUS_ENDPOINT}")
+    @namespace.doc(
+        responses={
+            200: (
+                "Status of every requested task (per task id). "
+                "URL to fetch results from is provided if result is available, current state otherwise."
+            ),
+            400: "task_ids is not a list of task ids.",
+        }
+    )
+    class AsyncTasksStatus(Resource):
+        @namespace.doc(f"get_{_snake_case(base_class)}_statuses")
+        @namespace.expect(tasks_status_request_model)
+        @compressed
+        @_json_encoded
+        def post(self, **kwargs):
+            """
+            Retrieve status for provided tasks.
+            """
+            task_ids = (flask.request.get_json(silent=True) or {}).get("task_ids")
+            if not isinstance(task_ids, list) or not all(
+                isinstance(task_id, str) for task_id in task_ids
+            ):
+                return {"message": "task_ids must be a list of task ids."}, 400
+            return _get_asynchronous_statuses(task_ids, backend)
 
-def _conditional_marshalling(namespace: Namespace, response_model):
+    @namespace.route(f"{endpoint_root}/{_EVENTS_ENDPOINT}")
+    @namespace.doc(
+        responses={
+            200: (
+                "Server-Sent Events stream. "
+                "A state event is sent on every task state transition "
+                "and a result-ready event (containing the URL to fetch results from) once result is available."
+            ),
+            400: "No task_id was provided.",
+        }
+    )
+    class AsyncTaskEvents(Resource):
+        @namespace.doc(
+            f"get_{_snake_case(base_class)}_events",
+            params={
+                "task_id": {
+                    "description": "Task Id. Can be provided multiple times.",
+                    "type": "array",
+                    "items": {"type": "string"},
+                    "collectionFormat": "multi",
+                    "in": "query",
+                    "required": True,
+                }
+            },
+        )
+        def get(self, **kwargs):
+            """
+            Stream status changes for provided tasks.
+            """
+            task_ids = flask.request.args.getlist("task_id")
+            if not task_ids:
+                return {"message": "At least one task_id must be provided."}, 400
+            return _get_asynchronous_events(
+                task_ids,
+                backend,
+                tasks_watcher,
+                settings.events_interval,
+                settings.max_status_wait,
+            )
+
+
+def _serializer_signature(response_model) -> str:
+    if response_model is None:
+        return ""
+    model = response_model[0] if isinstance(response_model, list) else response_model
+    return json.dumps(
+        [isinstance(response_model, list), model.name, model.__schema__],
+        sort_keys=True,
+    )
+
+
+def _result_etag(task_id: str, serializer_signature: str, mask_header: str) -> str:
+    """
+    Strong ETag of a result, derived from task id, serializer and client requested fields (if serialized).
+    """
+    mask = flask.request.headers.get(mask_header, "") if mask_header else ""
+    return hashlib.sha1(
+        json.dumps([task_id, serializer_signature, mask]).encode()
+    ).hexdigest()
+
+
+def _conditional_http_caching(response_model, cache_control: str):
+    """
+    Results never change once task is over. As a result:
+     * a strong ETag (derived from task id, serializer and requested fields) is sent alongside results,
+     * a request with a matching If-None-Match is answered by a 304 (without querying the backend),
+     * the Cache-Control header is sent alongside results (if provided).
+    Those headers are only sent alongside an existing result (not alongside a 202 or an error).
+    """
+    serializer_signature = _serializer_signature(response_model)
+
+    def wrapper(func):
+        @functools.wraps(func)
+        def cached_func(self, task_id: str, **kwargs):
+            # Client requested fields only matters if result is serialized
+            mask_header = (
+                flask.current_app.config["RESTPLUS_MASK_HEADER"]
+                if response_model is not None
+                else None
+            )
+            etag = _result_etag(task_id, serializer_signature, mask_header)
+
+            def add_caching_headers(response: flask.Response) -> flask.Response:
+                if response.status_code in (200, 304):
+                    response.set_etag(etag)
+                    if mask_header:
+                        response.vary.add(mask_header)
+                    if cache_control:
+                        response.headers["Cache-Control"] = cache_control
+                return response
+
+            # Compressed results have their own ETag (suffixed by content encoding)
+            for representation_etag in [etag] + [
+                f"{etag}-{encoding}" for encoding in _compression.encoders
+            ]:
+                if flask.request.if_none_match.contains_weak(representation_etag):
+                    etag = representation_etag
+                    flask.after_this_request(add_caching_headers)
+                    return flask.Response(status=304)
+
+            flask.after_this_request(add_caching_headers)
+            return func(self, task_id, **kwargs)
+
+        return cached_func
+
+    return wrapper
+
+
+def _result_availability(backend: "_Backend", max_wait: float):
+    """
+    Answer a 202 (providing status URL) if result was requested while task is still computing.
+    Result is waited for (up to max_wait seconds) beforehand.
+    """
+
+    def wrapper(func):
+        @functools.wraps(func)
+        def available_func(self, task_id: str, **kwargs):
+            try:
+                return func(self, task_id, **kwargs)
+            except ResultNotAvailable:
+                if not max_wait or not backend.result_is_available(
+                    backend.wait_for_task(task_id, max_wait)
+                ):
+                    url = _base_url().replace(
+                        f"/{_RESULT_ENDPOINT}/", f"/{_STATUS_ENDPOINT}/"
+                    )
+                    return _json_response(
+                        {"task_id": task_id, "url": url}, 202, {"location": url}
+                    )
+            return func(self, task_id, **kwargs)
+
+        return available_func
+
+    return wrapper
+
+
+def _conditional_compression(min_size: int, level: int, result_cache: ResultCache):
+    def wrapper(func):
+        if min_size is None:
+            return func
+
+        @functools.wraps(func)
+        def compressed_func(*args, **kwargs):
+            response = func(*args, **kwargs)
+            # Registered once response is computed so that it is compressed once every other header is set
+            flask.after_this_request(
+                functools.partial(
+                    _compression.compress,
+                    min_size=min_size,
+                    level=level,
+                    result_cache=result_cache,
+                )
+            )
+            return response
+
+        return compressed_func
+
+    return wrapper
+
+
+def _conditional_marshalling(
+    namespace: Namespace, response_model, route_metrics: "_RouteMetrics"
+):
     def wrapper(func):
-        if response_model is not None:
-            return namespace.marshal_with(
-                response_model[0]
-                if isinstance(response_model, list)
-                else response_model,
-                as_list=isinstance(response_model, list),
-            )(func)
-        return func
+        if response_model is None:
+            return func
+
+        as_list = isinstance(response_model, list)
+        model = response_model[0] if as_list else response_model
+        # Documented the same way as Namespace.marshal_with
+        func.__apidoc__ = merge(
+            getattr(func, "__apidoc__", {}),
+            {
+                "responses": {200: (None, [model] if as_list else model)},
+                "__mask__": True,
+            },
+        )
+        marshal_data = _marshalling.compile_model(model, ordered=namespace.ordered)
+
+        @functools.wraps(func)
+        def marshalled_func(*args, **kwargs):
+            response = func(*args, **kwargs)
+            marshal_response = _masked(marshal_data, model, namespace.ordered)
+            if route_metrics:
+                marshal_response = route_metrics.timed(
+                    "flasynk_marshalling_seconds", marshal_response
+                )
+            if isinstance(response, tuple):
+                data, code, headers = unpack(response)
+                return marshal_response(data), code, headers
+            return marshal_response(response)
+
+        return marshalled_func
+
+    return wrapper
+
+
+def _masked(marshal_data: callable, model, ordered: bool) -> callable:
+    """
+    Return the function used to marshal data according to client requested fields (if any).
+    """
+    mask = flask.request.headers.get(flask.current_app.config["RESTPLUS_MASK_HEADER"])
+    if mask:
+        # Compiled marshalling only handle the whole model
+        return functools.partial(marshal, fields=model, mask=mask, ordered=ordered)
+    return marshal_data
+
+
+def _streamed_marshalling(
+    namespace: Namespace, item_model, route_metrics: "_RouteMetrics"
+):
+    """
+    Serialize (and send) list items one after the other, as they are iterated over.
+    """
+    marshal_item = _marshalling.compile_model(item_model, ordered=namespace.ordered)
+
+    def wrapper(func):
+        # Documented the same way as a non streamed list
+        func.__apidoc__ = merge(
+            getattr(func, "__apidoc__", {}),
+            {"responses": {200: (None, [item_model])}, "__mask__": True},
+        )
+
+        @functools.wraps(func)
+        def streamed_func(*args, **kwargs):
+            items = func(*args, **kwargs)
+            marshal_masked_item = _masked(marshal_item, item_model, namespace.ordered)
+
+            def serialized_items():
+                marshalling_time = 0
+                yield "["
+                for index, item in enumerate(items):
+                    if index:
+                        yield ","
+                    start = time.perf_counter()
+                    marshalled_item = marshal_masked_item(item)
+                    marshalling_time += time.perf_counter() - start
+                    yield json_encoding.dumps(marshalled_item)
+                # Ends with a new line as non streamed JSON responses
+                yield "]\n"
+                if route_metrics:
+                    route_metrics.observe(
+                        "flasynk_marshalling_seconds", marshalling_time
+                    )
+
+            return flask.Response(
+                flask.stream_with_context(serialized_items()),
+                mimetype="application/json",
+            )
+
+        return streamed_func
 
     return wrapper
 
@@ -186,16 +1015,211 @@ def _snake_case(name: str) -> str:
     return re.sub("([a-z0-9])([A-Z])", r"\1_\2", s1).lower()
 
 
+class _RouteMetrics:
+    """
+    Measures of an asynchronous route, sent to a metrics sink (labelled with the route).
+    """
+
+    # Tasks for which status is never checked again are forgotten past this number
+    _MAX_TRACKED_TASKS = 10000
+
+    def __init__(self, sink: MetricsSink, route: str):
+        self.sink = sink
+        self.labels = {"route": route}
+        self._polls = collections.OrderedDict()
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: float = 1, **labels):
+        self.sink.increment(name, {**self.labels, **labels}, value)
+
+    def observe(self, name: str, value: float, **labels):
+        self.sink.observe(name, {**self.labels, **labels}, value)
+
+    def timed(self, name: str, func: callable, **labels) -> callable:
+        """
+        Observe the time spent in func (in seconds).
+        """
+
+        @functools.wraps(func)
+        def timed_func(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self.observe(name, time.perf_counter() - start, **labels)
+
+        return timed_func
+
+    def status_polled(self, async_task_id: str, available: bool):
+        with self._lock:
+            polls = self._polls.pop(async_task_id, 0) + 1
+            if not available:
+                self._polls[async_task_id] = polls
+                while len(self._polls) > self._MAX_TRACKED_TASKS:
+                    self._polls.popitem(last=False)
+        self.increment(
+            "flasynk_status_polls_total",
+            outcome="available" if available else "computing",
+        )
+        if available:
+            self.observe("flasynk_status_polls_per_task", polls)
+
+
+def _measured_acceptance(route_metrics: _RouteMetrics):
+    def wrapper(func):
+        @functools.wraps(func)
+        def measured_func(*args, **kwargs):
+            response = func(*args, **kwargs)
+            if getattr(response, "status_code", None) == 202:
+                route_metrics.increment("flasynk_tasks_accepted_total")
+            return response
+
+        return measured_func
+
+    return wrapper
+
+
+def _measured_status(route_metrics: _RouteMetrics):
+    def wrapper(func):
+        if not route_metrics:
+            return func
+
+        @functools.wraps(func)
+        def measured_func(self, task_id: str, **kwargs):
+            response = func(self, task_id, **kwargs)
+            route_metrics.status_polled(task_id, response.status_code == 303)
+            return response
+
+        return measured_func
+
+    return wrapper
+
+
+def _measured_result(route_metrics: _RouteMetrics):
+    def wrapper(func):
+        if not route_metrics:
+            return func
+
+        def measure(response: flask.Response) -> flask.Response:
+            route_metrics.increment(
+                "flasynk_results_total", code=str(response.status_code)
+            )
+            if not response.is_streamed:
+                route_metrics.observe(
+                    "flasynk_response_bytes", response.calculate_content_length()
+                )
+            return response
+
+        @functools.wraps(func)
+        def measured_func(*args, **kwargs):
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Registered last so that response is measured as sent (compressed)
+                flask.after_this_request(measure)
+
+        return measured_func
+
+    return wrapper
+
+
+class _Backend:
+    """
+    Asynchronous application (Celery or Huey) alongside the module handling its specifics.
+    """
+
+    def __init__(self, async_app, retention: RetentionPolicy = None):
+        self.async_app = async_app
+        self.module = _module(async_app)
+        self.retention = retention
+        self.recent_histograms = _durations.RecentHistograms()
+
+    def get_task(self, async_task_id: str):
+        return self.module._get_asynchronous_task(async_task_id, self.async_app)
+
+    def get_tasks(self, async_task_ids: list) -> list:
+        return self.module._get_asynchronous_tasks(async_task_ids, self.async_app)
+
+    def queue_status(self) -> (int, float):
+        return self.module._queue_status(self.async_app)
+
+    def wait_for_task(self, async_task_id: str, timeout: float):
+        return self.module._wait_for_asynchronous_task(
+            async_task_id, self.async_app, timeout
+        )
+
+    def result_is_available(self, async_task) -> bool:
+        return self.module._result_is_available(async_task)
+
+    def current_state(self, async_task) -> str:
+        return self.module._get_current_state(async_task)
+
+    def details(self, async_task) -> dict:
+        return self.module._get_task_details(
+            self.async_app, async_task, self.recent_histograms
+        )
+
+    def get_result(self, async_task_id: str):
+        if self.retention is not None:
+            return self.module._get_retained_result(
+                self.async_app, async_task_id, self.retention
+            )
+        return self.module._get_asynchronous_result(self.async_app, async_task_id)
+
+    def peek_result(self, async_task_id: str):
+        return self.module._peek_asynchronous_result(self.async_app, async_task_id)
+
+    def result_read_is_destructive(self) -> bool:
+        # Results are read once from cache, retention policy decides if they can be read again from backend
+        return self.retention is not None or self.module._result_read_is_destructive(
+            self.async_app
+        )
+
+    def discard_result(self, async_task_id: str):
+        if self.retention is not None:
+            self.module._apply_retention(self.async_app, async_task_id, self.retention)
+        else:
+            self.module._discard_asynchronous_result(self.async_app, async_task_id)
+
+
+class _MeasuredBackend:
+    """
+    Backend keeping track of the time spent querying it (per operation).
+    Every other attribute is the one of the measured backend.
+    """
+
+    _MEASURED_OPERATIONS = (
+        "get_task",
+        "get_tasks",
+        "details",
+        "get_result",
+        "peek_result",
+    )
+
+    def __init__(self, backend: _Backend, route_metrics: _RouteMetrics):
+        self._backend = backend
+        self._operations = {
+            operation: route_metrics.timed(
+                "flasynk_backend_seconds",
+                getattr(backend, operation),
+                operation=operation,
+            )
+            for operation in self._MEASURED_OPERATIONS
+        }
+
+    def __getattr__(self, name):
+        operation = self._operations.get(name)
+        return operation if operation else getattr(self._backend, name)
+
+
 def _module(async_app):
-    try:
-        import huey
+    # Huey application cannot be provided without huey being imported
+    huey = sys.modules.get("huey")
+    if huey is not None and isinstance(async_app, huey.api.Huey):
+        import flasynk.huey_specifics
 
-        if isinstance(async_app, huey.api.Huey):
-            import flasynk.huey_specifics
+        return flasynk.huey_specifics
 
-            return flasynk.huey_specifics
-    except ModuleNotFoundError:
-        pass  # If huey cannot be imported then it means Celery is used
     import flasynk.celery_specifics
 
     return flasynk.celery_specifics
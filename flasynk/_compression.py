@@ -0,0 +1,77 @@
+import gzip
+import hashlib
+
+import flask
+
+from flasynk.result_cache import ResultCache
+
+
+def _brotli_encoder():
+    import brotli
+
+    return lambda data, level: brotli.compress(data, quality=min(level, 11))
+
+
+def _zstd_encoder():
+    import zstandard
+
+    return lambda data, level: zstandard.ZstdCompressor(level=level).compress(data)
+
+
+def _available_encoders() -> dict:
+    """
+    Content encodings that can be used, ordered by preference (when client has no preference).
+    """
+    encoders = {}
+    for encoding, encoder in (("br", _brotli_encoder), ("zstd", _zstd_encoder)):
+        try:
+            encoders[encoding] = encoder()
+        except ModuleNotFoundError:
+            pass  # Optional dependency not installed
+    encoders["gzip"] = lambda data, level: gzip.compress(data, compresslevel=level)
+    return encoders
+
+
+encoders = _available_encoders()
+
+
+def compress(
+    response: flask.Response, min_size: int, level: int, result_cache: ResultCache
+) -> flask.Response:
+    """
+    Compress response body using the best content encoding accepted by client.
+    Response is sent as is if it is not a success, if it is streamed or if it is smaller than min_size bytes.
+    Compressed body is kept in result_cache (if provided) so that the same body is not compressed twice.
+    """
+    if (
+        response.status_code != 200
+        or response.is_streamed
+        or "Content-Encoding" in response.headers
+    ):
+        return response
+
+    response.vary.add("Accept-Encoding")
+    encoding = flask.request.accept_encodings.best_match(encoders)
+    if not encoding:
+        return response
+
+    data = response.get_data()
+    if len(data) < min_size:
+        return response
+
+    compressed = None
+    if result_cache is not None:
+        cache_key = f"{encoding}:{level}:{hashlib.sha1(data).hexdigest()}"
+        compressed = result_cache.get(cache_key)
+    if compressed is None:
+        compressed = encoders[encoding](data, level)
+        if result_cache is not None:
+            result_cache.put(cache_key, compressed)
+
+    response.set_data(compressed)
+    response.headers["Content-Encoding"] = encoding
+    etag, weak = response.get_etag()
+    if etag:
+        # Each representation of the result has its own strong ETag
+        response.set_etag(f"{etag}-{encoding}", weak)
+    return response
@@ -0,0 +1,53 @@
+from datetime import datetime
+
+from flasynk import _durations
+
+
+def progress(percent: float, stage: str, counters: dict) -> dict:
+    """
+    Progress reported by a task (indicators that were not reported are not provided).
+    """
+    progress = {"percent": percent, "stage": stage, "counters": counters or None}
+    return {name: value for name, value in progress.items() if value is not None}
+
+
+def status_details(task_details: dict, histograms: list, now: float) -> dict:
+    """
+    Progress, timestamps and estimated end of a task, as provided by the status endpoint.
+    :param task_details: Task details as stored by the backend (with progress as a dict).
+    :param histograms: Durations of the recent tasks with the same name (as returned by Redis HGETALL).
+    """
+    status_details = {}
+    if task_details.get("progress"):
+        status_details["progress"] = task_details["progress"]
+    status_details.update(
+        _durations.status_details(task_details, _durations.counts(histograms), now)
+    )
+    return status_details
+
+
+def observation(component_type: str, value, unit: str = None) -> dict:
+    """
+    Passing health check detail.
+    """
+    observation = {
+        "componentType": component_type,
+        "observedValue": value,
+        "status": "pass",
+        "time": datetime.utcnow().isoformat(),
+    }
+    if unit:
+        observation["observedUnit"] = unit
+    return observation
+
+
+def failure(component_type: str, output: str) -> dict:
+    """
+    Failing health check detail.
+    """
+    return {
+        "componentType": component_type,
+        "status": "fail",
+        "time": datetime.utcnow().isoformat(),
+        "output": output,
+    }
@@ -0,0 +1,107 @@
+import bisect
+import collections
+from datetime import datetime, timezone
+
+# Upper bounds (in seconds) of task durations histogram buckets
+_BUCKETS = (0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600, 1800, 3600)
+# Durations are counted per window of this number of seconds (current and previous windows are considered)
+_WINDOW = 60 * 60
+
+
+def windows(now: float) -> list:
+    """
+    Windows to consider when estimating durations (the current one and the previous one).
+    """
+    current = int(now // _WINDOW)
+    return [current, current - 1]
+
+
+class RecentHistograms:
+    """
+    Histograms recently read from Redis (per task name), so that they are not read again on every status check.
+    """
+
+    def __init__(self, ttl: float = 10):
+        """
+        :param ttl: Number of seconds histograms are kept before being read again. Default to 10 seconds.
+        """
+        self.ttl = ttl
+        self._histograms = {}
+
+    def get(self, task_name: str, now: float) -> list:
+        """
+        Histograms of the considered windows, None if they were not read recently.
+        """
+        expiry, histograms = self._histograms.get(task_name, (0, None))
+        return histograms if now < expiry else None
+
+    def put(self, task_name: str, histograms: list, now: float):
+        self._histograms[task_name] = (now + self.ttl, histograms)
+
+
+def record(pipeline, key: str, kind: str, duration: float):
+    """
+    Count duration in a Redis hash (one field per kind and bucket) expiring with its window.
+    :param pipeline: Redis pipeline (or client).
+    :param kind: wait (time spent in queue) or run (time spent computing).
+    """
+    pipeline.hincrby(key, f"{kind}:{bisect.bisect_left(_BUCKETS, duration)}", 1)
+    pipeline.expire(key, 2 * _WINDOW)
+
+
+def counts(histograms: list) -> collections.Counter:
+    """
+    Merge histograms (as returned by Redis HGETALL) of every considered window.
+    """
+    merged = collections.Counter()
+    for histogram in histograms:
+        for field, count in histogram.items():
+            merged[field.decode() if isinstance(field, bytes) else field] += int(count)
+    return merged
+
+
+def median(durations: collections.Counter, kind: str) -> float:
+    """
+    Upper bound of the bucket holding the median duration, None if no duration was counted.
+    """
+    per_bucket = [durations[f"{kind}:{index}"] for index in range(len(_BUCKETS) + 1)]
+    total = sum(per_bucket)
+    cumulated = 0
+    # Durations above the last bucket are considered as the last bucket upper bound
+    for bound, count in zip(_BUCKETS + _BUCKETS[-1:], per_bucket):
+        cumulated += count
+        if total and cumulated * 2 >= total:
+            return bound
+
+
+def status_details(
+    timestamps: dict, durations: collections.Counter, now: float
+) -> dict:
+    """
+    Task timestamps (enqueued, started, updated) and estimated end (eta) as provided by the status endpoint.
+    :param timestamps: Number of seconds since epoch of every known timestamp.
+    :param durations: Durations counted for tasks with the same name.
+    """
+    details = {
+        name: timestamps[name]
+        for name in ("enqueued", "started", "updated")
+        if timestamps.get(name)
+    }
+    eta = _estimated_end(details, durations)
+    if eta is not None:
+        details["eta"] = max(now, eta)
+    return {
+        name: datetime.fromtimestamp(float(timestamp), timezone.utc)
+        for name, timestamp in details.items()
+    }
+
+
+def _estimated_end(timestamps: dict, durations: collections.Counter) -> float:
+    run = median(durations, "run")
+    if run is None:
+        return None
+    if "started" in timestamps:
+        return float(timestamps["started"]) + run
+    wait = median(durations, "wait")
+    if wait is not None and "enqueued" in timestamps:
+        return float(timestamps["enqueued"]) + wait + run
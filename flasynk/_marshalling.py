@@ -0,0 +1,148 @@
+import collections
+import functools
+
+from flask_restplus import fields, marshal
+from flask_restplus.marshalling import make
+
+
+def compile_model(model, ordered: bool = False, skip_none: bool = False):
+    """
+    Compile model into a function marshalling data the same way as flask_restplus.marshal would.
+    Fields lookup and dispatch are performed once (here) instead of for every marshalled object.
+
+    :param model: Flask rest-plus model (or dict of fields).
+    :param ordered: Marshal into OrderedDict instead of dict.
+    :param skip_none: Do not output fields with None (or empty dict) value.
+    :return: Function taking data to marshal as parameter and returning marshalled data.
+    """
+    resolved = getattr(model, "resolved", model)
+    if getattr(model, "__mask__", None) or any(
+        isinstance(make(field), fields.Wildcard)
+        for field in resolved.values()
+        if not isinstance(field, dict)
+    ):
+        # Masked models and wildcards are not worth the optimization
+        return functools.partial(
+            marshal, fields=model, skip_none=skip_none, ordered=ordered
+        )
+
+    outputs = [
+        (key, _compile_field(key, field, ordered, skip_none))
+        for key, field in resolved.items()
+    ]
+    container = collections.OrderedDict if ordered else dict
+
+    def marshal_data(data):
+        if isinstance(data, (list, tuple)):
+            return [marshal_data(item) for item in data]
+        items = [(key, output(data)) for key, output in outputs]
+        if skip_none:
+            items = [
+                (key, value)
+                for key, value in items
+                if value is not None and value != collections.OrderedDict()
+            ]
+        return container(items)
+
+    return marshal_data
+
+
+def _compile_field(key, field, ordered: bool, skip_none: bool):
+    if isinstance(field, dict):
+        return lambda obj: marshal(obj, field, skip_none=skip_none, ordered=ordered)
+
+    field = make(field)
+    field_type = type(field)
+    if field_type is fields.Nested:
+        return _compile_nested(
+            _value_getter(key, field.attribute), field, ordered=ordered
+        )
+    if (
+        field_type is fields.List
+        and type(field.container) is fields.Nested
+        and field.container.attribute is None
+    ):
+        return _compile_nested_list(key, field)
+    if field_type.output is fields.Raw.output:
+        return _compile_raw(key, field)
+    return lambda obj: field.output(key, obj, ordered=ordered)
+
+
+def _value_getter(key, attribute):
+    """
+    Same as flask_restplus.fields.get_value with a shortcut for dictionaries.
+    """
+    key = key if attribute is None else attribute
+    if not isinstance(key, str) or "." in key:
+        return functools.partial(fields.get_value, key)
+
+    def get_value(obj):
+        if type(obj) is dict:
+            return obj[key] if key in obj else getattr(obj, key, None)
+        return fields.get_value(key, obj)
+
+    return get_value
+
+
+def _compile_raw(key, field: fields.Raw):
+    """
+    Same as flask_restplus.fields.Raw.output
+    """
+    get_value = _value_getter(key, field.attribute)
+    format_value = field.format
+    mask = field.mask
+
+    def output(obj):
+        value = get_value(obj)
+        if value is None:
+            default = field._v("default")
+            return format_value(default) if default else default
+
+        try:
+            data = format_value(value)
+        except fields.MarshallingError as e:
+            raise fields.MarshallingError(
+                f'Unable to marshal field "{key}" value "{value}": {e}'
+            )
+        return mask.apply(data) if mask else data
+
+    return output
+
+
+def _compile_nested(get_value, field: fields.Nested, ordered: bool):
+    """
+    Same as flask_restplus.fields.Nested.output
+    """
+    # Compiled on first use to handle recursive models
+    nested = []
+
+    def output(obj):
+        value = get_value(obj)
+        if value is None:
+            if field.allow_null:
+                return None
+            elif field.default is not None:
+                return field.default
+
+        if not nested:
+            nested.append(compile_model(field.model, ordered, field.skip_none))
+        return nested[0](value)
+
+    return output
+
+
+def _compile_nested_list(key, field: fields.List):
+    """
+    Same as flask_restplus.fields.List.output (with a Nested container)
+    """
+    get_value = _value_getter(key, field.attribute)
+    # Items are always marshalled as dict (not ordered) by flask_restplus
+    item_output = _compile_nested(lambda item: item, field.container, ordered=False)
+
+    def output(obj):
+        value = get_value(obj)
+        if fields.is_indexable_but_not_string(value) and not isinstance(value, dict):
+            return [item_output(item) for item in value]
+        return field.output(key, obj)
+
+    return output
@@ -0,0 +1,15 @@
+import time
+
+
+def delays(timeout: float, clock=None):
+    """
+    Number of seconds to wait before each poll (using the same backoff as huey blocking result retrieval),
+    until timeout seconds are elapsed.
+    :param clock: Function returning the current time (in seconds). Default to time.monotonic.
+    """
+    clock = clock or time.monotonic
+    end = clock() + timeout
+    delay = 0.1
+    while clock() < end:
+        yield max(min(delay, end - clock()), 0)
+        delay = min(delay * 1.15, 1.0)
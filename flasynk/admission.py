@@ -0,0 +1,148 @@
+import logging
+import math
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionPolicy:
+    """
+    Decide if an asynchronous route can be called (and thus a task sent) before calling it.
+    Calls that are not admitted are answered with status_code and a Retry-After header.
+    """
+
+    status_code = 503
+    message = "Too many tasks are waiting to be computed."
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.admitted = 0
+        self.shed = 0
+
+    def admit(self, queue_status) -> int:
+        """
+        :param queue_status: Function returning a tuple with the number of queued tasks and the number of seconds
+        the oldest one has been waiting for (None if unknown).
+        :return: Number of seconds to wait before calling the route again, None if call is admitted.
+        """
+        retry_after = self._retry_after(queue_status)
+        with self._lock:
+            if retry_after is None:
+                self.admitted += 1
+            else:
+                self.shed += 1
+        return retry_after
+
+    def statistics(self) -> dict:
+        return {"admitted": self.admitted, "shed": self.shed}
+
+    def _retry_after(self, queue_status) -> int:
+        raise NotImplementedError()
+
+
+class _QueuePolicy(AdmissionPolicy):
+    """
+    Queue status is retrieved at most once every refresh_interval seconds.
+    """
+
+    def __init__(self, refresh_interval: float):
+        super().__init__()
+        self.refresh_interval = refresh_interval
+        self._queue_status = None
+        self._next_refresh = 0
+
+    def _cached_queue_status(self, queue_status) -> (int, float):
+        now = time.monotonic()
+        with self._lock:
+            if now < self._next_refresh:
+                return self._queue_status
+            # Other calls use the previous status in the meantime
+            self._next_refresh = now + self.refresh_interval
+        try:
+            status = queue_status()
+        except Exception:
+            # Calls are admitted as usual, they will fail if the broker cannot be reached
+            logger.exception("Unable to retrieve queue status.")
+            return self._queue_status
+        with self._lock:
+            self._queue_status = status
+        return status
+
+
+class MaxQueueLength(_QueuePolicy):
+    """
+    Shed load once too many tasks are queued.
+    """
+
+    def __init__(
+        self, max_length: int, retry_after: int = 5, refresh_interval: float = 1
+    ):
+        """
+        :param max_length: Maximum number of queued tasks.
+        :param retry_after: Number of seconds client should wait before calling again. Default to 5 seconds.
+        :param refresh_interval: Number of seconds during which queue length is not queried again.
+        Default to 1 second.
+        """
+        super().__init__(refresh_interval)
+        self.max_length = max_length
+        self.retry_after = retry_after
+
+    def _retry_after(self, queue_status) -> int:
+        status = self._cached_queue_status(queue_status)
+        if status is not None and status[0] >= self.max_length:
+            return self.retry_after
+
+
+class MaxQueueWait(_QueuePolicy):
+    """
+    Shed load once the oldest queued task has been waiting for too long.
+    New tasks are expected to wait at least as long.
+    Calls are always admitted if waiting time is unknown (Celery using another broker than Redis).
+    """
+
+    def __init__(self, max_wait: float, refresh_interval: float = 1):
+        """
+        :param max_wait: Maximum number of seconds the oldest queued task can be waiting for.
+        :param refresh_interval: Number of seconds during which queue status is not queried again.
+        Default to 1 second.
+        """
+        super().__init__(refresh_interval)
+        self.max_wait = max_wait
+
+    def _retry_after(self, queue_status) -> int:
+        status = self._cached_queue_status(queue_status)
+        if status is not None and status[1] is not None and status[1] > self.max_wait:
+            return max(1, math.ceil(status[1] - self.max_wait))
+
+
+class TokenBucket(AdmissionPolicy):
+    """
+    Limit the rate at which tasks are sent, allowing bursts up to capacity.
+    """
+
+    status_code = 429
+    message = "Too many tasks were requested."
+
+    def __init__(self, rate: float, capacity: int):
+        """
+        :param rate: Number of calls admitted per second (on average).
+        :param capacity: Maximum number of calls admitted at once.
+        """
+        super().__init__()
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._last_refill = time.monotonic()
+
+    def _retry_after(self, queue_status) -> int:
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                self.capacity, self._tokens + (now - self._last_refill) * self.rate
+            )
+            self._last_refill = now
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return None
+            return max(1, math.ceil((1 - self._tokens) / self.rate))
@@ -0,0 +1,260 @@
+import asyncio
+import logging
+from urllib.parse import parse_qs
+
+from werkzeug.exceptions import HTTPException
+from werkzeug.routing import Map, Rule
+
+from flasynk import _durations, _marshalling, _polling, json_encoding
+from flasynk.exceptions import ResultNotAvailable
+from flasynk.retention import RetentionPolicy
+from flasynk._asynchronous import (
+    _RESULT_ENDPOINT,
+    _STATUS_ENDPOINT,
+    _bounded_wait,
+    _module,
+    _original_url,
+    _retry_after,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class AsyncStatusApplication:
+    """
+    ASGI application serving /status and /result endpoints of asynchronous routes.
+    Backend is queried using an asyncio Redis client so that no thread is held while waiting for backend,
+    allowing a huge number of concurrent (long) polls.
+
+    Same protocol as AsyncNamespaceProxy generated endpoints is used:
+     * /status/<task_id> answers a 303 (redirecting to /result/<task_id>) once result is available,
+       a 200 with current state otherwise (using wait query parameter to wait for the result).
+     * /result/<task_id> answers a 200 with the (serialized) result,
+       a 202 (redirecting to /status/<task_id>) if result is not available yet.
+
+    Huey (using Redis storage) and Celery (using Redis result backend) are supported.
+    """
+
+    def __init__(
+        self,
+        async_app,
+        redis,
+        max_status_wait: float = 30,
+        retry_after_floor: int = 1,
+        retry_after_ceiling: int = 60,
+    ):
+        """
+        :param async_app: Celery or Huey application.
+        :param redis: asyncio Redis client connected to Huey storage or Celery result backend
+        (such as redis.asyncio.Redis).
+        :param max_status_wait: Maximum number of seconds a status request (using wait parameter) can be held.
+        Default to 30 seconds.
+        :param retry_after_floor: Minimum number of seconds advised (Retry-After header) to wait before checking
+        status of a task that is still computing. Default to 1 second.
+        :param retry_after_ceiling: Maximum number of seconds advised (Retry-After header) to wait before checking
+        status of a task that is still computing. Default to 60 seconds.
+        """
+        self.__async_app = async_app
+        self.__module = _module(async_app)
+        self.__redis = redis
+        self.__max_status_wait = max_status_wait
+        self.__retry_after_floor = retry_after_floor
+        self.__retry_after_ceiling = retry_after_ceiling
+        self.__routes = Map(strict_slashes=False)
+        self.__urls = None
+
+    def asynchronous_route(
+        self,
+        endpoint: str,
+        serializer=None,
+        to_response=None,
+        retention: RetentionPolicy = None,
+    ):
+        """
+        Serve status and result of an asynchronous route.
+        :param endpoint: value of the endpoint (as provided to AsyncNamespaceProxy.asynchronous_route)
+        including the namespace path. ex: /foo/bar
+        :param serializer: In case the response needs serialization, a single model or a list of model.
+        :param to_response: In case the task result needs to be processed before returning it to client.
+        This is a function taking the task result as parameter (and path parameters if needed) and returning a result.
+        Default to returning unmodified task result.
+        :param retention: flasynk.retention policy deciding how long a result is kept once read (Huey only).
+        Default to Huey behavior (result is removed once read, unless stored with an expiry).
+        """
+        if retention is not None:
+            self.__module._check_retention(self.__async_app, retention)
+        marshal_data = (
+            _marshalling.compile_model(
+                serializer[0] if isinstance(serializer, list) else serializer
+            )
+            if serializer is not None
+            else None
+        )
+        self.__routes.add(
+            Rule(
+                f"{endpoint}/{_STATUS_ENDPOINT}/<string:task_id>",
+                endpoint=(self._status, _durations.RecentHistograms()),
+                methods=["GET"],
+            )
+        )
+        self.__routes.add(
+            Rule(
+                f"{endpoint}/{_RESULT_ENDPOINT}/<string:task_id>",
+                endpoint=(self._result, (marshal_data, to_response, retention)),
+                methods=["GET"],
+            )
+        )
+        self.__urls = None
+
+    async def __call__(self, scope: dict, receive, send):
+        if scope["type"] == "lifespan":
+            await self._lifespan(receive, send)
+            return
+
+        if self.__urls is None:
+            self.__urls = self.__routes.bind("")
+        try:
+            (handler, route_parameters), path_parameters = self.__urls.match(
+                scope["path"], method=scope["method"]
+            )
+        except HTTPException as e:
+            await _send_json(send, e.code, {"message": e.description})
+            return
+
+        task_id = path_parameters.pop("task_id")
+        await handler(scope, send, task_id, route_parameters, path_parameters)
+
+    async def _status(
+        self,
+        scope: dict,
+        send,
+        task_id: str,
+        recent_histograms: _durations.RecentHistograms,
+        path_parameters: dict,
+    ):
+        async_task = await self._wait_for_task(
+            task_id, _requested_wait(scope, self.__max_status_wait)
+        )
+        if self.__module._result_is_available(async_task):
+            url = _base_url(scope).replace(
+                f"/{_STATUS_ENDPOINT}/", f"/{_RESULT_ENDPOINT}/"
+            )
+            await _send(send, 303, b"", [(b"location", url.encode())])
+            return
+
+        details = await self.__module._aget_task_details(
+            self.__async_app, async_task, self.__redis, recent_histograms
+        )
+        retry_after = _retry_after(
+            details, self.__retry_after_floor, self.__retry_after_ceiling
+        )
+        await _send_json(
+            send,
+            200,
+            {"state": self.__module._get_current_state(async_task), **details},
+            [(b"retry-after", str(retry_after).encode())],
+        )
+
+    async def _result(
+        self, scope: dict, send, task_id: str, serialization, path_parameters: dict
+    ):
+        marshal_data, to_response, retention = serialization
+        try:
+            if retention is not None:
+                result = await self.__module._aget_retained_result(
+                    self.__async_app, task_id, self.__redis, retention
+                )
+            else:
+                result = await self.__module._aget_asynchronous_result(
+                    self.__async_app, task_id, self.__redis
+                )
+            if to_response:
+                result = to_response(result, **path_parameters)
+            if marshal_data:
+                result = marshal_data(result)
+        except ResultNotAvailable:
+            url = _base_url(scope).replace(
+                f"/{_RESULT_ENDPOINT}/", f"/{_STATUS_ENDPOINT}/"
+            )
+            await _send_json(
+                send,
+                202,
+                {"task_id": task_id, "url": url},
+                [(b"location", url.encode())],
+            )
+            return
+        except Exception as e:
+            logger.exception(f"Unable to provide {task_id} result.")
+            await _send_json(send, 500, {"message": str(e)})
+            return
+
+        await _send_json(send, 200, result)
+
+    async def _wait_for_task(self, task_id: str, timeout: float):
+        """
+        Wait for result availability (using the same backoff as huey blocking result retrieval).
+        """
+        async_task = await self._get_task(task_id)
+        for delay in _polling.delays(timeout, asyncio.get_event_loop().time):
+            if self.__module._result_is_available(async_task):
+                break
+            await asyncio.sleep(delay)
+            async_task = await self._get_task(task_id)
+        return async_task
+
+    async def _get_task(self, task_id: str):
+        return await self.__module._aget_asynchronous_task(
+            task_id, self.__async_app, self.__redis
+        )
+
+    @staticmethod
+    async def _lifespan(receive, send):
+        while True:
+            message = await receive()
+            if message["type"] == "lifespan.startup":
+                await send({"type": "lifespan.startup.complete"})
+            elif message["type"] == "lifespan.shutdown":
+                await send({"type": "lifespan.shutdown.complete"})
+                return
+
+
+def _requested_wait(scope: dict, max_wait: float) -> float:
+    """
+    Return the number of seconds client requested to wait for (using wait query parameter).
+    """
+    wait = parse_qs(scope.get("query_string", b"").decode()).get("wait", [None])[0]
+    return _bounded_wait(wait, max_wait)
+
+
+def _base_url(scope: dict) -> str:
+    """
+    Return client original requested URL in order to make sure it works behind a reverse proxy as well.
+    Without parameters.
+    """
+    headers = {
+        name.decode().lower(): value.decode() for name, value in scope["headers"]
+    }
+    host = headers.get("host") or "{}:{}".format(*scope["server"])
+    if "x-original-request-uri" in headers:
+        return _original_url(scope["scheme"], host, headers["x-original-request-uri"])
+    return f"{scope['scheme']}://{host}{scope.get('root_path', '')}{scope['path']}"
+
+
+async def _send_json(send, status: int, data, headers: list = None):
+    await _send(
+        send,
+        status,
+        f"{json_encoding.dumps(data)}\n".encode(),
+        [(b"content-type", b"application/json")] + (headers or []),
+    )
+
+
+async def _send(send, status: int, body: bytes, headers: list):
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": headers + [(b"content-length", str(len(body)).encode())],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
@@ -1,9 +1,14 @@
 import datetime
 import logging
+import time
 import uuid
+import weakref
 
 import celery.result
 from celery import states
+from celery.local import Proxy
+
+from flasynk.result_cache import ResultCache, _estimated_size
 
 logger = logging.getLogger(__name__)
 
@@ -22,13 +27,18 @@ def _serialize(value):
     return value
 
 
-def _async_result_stub(task_id, **kwargs):
-    return _TaskResultStore.get_by_id(task_id)
+# Results store of every CeleryMock (and of the Celery application it mocks)
+_stores = weakref.WeakKeyDictionary()
 
 
-# apply_async returns an EagerResult in eager mode.
-# To ensure it always returns an EagerResult even when AsyncResult is called, we use this mock
-celery.result.AsyncResult = _async_result_stub
+def _async_result_stub(task_id, app=None, **kwargs):
+    app = celery.current_app if app is None else app
+    if isinstance(app, Proxy):
+        app = app._get_current_object()
+    store = _stores.get(app)
+    if store is None:
+        return _EagerResultWithStateSupport(task_id, None, states.PENDING)
+    return store.get_by_id(task_id)
 
 
 class _EagerResultWithStateSupport(celery.result.EagerResult):
@@ -36,30 +46,77 @@ class _EagerResultWithStateSupport(celery.result.EagerResult):
         return self._state == states.READY_STATES
 
 
-class _TaskResultStore:
+def _result_size(result: celery.result.EagerResult) -> int:
+    # Only the task result is accounted for (not the application it refers to)
+    return _estimated_size(result.result)
 
-    __task_store = {}
 
-    @classmethod
-    def put(cls, result):
-        cls.__task_store[result.id] = result
+class _TaskResultStore(ResultCache):
+    """
+    Results of tasks sent through a CeleryMock, bounded in size (in bytes) and in time.
+    Least recently used results are evicted first once the size budget is reached.
+    A result bigger than the size budget is still kept (as the only result).
+    Kept results are also stored in the result backend (as a non eager application would),
+    where they are removed as soon as they are removed from this store.
+    """
 
-    @classmethod
-    def get_by_id(cls, id):
-        return (
-            cls.__task_store[id]
-            if id in cls.__task_store
-            else _EagerResultWithStateSupport(id, None, states.PENDING)
-        )
+    def __init__(self, backend, **kwargs):
+        super().__init__(sizeof=_result_size, **kwargs)
+        self._backend = backend
+
+    def add(self, result: celery.result.EagerResult):
+        if not self.put(result.id, result):
+            logger.warning(
+                f"{result.id} result is bigger than {self.max_bytes} bytes, "
+                "every other result is evicted to keep it."
+            )
+            self._keep_only(result)
+        self._backend.store_result(result.id, result.result, result.state)
+
+    def _keep_only(self, result: celery.result.EagerResult):
+        size = self._sizeof(result)
+        with self._lock:
+            for key in list(self._results):
+                self._remove(key)
+                self.evictions += 1
+            self._results[result.id] = (result, size, time.monotonic() + self.ttl)
+            self.size = size
+
+    def clear(self):
+        with self._lock:
+            for key in list(self._results):
+                self._remove(key)
+
+    def _remove(self, key):
+        if key in self._results:
+            self._backend.delete(self._backend.get_key_for_task(key))
+        super()._remove(key)
+
+    def get_by_id(self, id):
+        result = self.get(id)
+        if result is None:
+            return _EagerResultWithStateSupport(id, None, states.PENDING)
+        return result
 
 
 class CeleryMock:
     """
     Celery App proxy. This proxy configures celery app in "task always eager" mode.
     This proxy intercepts task decorator so apply_async is working in this mode.
+    Results of sent tasks are kept (in memory) in results, which can be cleared and provides statistics.
     """
 
-    def __init__(self, celery_app):
+    def __init__(
+        self,
+        celery_app,
+        results_max_bytes: int = 16 * 1024 * 1024,
+        results_ttl: float = 60 * 60,
+    ):
+        """
+        :param celery_app: Celery application to mock.
+        :param results_max_bytes: Maximum size (in bytes) of all kept results. Default to 16MB.
+        :param results_ttl: Number of seconds a result is kept. Default to 1 hour.
+        """
         self.__celery_app = celery_app
         self.__celery_app.conf.update(
             task_always_eager=True,
@@ -67,10 +124,18 @@ class CeleryMock:
             cache_backend="memory",
             task_eager_propagates=True,
         )
-        self.__task_store = {}
+        self.results = _TaskResultStore(
+            celery_app.backend, max_bytes=results_max_bytes, ttl=results_ttl
+        )
+        # Results can be requested using the mock or the mocked application
+        _stores[self] = _stores[celery_app] = self.results
+        # apply_async returns an EagerResult in eager mode.
+        # To ensure it always returns an EagerResult even when AsyncResult is called, we use this mock
+        celery.result.AsyncResult = _async_result_stub
 
     def __getattr__(self, name):
         if name == "task":
+            results = self.results
 
             def task_interceptor(*aa, **oo):
                 result = getattr(self.__celery_app, "task")(*aa, **oo)
@@ -113,7 +178,7 @@ class CeleryMock:
                                 task_id, e, states.FAILURE
                             )
 
-                        _TaskResultStore.put(celery_result)
+                        results.add(celery_result)
                         return celery_result
 
                     def __call__(self, *args, **kwargs):
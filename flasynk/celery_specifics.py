@@ -1,10 +1,19 @@
 from datetime import datetime
+import json
 import logging
 import os
+import time
 
+import celery.exceptions
 import celery.result
-from celery import Celery, current_task
-from celery.task import control
+from celery import Celery, current_task, signals, states
+from celery.backends.base import BaseKeyValueStoreBackend
+from celery.backends.redis import RedisBackend
+from kombu.exceptions import ChannelError
+
+from flasynk import _details, _durations
+from flasynk.exceptions import ResultNotAvailable
+from flasynk.retention import RetentionPolicy
 
 logger = logging.getLogger("asynchronous_server")
 
@@ -23,6 +32,8 @@ def build_async_application(config: dict, *apps: str, **kwargs) -> Celery:
     :param kwargs: Additional Celery arguments
     To add celery configuration parameter, you should provide a dictionary named changes with those parameters.
     As in changes={'task_serializer': 'pickle'}
+    Task details (timestamps, progress and durations) are recorded for tasks of this application
+    (unless they ignore their result), set changes={'flasynk_task_details': False} to not record them.
     :return: Celery Application
     """
     namespace = _namespace()
@@ -30,6 +41,10 @@ def build_async_application(config: dict, *apps: str, **kwargs) -> Celery:
 
     logger.info(f"Starting Celery server on {namespace} namespace")
 
+    # Handlers are connected once, whatever the number of applications
+    signals.before_task_publish.connect(_stamp_sent_time)
+    signals.task_prerun.connect(_task_started)
+    signals.task_postrun.connect(_task_over)
     return Celery(
         "celery_server",
         broker=config["celery"]["broker"],
@@ -47,6 +62,7 @@ def build_async_application(config: dict, *apps: str, **kwargs) -> Celery:
             "task_default_queue": queue,
             "task_default_exchange": queue,
             "task_default_routing_key": queue,
+            _TASK_DETAILS_SETTING: True,
             **kwargs.pop("changes", {}),
         },
         **kwargs,
@@ -54,21 +70,334 @@ def build_async_application(config: dict, *apps: str, **kwargs) -> Celery:
 
 
 def _get_asynchronous_task(celery_task_id: str, celery_app: Celery):
+    """
+    Retrieve task state alongside its details (in a single round trip if result backend supports it).
+    """
+    backend = celery_app.backend
+    if isinstance(backend, BaseKeyValueStoreBackend):
+        try:
+            meta, details = _mget(
+                backend,
+                [
+                    backend.get_key_for_task(celery_task_id),
+                    _task_details_key(backend, celery_task_id),
+                ],
+            )
+        except NotImplementedError:
+            pass  # Fallback to reading task state and details on their own
+        else:
+            return _CeleryTaskMeta(
+                celery_task_id,
+                _decoded_meta(backend, meta),
+                backend.decode(details) if details else {},
+            )
     return celery.result.AsyncResult(celery_task_id, app=celery_app)
 
 
+class _CeleryTaskMeta:
+    """
+    Task state as stored in the result backend (and task details if they were retrieved alongside).
+    """
+
+    def __init__(self, celery_task_id: str, meta: dict, details: dict = None):
+        self.id = celery_task_id
+        self.state = meta["status"]
+        self.details = details
+
+    def ready(self):
+        return self.state in states.READY_STATES
+
+
+def _get_asynchronous_tasks(celery_task_ids: list, celery_app: Celery) -> list:
+    """
+    Retrieve all tasks at once (in a single round trip if result backend supports it).
+    """
+    backend = celery_app.backend
+    if isinstance(backend, BaseKeyValueStoreBackend):
+        try:
+            metas = _mget(
+                backend,
+                [
+                    backend.get_key_for_task(celery_task_id)
+                    for celery_task_id in celery_task_ids
+                ],
+            )
+        except NotImplementedError:
+            pass  # Fallback to one request per task
+        else:
+            return [
+                _CeleryTaskMeta(celery_task_id, _decoded_meta(backend, meta))
+                for celery_task_id, meta in zip(celery_task_ids, metas)
+            ]
+
+    return [
+        celery.result.AsyncResult(celery_task_id, app=celery_app)
+        for celery_task_id in celery_task_ids
+    ]
+
+
+def _mget(backend: BaseKeyValueStoreBackend, keys: list) -> list:
+    """
+    Values of every key (in order).
+    :raises NotImplementedError: if result backend cannot retrieve many keys at once.
+    """
+    values = backend.mget(keys)
+    if hasattr(values, "items"):
+        return [values.get(key) for key in keys]
+    return values
+
+
+def _decoded_meta(backend: BaseKeyValueStoreBackend, meta) -> dict:
+    return backend.decode_result(meta) if meta else {"status": states.PENDING}
+
+
+def _wait_for_asynchronous_task(
+    celery_task_id: str, celery_app: Celery, timeout: float
+):
+    try:
+        celery.result.AsyncResult(celery_task_id, app=celery_app).get(
+            timeout=timeout, propagate=False
+        )
+    except celery.exceptions.TimeoutError:
+        pass  # Task is still not ready, current state will be provided
+    return _get_asynchronous_task(celery_task_id, celery_app)
+
+
 def _result_is_available(celery_task):
     return celery_task.ready()
 
 
 def _get_current_state(celery_task):
-    # TODO Add more information such as request initial time, and maybe intermediate client status
     return celery_task.state
 
 
+def report_progress(percent: float = None, stage: str = None, **counters):
+    """
+    Report progress of the current task (to be called within a task).
+    Progress (and the time it was reported at) is provided alongside task state when status is requested.
+    Progress is stored with task details, next to the task result (in a distinct key),
+    and only with a key/value result backend.
+
+    :param percent: Percentage of the computation that is done.
+    :param stage: Name of the current computation stage.
+    :param counters: Any other progress indicator (such as number of processed items).
+    """
+    details = current_task.request.get("flasynk_details") if current_task else None
+    if details is None:
+        # Not within a worker (direct call), or task details are not recorded for this task
+        logger.debug("Progress cannot be reported as task details are not recorded.")
+        return
+    details["progress"] = _details.progress(percent, stage, counters)
+    details["updated"] = time.time()
+    _store_task_details(current_task.backend, current_task.request)
+
+
+def _task_details_key(backend: BaseKeyValueStoreBackend, celery_task_id: str):
+    return backend.get_key_for_task(celery_task_id, "-details")
+
+
+def _durations_key(task_name: str, window: int) -> str:
+    return f"celery-flasynk-durations-{task_name}-{window}"
+
+
+# Celery setting enabling task details recording (set by build_async_application)
+_TASK_DETAILS_SETTING = "flasynk_task_details"
+
+
+def _task_started(task=None, **kwargs):
+    """
+    Record task timestamps (enqueue time is the time at which task message was sent).
+    Only for tasks of applications built by build_async_application, storing their result in a key/value backend.
+    """
+    backend = task.backend
+    if (
+        not task.app.conf.get(_TASK_DETAILS_SETTING)
+        or task.ignore_result
+        or not isinstance(backend, BaseKeyValueStoreBackend)
+    ):
+        return
+
+    now = time.time()
+    task.request.flasynk_details = {
+        "name": task.name,
+        "enqueued": _sent_time(task.request),
+        "started": now,
+        "updated": now,
+    }
+    _store_task_details(backend, task.request)
+
+
+def _sent_time(request) -> float:
+    # Message headers are request attributes (Celery 4) or request headers (Celery 5)
+    return request.get(_SENT_HEADER) or (request.headers or {}).get(_SENT_HEADER)
+
+
+def _task_over(task=None, state: str = None, **kwargs):
+    """
+    Record task last update time.
+    Time spent in queue and computing is counted (per task name, Redis result backend only) on success.
+    """
+    details = task.request.get("flasynk_details")
+    if details is None:
+        return  # Task details are not recorded for this task
+
+    now = time.time()
+    details["updated"] = now
+    _store_task_details(task.backend, task.request)
+    if state == states.SUCCESS and isinstance(task.backend, RedisBackend):
+        key = _durations_key(details["name"], _durations.windows(now)[0])
+        pipeline = task.backend.client.pipeline(transaction=False)
+        if details["enqueued"]:
+            _durations.record(
+                pipeline, key, "wait", details["started"] - details["enqueued"]
+            )
+        _durations.record(pipeline, key, "run", now - details["started"])
+        pipeline.execute()
+
+
+def _store_task_details(backend: BaseKeyValueStoreBackend, request):
+    backend.set(
+        _task_details_key(backend, request.id),
+        backend.encode(request.flasynk_details),
+    )
+
+
+def _get_task_details(
+    celery_app: Celery,
+    celery_task,
+    recent_histograms: _durations.RecentHistograms = None,
+) -> dict:
+    """
+    Progress, timestamps and estimated end of a task that is not over yet.
+    Timestamps are only known once task is received by a worker.
+    Estimated end relies on the durations of the recent tasks with the same name (Redis result backend only).
+    :param celery_task: Task (as returned by _get_asynchronous_task), details are read if not retrieved alongside.
+    :param recent_histograms: Durations recently read (not read again if provided and recent enough).
+    """
+    backend = celery_app.backend
+    if not isinstance(backend, BaseKeyValueStoreBackend):
+        return {}
+
+    now = time.time()
+    task_details = getattr(celery_task, "details", None)
+    if task_details is None:
+        task_details = backend.get(_task_details_key(backend, celery_task.id))
+        task_details = backend.decode(task_details) if task_details else {}
+    task_name = task_details.get("name")
+    histograms = []
+    if task_name and isinstance(backend, RedisBackend):
+        histograms = (
+            recent_histograms.get(task_name, now)
+            if recent_histograms is not None
+            else None
+        )
+        if histograms is None:
+            pipeline = backend.client.pipeline(transaction=False)
+            for window in _durations.windows(now):
+                pipeline.hgetall(_durations_key(task_name, window))
+            histograms = pipeline.execute()
+            if recent_histograms is not None:
+                recent_histograms.put(task_name, histograms, now)
+    return _details.status_details(task_details, histograms, now)
+
+
+def _result_read_is_destructive(celery_app: Celery) -> bool:
+    return False
+
+
 def _get_asynchronous_result(celery_app: Celery, celery_task_id: str):
-    celery_task = celery.result.AsyncResult(celery_task_id, app=celery_app)
-    return celery_task.get(propagate=True)
+    """
+    Result is read from result backend (without waiting for it).
+    :raises ResultNotAvailable: if task is not over yet (or unknown).
+    """
+    return _task_result(
+        celery_app, celery_task_id, _task_meta(celery_app, celery_task_id)
+    )
+
+
+def _task_meta(celery_app: Celery, celery_task_id: str) -> dict:
+    backend = celery_app.backend
+    if isinstance(backend, BaseKeyValueStoreBackend):
+        # Read stored metadata as is (no subscription to task result)
+        return _decoded_meta(
+            backend, backend.get(backend.get_key_for_task(celery_task_id))
+        )
+    return backend.get_task_meta(celery_task_id)
+
+
+def _task_result(celery_app: Celery, celery_task_id: str, meta: dict):
+    if meta["status"] == states.SUCCESS:
+        return meta["result"]
+    if meta["status"] in states.PROPAGATE_STATES:
+        raise celery_app.backend.exception_to_python(meta["result"])
+    raise ResultNotAvailable(celery_task_id, meta["status"])
+
+
+# Celery results are not removed once read
+_peek_asynchronous_result = _get_asynchronous_result
+
+
+def _check_retention(celery_app: Celery, retention: RetentionPolicy):
+    raise ValueError(
+        "Celery results are kept according to result_expires, retention policies only apply to Huey."
+    )
+
+
+async def _aget_asynchronous_task(celery_task_id: str, celery_app: Celery, redis):
+    """
+    Same as _get_asynchronous_task using an asyncio Redis client (Redis result backend).
+    """
+    backend = celery_app.backend
+    meta, details = await redis.mget(
+        backend.get_key_for_task(celery_task_id),
+        _task_details_key(backend, celery_task_id),
+    )
+    return _CeleryTaskMeta(
+        celery_task_id,
+        _decoded_meta(backend, meta),
+        backend.decode(details) if details else {},
+    )
+
+
+async def _aget_asynchronous_result(celery_app: Celery, celery_task_id: str, redis):
+    """
+    Same as _get_asynchronous_result using an asyncio Redis client (Redis result backend).
+    """
+    backend = celery_app.backend
+    meta = await redis.get(backend.get_key_for_task(celery_task_id))
+    return _task_result(
+        celery_app,
+        celery_task_id,
+        _decoded_meta(backend, meta),
+    )
+
+
+async def _aget_task_details(
+    celery_app: Celery,
+    celery_task: _CeleryTaskMeta,
+    redis,
+    recent_histograms: _durations.RecentHistograms = None,
+) -> dict:
+    """
+    Same as _get_task_details using an asyncio Redis client (Redis result backend).
+    """
+    now = time.time()
+    task_name = celery_task.details.get("name")
+    histograms = []
+    if task_name:
+        histograms = (
+            recent_histograms.get(task_name, now)
+            if recent_histograms is not None
+            else None
+        )
+        if histograms is None:
+            histograms = [
+                await redis.hgetall(_durations_key(task_name, window))
+                for window in _durations.windows(now)
+            ]
+            if recent_histograms is not None:
+                recent_histograms.put(task_name, histograms, now)
+    return _details.status_details(celery_task.details, histograms, now)
 
 
 def _namespace() -> str:
@@ -88,8 +417,26 @@ def _queue():
     return os.getenv("CONTAINER_NAME", "local")
 
 
-def health_details():
+def health_details(celery_app: Celery = None):
+    """
+    Check that Celery workers are available.
+    :param celery_app: If provided, queue length, waiting time of the oldest queued task (Redis broker only),
+    broker and result backend response times are provided as well.
+    """
+    status, details = _ping_details()
+    if celery_app is not None:
+        details.update(_broker_details(celery_app))
+        details.update(_backend_details(celery_app))
+        if any(detail["status"] == "fail" for detail in details.values()):
+            status = "fail"
+    return status, details
+
+
+def _ping_details():
     try:
+        # Only imported when used as it takes time to import
+        from celery.task import control
+
         worker_name = f"celery@{_namespace()}"
         workers = control.ping(destination=[worker_name])
         if not workers:
@@ -130,6 +477,77 @@ def health_details():
         )
 
 
+# Header holding the time (as a timestamp) at which the task message was sent
+_SENT_HEADER = "flasynk_sent"
+
+
+def _stamp_sent_time(headers: dict = None, **kwargs):
+    headers.setdefault(_SENT_HEADER, time.time())
+
+
+def _broker_details(celery_app: Celery) -> dict:
+    try:
+        start = time.perf_counter()
+        length, wait = _queue_status(celery_app)
+        response_time = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return {"celery:brokerResponseTime": _details.failure("component", str(e))}
+
+    details = {
+        "celery:queueLength": _details.observation("component", length),
+        "celery:brokerResponseTime": _details.observation(
+            "component", response_time, "ms"
+        ),
+    }
+    if wait is not None:
+        details["celery:queueWait"] = _details.observation("component", wait, "s")
+    return details
+
+
+def _queue_status(celery_app: Celery) -> (int, float):
+    """
+    Number of queued tasks and number of seconds the oldest one has been waiting for (None if unknown).
+    """
+    with celery_app.connection_for_read() as connection:
+        channel = connection.default_channel
+        try:
+            length = channel.queue_declare(queue=_queue(), passive=True)[1]
+        except ChannelError:
+            length = 0  # Queue does not exist until a task is sent
+        if not length:
+            return 0, 0
+        sent = _oldest_message_sent_time(connection, channel)
+    return length, max(time.time() - sent, 0) if sent is not None else None
+
+
+def _oldest_message_sent_time(connection, channel):
+    """
+    Time at which the oldest queued message was sent (only known with a Redis broker).
+    """
+    if connection.transport.driver_type != "redis":
+        return None
+    # Messages are pushed on the left of the list and consumed from the right
+    message = channel.client.lindex(_queue(), -1)
+    return json.loads(message)["headers"].get(_SENT_HEADER) if message else None
+
+
+def _backend_details(celery_app: Celery) -> dict:
+    backend = celery_app.backend
+    if not isinstance(backend, BaseKeyValueStoreBackend):
+        return {}
+    try:
+        start = time.perf_counter()
+        backend.get(backend.get_key_for_task("flasynk-health"))
+        response_time = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return {"celery:backendResponseTime": _details.failure("component", str(e))}
+    return {
+        "celery:backendResponseTime": _details.observation(
+            "component", response_time, "ms"
+        )
+    }
+
+
 class CeleryTaskIdFilter(logging.Filter):
     """
     This is a logging filter that makes the celery task identifier available for use in the logging format.
@@ -0,0 +1,8 @@
+class ResultNotAvailable(Exception):
+    """
+    Task result was requested while task is still computing (or unknown).
+    """
+
+    def __init__(self, async_task_id: str, state: str):
+        super().__init__(f"{async_task_id} result is not available ({state}).")
+        self.state = state
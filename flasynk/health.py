@@ -0,0 +1,98 @@
+import logging
+import threading
+import time
+from datetime import datetime
+
+logger = logging.getLogger(__name__)
+
+
+class CachedHealthDetails:
+    """
+    Health details refreshed by a background thread so that health checks (probes) are answered from memory.
+    Workers are not pinged more than once every interval seconds, whatever the number of health checks.
+
+    status, details = CachedHealthDetails(celery_specifics.health_details)()
+    """
+
+    def __init__(self, health_details, interval: float = 10, stale_after: float = 60):
+        """
+        :param health_details: Function returning a tuple (status, details) such as celery_specifics.health_details.
+        :param interval: Number of seconds between two refreshes. Default to 10 seconds.
+        :param stale_after: Number of seconds after which health is considered as failing if it did not pass since.
+        Default to 60 seconds.
+        """
+        self._health_details = health_details
+        self.interval = interval
+        self.stale_after = stale_after
+        self._lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread = None
+        self._last = None
+        self._last_pass = None
+
+    def __call__(self) -> tuple:
+        """
+        Return the last refreshed health status and details.
+        Age of the last passing health check is provided as health:age.
+        The first call performs the health check and starts the refresher thread.
+        """
+        if self._thread is None:
+            self.start()
+
+        status, details = self._last
+        age = (
+            time.monotonic() - self._last_pass if self._last_pass is not None else None
+        )
+        age_status = "pass" if age is not None and age <= self.stale_after else "fail"
+        return (
+            "fail" if "fail" in (status, age_status) else status,
+            {
+                **details,
+                "health:age": {
+                    "componentType": "component",
+                    "observedValue": age,
+                    "observedUnit": "s",
+                    "status": age_status,
+                    "time": datetime.utcnow().isoformat(),
+                },
+            },
+        )
+
+    def start(self):
+        """
+        Check health and start refreshing it in background (if not already started).
+        """
+        with self._lock:
+            if self._thread is not None:
+                return
+            self.refresh()
+            self._stopped.clear()
+            self._thread = threading.Thread(
+                target=self._refresh_periodically, name="flasynk-health", daemon=True
+            )
+            self._thread.start()
+
+    def stop(self):
+        """
+        Stop refreshing health in background.
+        """
+        with self._lock:
+            if self._thread is None:
+                return
+            self._stopped.set()
+            self._thread.join()
+            self._thread = None
+
+    def refresh(self):
+        status, details = self._health_details()
+        if status == "pass":
+            self._last_pass = time.monotonic()
+        self._last = status, details
+
+    def _refresh_periodically(self):
+        while not self._stopped.wait(self.interval):
+            try:
+                self.refresh()
+            except Exception:
+                # Keep refreshing, health will be considered as stale if this keeps failing
+                logger.exception("Unable to refresh health details.")
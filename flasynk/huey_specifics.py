@@ -1,9 +1,19 @@
+import functools
+import json
 import logging
 import os
+import threading
+import time
 
-from huey import RedisHuey
-from huey.exceptions import TaskException
+import redis
+from huey import RedisExpireHuey, RedisHuey, signals
+from huey.constants import EmptyData
+from huey.storage import RedisStorage, RedisExpireStorage
+from huey.utils import Error
 
+from flasynk import _details, _durations, _polling
+from flasynk.exceptions import ResultNotAvailable
+from flasynk.retention import RetentionPolicy
 
 logger = logging.getLogger("asynchronous_server")
 
@@ -18,44 +28,561 @@ def build_async_application(config: dict, **kwargs) -> RedisHuey:
     :param config: Dictionary with following structure: {
         'asynchronous': {
             'broker': ...,
+            # Optional connection pool settings
+            'max_connections': Maximum number of connections to Redis. Default to no limit.
+            'blocking_pool': Wait for a connection to be available once max_connections are in use
+            (instead of failing). Default to False.
+            'pool_timeout': Maximum number of seconds to wait for a connection if blocking_pool is True.
+            Default to 20 seconds.
+            'socket_timeout': Maximum number of seconds to wait for a Redis reply. Default to no timeout.
+            'socket_connect_timeout': Maximum number of seconds to wait for a connection to Redis.
+            Default to socket_timeout.
+            'health_check_interval': Number of seconds after which an idle connection is checked before being used.
+            Default to no check.
+            # Optional result settings
+            'result_expiry': Number of seconds after which a result is removed (even if never read).
+            Results are then stored in their own Redis key (RedisExpireHuey). Default to keeping results until read.
         }
     }
     :param kwargs: Additional Huey arguments
     :return: RedisHuey Application
     """
     logger.info(f"Starting Huey server")
-    return RedisHuey(
+    result_expiry = config["asynchronous"].get("result_expiry")
+    if result_expiry is not None:
+        kwargs["expire_time"] = result_expiry
+    huey_app = (RedisHuey if result_expiry is None else RedisExpireHuey)(
         os.getenv("CONTAINER_NAME", "LOCAL"),
-        url=config["asynchronous"]["broker"],
+        connection_pool=_connection_pool(config["asynchronous"]),
         **kwargs,
     )
+    huey_app.signal(*_SIGNAL_STATES)(functools.partial(_task_signal, huey_app))
+    return huey_app
 
 
-def _get_asynchronous_task(huey_task_id: str, huey_app: RedisHuey):
+# Number of seconds task details (such as timestamps and state) are kept
+_TASK_DETAILS_TTL = 24 * 60 * 60
+
+# Task state (using Celery states names) recorded when receiving Huey signals
+# (SIGNAL_EXPIRED and SIGNAL_INTERRUPTED require huey 2.4, SIGNAL_ENQUEUED requires huey 2.5.3)
+_SIGNAL_STATES = {
+    signals.SIGNAL_ENQUEUED: "PENDING",
+    signals.SIGNAL_SCHEDULED: "PENDING",
+    signals.SIGNAL_EXECUTING: "STARTED",
+    signals.SIGNAL_RETRYING: "RETRY",
+    signals.SIGNAL_ERROR: "FAILURE",
+    signals.SIGNAL_LOCKED: "FAILURE",
+    signals.SIGNAL_COMPLETE: "SUCCESS",
+    signals.SIGNAL_REVOKED: "REVOKED",
+    signals.SIGNAL_EXPIRED: "REVOKED",
+    signals.SIGNAL_CANCELED: "REVOKED",
+    signals.SIGNAL_INTERRUPTED: "REVOKED",
+}
+
+
+def _task_details_key(huey_app: RedisHuey, huey_task_id: str) -> str:
+    return f"huey.flasynk.{huey_app.name}.{huey_task_id}"
+
+
+def _durations_key(huey_app: RedisHuey, task_name: str, window: int) -> str:
+    return f"huey.flasynk.{huey_app.name}.durations.{task_name}.{window}"
+
+
+def _task_signal(huey_app: RedisHuey, signal: str, task, *args):
+    """
+    Record task state and timestamps in task details.
+    Time spent in queue and computing is counted (per task name) once task is complete.
+    """
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        return  # Immediate mode
+
+    now = time.time()
+    key = _task_details_key(huey_app, task.id)
+    if signal == signals.SIGNAL_COMPLETE:
+        enqueued, started = storage.conn.hmget(key, "enqueued", "started")
+    pipeline = storage.conn.pipeline(transaction=False)
+    if signal in (signals.SIGNAL_ENQUEUED, signals.SIGNAL_SCHEDULED):
+        if signal == signals.SIGNAL_ENQUEUED:
+            pipeline.hset(key, "enqueued", now)
+            pipeline.hset(key, "name", task.name)
+        # A task that is requeued (retried) keeps its RETRY state
+        pipeline.hsetnx(key, "state", _SIGNAL_STATES[signal])
+    else:
+        pipeline.hset(key, "state", _SIGNAL_STATES[signal])
+    if signal == signals.SIGNAL_EXECUTING:
+        pipeline.hset(key, "started", now)
+    pipeline.hset(key, "updated", now)
+    pipeline.expire(key, _TASK_DETAILS_TTL)
+    if signal == signals.SIGNAL_COMPLETE and started:
+        durations_key = _durations_key(huey_app, task.name, _durations.windows(now)[0])
+        if enqueued:
+            _durations.record(
+                pipeline, durations_key, "wait", float(started) - float(enqueued)
+            )
+        _durations.record(pipeline, durations_key, "run", now - float(started))
+    pipeline.execute()
+
+
+class _PoolStatisticsMixin:
+    """
+    Keep track of the time spent to acquire a connection.
+    """
+
+    def reset(self):
+        super().reset()
+        self._statistics_lock = threading.Lock()
+        self.acquisitions = 0
+        self.acquisition_time = 0.0
+        self.max_acquisition_time = 0.0
+
+    def get_connection(self, command_name, *keys, **options):
+        start = time.monotonic()
+        connection = super().get_connection(command_name, *keys, **options)
+        acquisition_time = time.monotonic() - start
+        with self._statistics_lock:
+            self.acquisitions += 1
+            self.acquisition_time += acquisition_time
+            self.max_acquisition_time = max(self.max_acquisition_time, acquisition_time)
+        return connection
+
+
+class _ConnectionPool(_PoolStatisticsMixin, redis.ConnectionPool):
+    def statistics(self) -> (int, int):
+        return len(self._in_use_connections), len(self._available_connections)
+
+
+class _BlockingConnectionPool(_PoolStatisticsMixin, redis.BlockingConnectionPool):
+    def statistics(self) -> (int, int):
+        # Pool queue contains idle connections (None for connections not created yet)
+        idle = len([connection for connection in list(self.pool.queue) if connection])
+        return len(self._connections) - idle, idle
+
+
+def _connection_pool(config: dict) -> redis.ConnectionPool:
+    settings = {
+        name: config[name]
+        for name in (
+            "max_connections",
+            "socket_timeout",
+            "socket_connect_timeout",
+            "health_check_interval",
+        )
+        if config.get(name) is not None
+    }
+    if config.get("blocking_pool"):
+        if config.get("pool_timeout") is not None:
+            settings["timeout"] = config["pool_timeout"]
+        return _BlockingConnectionPool.from_url(config["broker"], **settings)
+    return _ConnectionPool.from_url(config["broker"], **settings)
+
+
+def pool_statistics(huey_app: RedisHuey) -> dict:
+    """
+    Usage of the Redis connection pool (as built by build_async_application).
+    """
+    pool = huey_app.storage.pool
+    in_use, idle = pool.statistics()
+    return {
+        "max_connections": pool.max_connections,
+        "in_use": in_use,
+        "idle": idle,
+        "acquisitions": pool.acquisitions,
+        # Time spent (in seconds) to acquire a connection (waiting for one and connecting)
+        "acquisition_time": pool.acquisition_time,
+        "max_acquisition_time": pool.max_acquisition_time,
+    }
+
+
+def health_details(huey_app: RedisHuey):
+    """
+    Queue length, waiting time of the oldest queued task and Redis (broker and result storage) response time.
+    """
     try:
-        return huey_app.result(huey_task_id, preserve=True)
-    except:
-        return "Exception"
+        start = time.perf_counter()
+        length, wait = _queue_status(huey_app)
+        response_time = (time.perf_counter() - start) * 1000
+    except Exception as e:
+        return "fail", {"huey:responseTime": _details.failure("datastore", str(e))}
+
+    details = {
+        "huey:queueLength": _details.observation("datastore", length),
+        "huey:responseTime": _details.observation("datastore", response_time, "ms"),
+    }
+    if wait is not None:
+        details["huey:queueWait"] = _details.observation("datastore", wait, "s")
+    return "pass", details
+
+
+def _queue_status(huey_app: RedisHuey) -> (int, float):
+    """
+    Number of queued tasks and number of seconds the oldest one has been waiting for (None if unknown).
+    """
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        return storage.queue_size(), None  # Immediate mode
+
+    pipeline = storage.conn.pipeline(transaction=False)
+    pipeline.llen(storage.queue_key)
+    # Tasks are pushed on the left of the list and consumed from the right
+    pipeline.lindex(storage.queue_key, -1)
+    length, oldest = pipeline.execute()
+    if not oldest:
+        return 0, 0
+
+    enqueued = storage.conn.hget(
+        _task_details_key(huey_app, huey_app.serializer.deserialize(oldest).id),
+        "enqueued",
+    )
+    return length, max(time.time() - float(enqueued), 0) if enqueued else None
+
+
+class _HueyTaskMeta:
+    """
+    Result availability and task details (as recorded on Huey signals and progress reports).
+    """
+
+    def __init__(self, available, details: dict):
+        self.available = bool(available)
+        self.details = details
+        self.state = details.get("state")
+
+
+def _get_asynchronous_task(huey_task_id: str, huey_app: RedisHuey) -> _HueyTaskMeta:
+    """
+    Only check for result existence, result itself is not retrieved.
+    """
+    return _get_asynchronous_tasks([huey_task_id], huey_app)[0]
+
+
+def _get_asynchronous_tasks(huey_task_ids: list, huey_app: RedisHuey) -> list:
+    """
+    Check availability and retrieve details of all tasks at once (in a single round trip if using Redis).
+    """
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        return [
+            _HueyTaskMeta(storage.has_data_for_key(huey_task_id), {})
+            for huey_task_id in huey_task_ids
+        ]
+
+    pipeline = storage.conn.pipeline(transaction=False)
+    for huey_task_id in huey_task_ids:
+        if isinstance(storage, RedisExpireStorage):
+            pipeline.exists(storage.result_key(huey_task_id))
+        else:
+            pipeline.hexists(storage.result_key, huey_task_id)
+        pipeline.hgetall(_task_details_key(huey_app, huey_task_id))
+    replies = pipeline.execute()
+    return [
+        _HueyTaskMeta(available, _decoded_task_details(details))
+        for available, details in zip(replies[::2], replies[1::2])
+    ]
+
+
+def _wait_for_asynchronous_task(huey_task_id: str, huey_app: RedisHuey, timeout: float):
+    """
+    Wait for result existence (using the same backoff as huey blocking result retrieval).
+    Result itself is not retrieved.
+    """
+    huey_task = _get_asynchronous_task(huey_task_id, huey_app)
+    for delay in _polling.delays(timeout):
+        if huey_task.available:
+            break
+        time.sleep(delay)
+        huey_task = _get_asynchronous_task(huey_task_id, huey_app)
+    return huey_task
+
+
+def _result_is_available(huey_task: _HueyTaskMeta):
+    return huey_task.available
 
 
-def _result_is_available(huey_task):
-    return huey_task is not None
+def _get_current_state(huey_task: _HueyTaskMeta):
+    return huey_task.state or "PENDING"
 
 
-def _get_current_state(huey_task):
-    # TODO Add more information such as request initial time, and maybe intermediate client status
-    return "PENDING"
+def report_progress(
+    huey_app: RedisHuey,
+    huey_task_id: str,
+    percent: float = None,
+    stage: str = None,
+    **counters,
+):
+    """
+    Report progress of a task (to be called within the task, declared with context=True to know its id).
+    Progress (and the time it was reported at) is provided alongside task state when status is requested.
+    Progress is stored with task details (not with the result) and only with a Redis storage.
+
+    :param huey_app: Huey application.
+    :param huey_task_id: Identifier of the task (task.id).
+    :param percent: Percentage of the computation that is done.
+    :param stage: Name of the current computation stage.
+    :param counters: Any other progress indicator (such as number of processed items).
+    """
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        return  # Immediate mode
+
+    key = _task_details_key(huey_app, huey_task_id)
+    pipeline = storage.conn.pipeline(transaction=False)
+    pipeline.hset(
+        key, "progress", json.dumps(_details.progress(percent, stage, counters))
+    )
+    pipeline.hset(key, "updated", time.time())
+    pipeline.expire(key, _TASK_DETAILS_TTL)
+    pipeline.execute()
+
+
+def _get_task_details(
+    huey_app: RedisHuey,
+    huey_task: _HueyTaskMeta,
+    recent_histograms: _durations.RecentHistograms = None,
+) -> dict:
+    """
+    Progress, timestamps and estimated end of a task that is not over yet.
+    Estimated end relies on the durations of the recent tasks with the same name.
+    :param huey_task: Task (as returned by _get_asynchronous_task) with its details.
+    :param recent_histograms: Durations recently read (not read again if provided and recent enough).
+    """
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        return {}  # Immediate mode
+
+    now = time.time()
+    task_name = huey_task.details.get("name")
+    histograms = []
+    if task_name:
+        histograms = (
+            recent_histograms.get(task_name, now)
+            if recent_histograms is not None
+            else None
+        )
+        if histograms is None:
+            pipeline = storage.conn.pipeline(transaction=False)
+            for window in _durations.windows(now):
+                pipeline.hgetall(_durations_key(huey_app, task_name, window))
+            histograms = pipeline.execute()
+            if recent_histograms is not None:
+                recent_histograms.put(task_name, histograms, now)
+    return _details.status_details(huey_task.details, histograms, now)
+
+
+async def _aget_task_details(
+    huey_app: RedisHuey,
+    huey_task: _HueyTaskMeta,
+    redis,
+    recent_histograms: _durations.RecentHistograms = None,
+) -> dict:
+    """
+    Same as _get_task_details using an asyncio Redis client.
+    """
+    now = time.time()
+    task_name = huey_task.details.get("name")
+    histograms = []
+    if task_name:
+        histograms = (
+            recent_histograms.get(task_name, now)
+            if recent_histograms is not None
+            else None
+        )
+        if histograms is None:
+            histograms = [
+                await redis.hgetall(_durations_key(huey_app, task_name, window))
+                for window in _durations.windows(now)
+            ]
+            if recent_histograms is not None:
+                recent_histograms.put(task_name, histograms, now)
+    return _details.status_details(huey_task.details, histograms, now)
+
+
+def _decoded_task_details(task_details: dict) -> dict:
+    task_details = {
+        field.decode()
+        if isinstance(field, bytes)
+        else field: (value.decode() if isinstance(value, bytes) else value)
+        for field, value in task_details.items()
+    }
+    if task_details.get("progress"):
+        task_details["progress"] = json.loads(task_details["progress"])
+    return task_details
+
+
+def _result_read_is_destructive(huey_app: RedisHuey) -> bool:
+    """
+    Results are removed once read (unless they are stored with an expiry).
+    """
+    return not isinstance(huey_app.storage, RedisExpireStorage)
+
+
+def _discard_asynchronous_result(huey_app: RedisHuey, huey_task_id: str):
+    storage = huey_app.storage
+    if isinstance(storage, RedisStorage) and not isinstance(
+        storage, RedisExpireStorage
+    ):
+        # Avoid transferring result as a pop would do
+        storage.conn.hdel(storage.result_key, huey_task_id)
+    else:
+        storage.delete_data(huey_task_id)
+
+
+def _peek_asynchronous_result(huey_app: RedisHuey, huey_task_id: str):
+    return _get_asynchronous_result(huey_app, huey_task_id, preserve=True)
+
+
+def _get_asynchronous_result(
+    huey_app: RedisHuey, huey_task_id: str, preserve: bool = False
+):
+    """
+    :raises ResultNotAvailable: if task is not over yet, unknown or if its result was already read.
+    """
+    data = huey_app.get_raw(huey_task_id, peek=preserve)
+    if data is EmptyData:
+        raise ResultNotAvailable(huey_task_id, "PENDING")
+    return _deserialized_result(huey_app, data)
+
+
+def _check_retention(huey_app: RedisHuey, retention: RetentionPolicy):
+    storage = huey_app.storage
+    if (
+        retention.requires_expiry
+        and isinstance(storage, RedisStorage)
+        and not isinstance(storage, RedisExpireStorage)
+    ):
+        raise ValueError(
+            f"{type(retention).__name__} requires results to be stored with an expiry (result_expiry)."
+        )
 
 
-def _get_asynchronous_result(huey_app: RedisHuey, huey_task_id: str):
+def _get_retained_result(
+    huey_app: RedisHuey, huey_task_id: str, retention: RetentionPolicy
+):
+    """
+    Result is read without being removed, retention policy is then applied.
+    :raises ResultNotAvailable: if task is not over yet, unknown or if its result was already removed.
+    """
+    data = huey_app.get_raw(huey_task_id, peek=True)
+    if data is EmptyData:
+        raise ResultNotAvailable(huey_task_id, "PENDING")
+    _apply_retention(huey_app, huey_task_id, retention)
+    return _deserialized_result(huey_app, data)
+
+
+def _apply_retention(
+    huey_app: RedisHuey, huey_task_id: str, retention: RetentionPolicy
+):
+    """
+    Count a result read and remove (or expire) result according to retention policy.
+    """
+    keep_for = retention.after_read(_count_read(huey_app, huey_task_id))
+    if keep_for == 0:
+        _discard_asynchronous_result(huey_app, huey_task_id)
+    elif keep_for is not None and isinstance(huey_app.storage, RedisStorage):
+        # Only policies requiring an expiry storage keep results for some time
+        huey_app.storage.conn.expire(
+            huey_app.storage.result_key(huey_task_id), keep_for
+        )
+
+
+def _count_read(huey_app: RedisHuey, huey_task_id: str) -> int:
+    storage = huey_app.storage
+    if not isinstance(storage, RedisStorage):
+        # Immediate mode, read count is stored as any other data
+        key = f"flasynk.reads.{huey_task_id}"
+        reads = storage.peek_data(key)
+        reads = 1 if reads is EmptyData else reads + 1
+        storage.put_data(key, reads)
+        return reads
+
+    key = _task_details_key(huey_app, huey_task_id)
+    pipeline = storage.conn.pipeline(transaction=False)
+    pipeline.hincrby(key, "reads", 1)
+    pipeline.expire(key, _TASK_DETAILS_TTL)
+    reads, _ = pipeline.execute()
+    return reads
+
+
+def _task_exception(metadata: dict) -> Exception:
+    """
+    Exception that was raised by the task (or a generic Exception if it cannot be imported).
+    """
     try:
-        huey_task = huey_app.result(huey_task_id)
-    except TaskException as e:
-        try:
-            for import_exception in imported_exceptions:
-                exec(import_exception)
-            task_exception = eval(e.metadata["error"])
-        except NameError:
-            task_exception = Exception(e.metadata["error"])
-        raise task_exception
+        for import_exception in imported_exceptions:
+            exec(import_exception)
+        return eval(metadata["error"])
+    except NameError:
+        return Exception(metadata["error"])
+
+
+async def _aget_asynchronous_task(huey_task_id: str, huey_app: RedisHuey, redis):
+    """
+    Same as _get_asynchronous_task using an asyncio Redis client.
+    """
+    storage = huey_app.storage
+    if isinstance(storage, RedisExpireStorage):
+        available = await redis.exists(storage.result_key(huey_task_id))
+    else:
+        available = await redis.hexists(storage.result_key, huey_task_id)
+    details = await redis.hgetall(_task_details_key(huey_app, huey_task_id))
+    return _HueyTaskMeta(available, _decoded_task_details(details))
+
+
+async def _aget_asynchronous_result(huey_app: RedisHuey, huey_task_id: str, redis):
+    """
+    Same as _get_asynchronous_result using an asyncio Redis client.
+    """
+    storage = huey_app.storage
+    if isinstance(storage, RedisExpireStorage):
+        data = await redis.get(storage.result_key(huey_task_id))
+    else:
+        data = await redis.hget(storage.result_key, huey_task_id)
+        if data is not None:
+            await redis.hdel(storage.result_key, huey_task_id)
+    if data is None:
+        raise ResultNotAvailable(huey_task_id, "PENDING")
+    return _deserialized_result(huey_app, data)
+
+
+async def _aget_retained_result(
+    huey_app: RedisHuey, huey_task_id: str, redis, retention: RetentionPolicy
+):
+    """
+    Same as _get_retained_result using an asyncio Redis client.
+    """
+    storage = huey_app.storage
+    if isinstance(storage, RedisExpireStorage):
+        data = await redis.get(storage.result_key(huey_task_id))
+    else:
+        data = await redis.hget(storage.result_key, huey_task_id)
+    if data is None:
+        raise ResultNotAvailable(huey_task_id, "PENDING")
+    await _aapply_retention(huey_app, huey_task_id, redis, retention)
+    return _deserialized_result(huey_app, data)
+
+
+async def _aapply_retention(
+    huey_app: RedisHuey, huey_task_id: str, redis, retention: RetentionPolicy
+):
+    """
+    Same as _apply_retention using an asyncio Redis client.
+    """
+    storage = huey_app.storage
+    key = _task_details_key(huey_app, huey_task_id)
+    reads = await redis.hincrby(key, "reads", 1)
+    await redis.expire(key, _TASK_DETAILS_TTL)
+    keep_for = retention.after_read(reads)
+    if keep_for is None:
+        return
+    if keep_for > 0:
+        await redis.expire(storage.result_key(huey_task_id), keep_for)
+    elif isinstance(storage, RedisExpireStorage):
+        await redis.delete(storage.result_key(huey_task_id))
+    else:
+        await redis.hdel(storage.result_key, huey_task_id)
+
+
+def _deserialized_result(huey_app: RedisHuey, data: bytes):
+    huey_task = huey_app.serializer.deserialize(data)
+    if isinstance(huey_task, Error):
+        raise _task_exception(huey_task.metadata)
     return huey_task
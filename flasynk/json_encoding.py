@@ -0,0 +1,54 @@
+import datetime
+import decimal
+import json
+import uuid
+
+
+def _default(value):
+    """
+    Serialize values not handled by JSON encoders.
+    """
+    if isinstance(value, (datetime.datetime, datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (uuid.UUID, decimal.Decimal)):
+        return str(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(data) -> str:
+    return json.dumps(data, default=_default)
+
+
+def _orjson_dumps():
+    import orjson
+
+    def orjson_dumps(data) -> str:
+        try:
+            return orjson.dumps(
+                data, default=_default, option=orjson.OPT_NON_STR_KEYS
+            ).decode()
+        except TypeError:
+            # Such as integers that do not fit in 64 bits, handled by standard json module
+            return stdlib_dumps(data)
+
+    return orjson_dumps
+
+
+def _fastest_dumps():
+    try:
+        return _orjson_dumps()
+    except ModuleNotFoundError:
+        return stdlib_dumps
+
+
+dumps = _fastest_dumps()
+
+
+def set_dumps(json_dumps):
+    """
+    Change the function used to encode every JSON response (status, result, events).
+    Default to orjson if installed, standard json module otherwise (both handling datetime, UUID and Decimal).
+    :param json_dumps: Function taking the data to encode as parameter and returning a JSON string.
+    """
+    global dumps
+    dumps = json_dumps
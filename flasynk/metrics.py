@@ -0,0 +1,128 @@
+import bisect
+import threading
+
+
+class MetricsSink:
+    """
+    Receive measures of asynchronous routes (as recorded by AsyncNamespaceProxy generated endpoints).
+    Every measure is labelled with the route it relates to.
+    Subclass it to forward measures to your monitoring solution.
+
+    Counters:
+     * flasynk_tasks_accepted_total: Computations started (202 sent by the route).
+     * flasynk_admissions_total: Route calls admitted or shed (decision label) by the admission policy.
+     * flasynk_status_polls_total: Status requests, per outcome (computing or available, meaning a 303 was sent).
+     * flasynk_results_total: Result requests, per response status code.
+
+    Histograms:
+     * flasynk_status_polls_per_task: Number of status requests for a task, up to the one sending a 303.
+     * flasynk_backend_seconds: Time spent querying the backend, per operation.
+     * flasynk_marshalling_seconds: Time spent serializing results (according to route serializer).
+     * flasynk_to_response_seconds: Time spent in route to_response.
+     * flasynk_response_bytes: Size of result responses body (as sent, streamed responses excluded).
+    """
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        pass
+
+    def observe(self, name: str, labels: dict, value: float):
+        pass
+
+
+_TIME_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+_SIZE_BUCKETS = tuple(256 * 4**power for power in range(9))
+_COUNT_BUCKETS = (1, 2, 3, 5, 10, 20, 50, 100)
+
+
+def _buckets(name: str) -> tuple:
+    if name.endswith("_seconds"):
+        return _TIME_BUCKETS
+    if name.endswith("_bytes"):
+        return _SIZE_BUCKETS
+    return _COUNT_BUCKETS
+
+
+class PrometheusMetrics(MetricsSink):
+    """
+    Keep measures in memory and provide them using Prometheus text exposition format.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._counters = {}
+        self._histograms = {}
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        key = _labels_key(labels)
+        with self._lock:
+            counters = self._counters.setdefault(name, {})
+            counters[key] = counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float):
+        key = _labels_key(labels)
+        buckets = _buckets(name)
+        with self._lock:
+            histograms = self._histograms.setdefault(name, {})
+            histogram = histograms.get(key)
+            if histogram is None:
+                # Count per bucket (+Inf included), sum
+                histogram = histograms[key] = [[0] * (len(buckets) + 1), 0]
+            histogram[0][bisect.bisect_left(buckets, value)] += 1
+            histogram[1] += value
+
+    def exposition(self) -> str:
+        """
+        Every measure (using Prometheus text exposition format, version 0.0.4).
+        """
+        lines = []
+        with self._lock:
+            for name, counters in sorted(self._counters.items()):
+                lines.append(f"# TYPE {name} counter")
+                for key, value in sorted(counters.items()):
+                    lines.append(f"{name}{_labels_text(key)} {value}")
+            for name, histograms in sorted(self._histograms.items()):
+                lines.append(f"# TYPE {name} histogram")
+                buckets = [*map(str, _buckets(name)), "+Inf"]
+                for key, (counts, total) in sorted(histograms.items()):
+                    cumulated = 0
+                    for bucket, count in zip(buckets, counts):
+                        cumulated += count
+                        bucket_key = key + (("le", bucket),)
+                        lines.append(
+                            f"{name}_bucket{_labels_text(bucket_key)} {cumulated}"
+                        )
+                    lines.append(f"{name}_sum{_labels_text(key)} {total}")
+                    lines.append(f"{name}_count{_labels_text(key)} {cumulated}")
+        return "".join(f"{line}\n" for line in lines)
+
+    def expose(self, app, rule: str = "/metrics"):
+        """
+        Serve measures on the provided Flask application (or blueprint).
+        :param rule: URL rule to serve measures on. Default to /metrics.
+        """
+        import flask
+
+        app.add_url_rule(
+            rule,
+            "flasynk_metrics",
+            lambda: flask.Response(
+                self.exposition(), mimetype="text/plain; version=0.0.4"
+            ),
+        )
+
+
+def _labels_key(labels: dict) -> tuple:
+    return tuple(sorted(labels.items()))
+
+
+def _labels_text(key: tuple) -> str:
+    if not key:
+        return ""
+    escaped = (
+        (
+            name,
+            str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"),
+        )
+        for name, value in key
+    )
+    return "{" + ",".join(f'{name}="{value}"' for name, value in escaped) + "}"
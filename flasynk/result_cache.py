@@ -0,0 +1,141 @@
+import collections
+import sys
+import threading
+import time
+
+
+def _estimated_size(result) -> int:
+    """
+    Approximate size (in bytes) of a result and everything it contains (without serializing it).
+    Objects referenced more than once are counted once.
+    """
+    size = 0
+    seen = set()
+    pending = [result]
+    while pending:
+        value = pending.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += sys.getsizeof(value)
+        if isinstance(value, dict):
+            pending.extend(value.keys())
+            pending.extend(value.values())
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            pending.extend(value)
+    return size
+
+
+class ResultCache:
+    """
+    In-process cache of task results, bounded in size (in bytes) and in time.
+    Least recently used results are evicted first once the size budget is reached.
+
+    When provided to AsyncNamespaceProxy, results retrieved while checking status are kept
+    so that the (redirected) result request is served without querying the backend again.
+    The same instance should be shared by every AsyncNamespaceProxy of the process.
+    """
+
+    def __init__(
+        self, max_bytes: int = 64 * 1024 * 1024, ttl: float = 60, sizeof=_estimated_size
+    ):
+        """
+        :param max_bytes: Maximum size (in bytes) of all cached results. Default to 64MB.
+        :param ttl: Number of seconds a result is kept in cache. Default to 60 seconds.
+        :param sizeof: Function taking a result as parameter and returning its size in bytes.
+        Default to an estimate of the memory used by the result (and its content).
+        """
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._sizeof = sizeof
+        self._results = collections.OrderedDict()
+        self._lock = threading.Lock()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def put(self, key, result) -> bool:
+        """
+        Cache result.
+        :return: False if result is too big to be cached, True otherwise.
+        """
+        size = self._sizeof(result)
+        if size > self.max_bytes:
+            return False
+
+        with self._lock:
+            self._remove(key)
+            self._remove_expired()
+            self._results[key] = (result, size, time.monotonic() + self.ttl)
+            self.size += size
+            while self.size > self.max_bytes:
+                self._remove(next(iter(self._results)))
+                self.evictions += 1
+        return True
+
+    def __contains__(self, key) -> bool:
+        """
+        Result is cached (and not expired). Not counted as a hit or a miss.
+        """
+        with self._lock:
+            cached = self._results.get(key)
+            return cached is not None and cached[2] >= time.monotonic()
+
+    def get(self, key, default=None):
+        """
+        Return cached result (or default if not cached).
+        """
+        with self._lock:
+            return self._get(key, default)
+
+    def pop(self, key, default=None):
+        """
+        Return cached result (or default if not cached) and remove it from cache.
+        """
+        with self._lock:
+            result = self._get(key, default)
+            self._remove(key)
+            return result
+
+    def clear(self):
+        with self._lock:
+            self._results.clear()
+            self.size = 0
+
+    def statistics(self) -> dict:
+        return {
+            "entries": len(self._results),
+            "size": self.size,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+    def _get(self, key, default):
+        cached = self._results.get(key)
+        if cached is None or cached[2] < time.monotonic():
+            self._remove(key)
+            self.misses += 1
+            return default
+
+        self._results.move_to_end(key)
+        self.hits += 1
+        return cached[0]
+
+    def _remove_expired(self):
+        """
+        Remove expired results, starting with the least recently used (stopping at the first one not expired).
+        """
+        now = time.monotonic()
+        while self._results:
+            key, (_, _, expiry) = next(iter(self._results.items()))
+            if expiry >= now:
+                return
+            self._remove(key)
+
+    def _remove(self, key):
+        cached = self._results.pop(key, None)
+        if cached is not None:
+            self.size -= cached[1]
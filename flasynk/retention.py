@@ -0,0 +1,59 @@
+class RetentionPolicy:
+    """
+    Decide how long a Huey result is kept once read through an asynchronous route.
+    Results are read without being removed (so that a client can read it again, after a dropped connection for
+    instance) and the policy then decides to remove it or to make it expire.
+    The number of times a result was read is kept in Redis, alongside task details.
+    """
+
+    # Policy relies on results being stored in their own Redis key (as RedisExpireHuey does)
+    requires_expiry = False
+
+    def after_read(self, reads: int) -> int:
+        """
+        :param reads: Number of times result was read (this read included).
+        :return: Number of seconds result is kept for from now on (0 to remove it), None to keep it as is.
+        """
+        raise NotImplementedError()
+
+
+class KeepFor(RetentionPolicy):
+    """
+    Keep result for some time once first read.
+    Results must be stored with an expiry (config["asynchronous"]["result_expiry"]).
+    """
+
+    requires_expiry = True
+
+    def __init__(self, seconds: int):
+        """
+        :param seconds: Number of seconds result can still be read for once first read.
+        """
+        self.seconds = seconds
+
+    def after_read(self, reads: int) -> int:
+        return self.seconds if reads == 1 else None
+
+
+class DeleteAfterReads(RetentionPolicy):
+    """
+    Remove result once it was read a number of times.
+    """
+
+    def __init__(self, max_reads: int):
+        """
+        :param max_reads: Number of times result can be read.
+        """
+        self.max_reads = max_reads
+
+    def after_read(self, reads: int) -> int:
+        return 0 if reads >= self.max_reads else None
+
+
+class DeleteOnRead(DeleteAfterReads):
+    """
+    Remove result once read (as Huey does by default, unless results are stored with an expiry).
+    """
+
+    def __init__(self):
+        super().__init__(max_reads=1)
@@ -38,11 +38,15 @@ setup(
     ],
     extras_require={
         "celery": ["celery[redis,msgpack]==4.*"],
-        "huey": ["huey==2.*", "redis==3.*"],
+        "huey": ["huey>=2.5.3,<3", "redis==3.*"],
+        # Used to compress results (gzip is used otherwise)
+        "compression": ["brotli==1.*", "zstandard==0.*"],
+        # Used to encode JSON responses faster
+        "orjson": ["orjson==3.*"],
         "testing": [
             # Extra requirements
             "celery[redis,msgpack]==4.*",
-            "huey==2.*",
+            "huey>=2.5.3,<3",
             # Used to manage testing of a Flask application
             "pytest-flask==0.15.*",
             # Used to check coverage
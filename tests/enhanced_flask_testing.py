@@ -1,5 +1,11 @@
+import json
 import re
 
+from flask import Flask
+from flask_restplus import Api, Resource, fields
+
+import flasynk
+
 
 def assert_202_regex(response, expected_location_regex: str) -> str:
     """
@@ -31,3 +37,146 @@ def assert_303_regex(response, expected_location_regex: str) -> str:
     actual_location = response.location.replace("http://localhost", "")
     assert re.match(expected_location_regex, actual_location)
     return actual_location
+
+
+def assert_result_url(client, endpoint: str) -> str:
+    """
+    Call an asynchronous endpoint and assert that its status redirects to the result (303).
+
+    :param client: Flask test client.
+    :param endpoint: Asynchronous endpoint starting from server root (eg: /xxx).
+    :return Result location from server root.
+    """
+    status_url = assert_202_regex(client.get(endpoint), f"{endpoint}/status/.*")
+    return assert_303_regex(client.get(status_url), f"{endpoint}/result/.*")
+
+
+def server_sent_event(message) -> dict:
+    """
+    Fields of a Server-Sent Events message (data being decoded from JSON).
+
+    :param message: Message (ending with an empty line) as str or bytes.
+    :return Message fields (per field name).
+    """
+    if isinstance(message, bytes):
+        message = message.decode()
+    fields = dict(line.split(": ", 1) for line in message.strip("\n").split("\n"))
+    if "data" in fields:
+        fields["data"] = json.loads(fields["data"])
+    return fields
+
+
+def features_client(async_app, task, send, metrics, policies: dict):
+    """
+    Flask test client exposing asynchronous routes relying on every route feature
+    (streaming, marshalling, compression, admission and metrics).
+
+    :param async_app: Celery or Huey application.
+    :param task: Decorator declaring a task of the asynchronous application.
+    :param send: Function sending a task (declared using task) and returning the sent task.
+    :param metrics: Metrics sink provided to the namespace proxy.
+    :param policies: Admission policies, per name ("length" is used by /foo/big, "rate" by /foo/streamed).
+    :return Flask test client.
+    """
+    application = Flask(__name__)
+    application.config["PROPAGATE_EXCEPTIONS"] = False
+    application.testing = True
+    api = Api(application)
+    ns = flasynk.AsyncNamespaceProxy(
+        api.namespace("Features", path="/foo"),
+        async_app,
+        compression_min_size=100,
+        metrics=metrics,
+    )
+    row_model = api.model("RowModel", {"id": fields.Integer, "name": fields.String})
+    created_model = api.model("CreatedModel", {"a": fields.String, "b": fields.String})
+
+    @task
+    def fetch_rows():
+        return [{"id": i, "name": f"row {i}", "other": i} for i in range(3)]
+
+    @task
+    def fetch_count():
+        return 2
+
+    @task
+    def fetch_created():
+        return {"a": "1", "b": "2", "c": "3"}
+
+    @task
+    def fetch_big():
+        return ["a repetitive value"] * 100
+
+    @task
+    def fetch_small():
+        return "small"
+
+    @task
+    def fail():
+        raise Exception("Task failure")
+
+    @ns.asynchronous_route(
+        "/buffered", serializer=[row_model], to_response=lambda rows: rows[:2]
+    )
+    class BufferedEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_rows))
+
+    @ns.asynchronous_route(
+        "/streamed", serializer=[row_model], stream=True, admission=policies["rate"]
+    )
+    class StreamedEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_rows))
+
+    @ns.asynchronous_route(
+        "/generated",
+        serializer=[row_model],
+        to_response=lambda count: ({"id": i} for i in range(count)),
+        stream=True,
+    )
+    class GeneratedEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_count))
+
+    @ns.asynchronous_route(
+        "/created",
+        serializer=created_model,
+        to_response=lambda result: (result, 201, {}),
+    )
+    class CreatedEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_created))
+
+    @ns.asynchronous_route("/big", admission=policies["length"])
+    class BigEndpoint(Resource):
+        @ns.doc(**ns.how_to_get_asynchronous_status_doc)
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_big))
+
+    @ns.asynchronous_route("/small")
+    class SmallEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_small))
+
+    @ns.asynchronous_route("/failure")
+    class FailureEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fail))
+
+    @ns.errorhandler(Exception)
+    def handle_exception(exception):
+        return {"message": str(exception)}, 500
+
+    not_compressed = flasynk.AsyncNamespaceProxy(
+        api.namespace("Not compressed", path="/bar"),
+        async_app,
+        compression_min_size=None,
+    )
+
+    @not_compressed.asynchronous_route("/big")
+    class NotCompressedEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(send(fetch_big))
+
+    return application.test_client()
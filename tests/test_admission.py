@@ -0,0 +1,84 @@
+import pytest
+
+import flasynk.admission
+import flasynk.huey_specifics
+from flasynk.admission import (
+    AdmissionPolicy,
+    MaxQueueLength,
+    MaxQueueWait,
+    TokenBucket,
+)
+
+
+def test_max_queue_length():
+    policy = MaxQueueLength(2, retry_after=10, refresh_interval=0)
+    assert policy.admit(lambda: (1, 0)) is None
+    assert policy.admit(lambda: (2, 0)) == 10
+    assert policy.statistics() == {"admitted": 1, "shed": 1}
+    assert policy.status_code == 503
+    assert policy.message == "Too many tasks are waiting to be computed."
+
+
+def test_max_queue_wait():
+    policy = MaxQueueWait(60, refresh_interval=0)
+    assert policy.admit(lambda: (5, 30)) is None
+    assert policy.admit(lambda: (5, 75.5)) == 16
+    # Waiting time cannot always be known
+    assert policy.admit(lambda: (5, None)) is None
+    assert policy.statistics() == {"admitted": 2, "shed": 1}
+
+
+def test_token_bucket():
+    def queue_status():
+        raise AssertionError("Queue status is not needed")
+
+    policy = TokenBucket(rate=0.001, capacity=2)
+    assert policy.admit(queue_status) is None
+    assert policy.admit(queue_status) is None
+    assert policy.admit(queue_status) > 900
+    assert policy.statistics() == {"admitted": 2, "shed": 1}
+    assert policy.status_code == 429
+    assert policy.message == "Too many tasks were requested."
+
+
+def test_token_bucket_refill(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(flasynk.admission.time, "monotonic", lambda: now[0])
+    policy = TokenBucket(rate=2, capacity=1)
+    assert policy.admit(None) is None
+    assert policy.admit(None) == 1
+    now[0] += 0.5
+    assert policy.admit(None) is None
+
+
+def test_queue_status_is_cached(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(flasynk.admission.time, "monotonic", lambda: now[0])
+    statuses = [(1, None), (3, None)]
+    policy = MaxQueueLength(2, refresh_interval=1)
+    assert policy.admit(lambda: statuses.pop(0)) is None
+    now[0] += 0.5
+    assert policy.admit(lambda: statuses.pop(0)) is None
+    now[0] += 0.5
+    assert policy.admit(lambda: statuses.pop(0)) == 5
+    assert statuses == []
+
+
+def test_calls_are_admitted_if_queue_status_is_unknown():
+    def broker_failure():
+        raise ConnectionError("Broker is down")
+
+    policy = MaxQueueLength(0, refresh_interval=0)
+    assert policy.admit(broker_failure) is None
+
+
+def test_policy_must_decide():
+    with pytest.raises(NotImplementedError):
+        AdmissionPolicy().admit(lambda: (0, 0))
+
+
+def test_huey_queue_status_in_immediate_mode():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    assert flasynk.huey_specifics._queue_status(huey_application) == (0, None)
@@ -0,0 +1,463 @@
+import asyncio
+import json
+import time
+from datetime import datetime
+
+import huey
+import pytest
+from celery import states
+from flask_restplus import Model, fields
+
+import flasynk.asgi
+import flasynk.celery_specifics
+import flasynk.huey_specifics
+import flasynk.retention
+from tests.test_huey import CustomException
+
+
+class AsyncRedisMock:
+    """
+    In memory asyncio Redis client (only the commands used by flasynk).
+    """
+
+    def __init__(self):
+        self.values = {}
+        self.hashes = {}
+        self.expiries = {}
+        self.commands = 0
+
+    async def get(self, key):
+        self.commands += 1
+        return self.values.get(key)
+
+    async def mget(self, key, *keys):
+        self.commands += 1
+        return [self.values.get(key) for key in (key, *keys)]
+
+    async def exists(self, key):
+        self.commands += 1
+        return int(key in self.values)
+
+    async def hget(self, key, field):
+        self.commands += 1
+        return self.hashes.get(key, {}).get(field)
+
+    async def hgetall(self, key):
+        self.commands += 1
+        return self.hashes.get(key, {})
+
+    async def hexists(self, key, field):
+        self.commands += 1
+        return field in self.hashes.get(key, {})
+
+    async def hdel(self, key, field):
+        self.commands += 1
+        return int(self.hashes.get(key, {}).pop(field, None) is not None)
+
+    async def hincrby(self, key, field, amount):
+        self.commands += 1
+        fields = self.hashes.setdefault(key, {})
+        fields[field] = int(fields.get(field, 0)) + amount
+        return fields[field]
+
+    async def delete(self, key):
+        self.commands += 1
+        return int(self.values.pop(key, None) is not None)
+
+    async def expire(self, key, seconds):
+        self.commands += 1
+        self.expiries[key] = seconds
+        return int(key in self.values or key in self.hashes)
+
+
+def _request(application, path: str, query_string: bytes = b"", method="GET"):
+    return asyncio.get_event_loop().run_until_complete(
+        _arequest(application, path, query_string, method)
+    )
+
+
+async def _arequest(application, path: str, query_string: bytes = b"", method="GET"):
+    messages = []
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    async def send(message):
+        messages.append(message)
+
+    await application(
+        {
+            "type": "http",
+            "method": method,
+            "scheme": "http",
+            "server": ("localhost", 80),
+            "path": path,
+            "query_string": query_string,
+            "headers": [(b"host", b"localhost")],
+        },
+        receive,
+        send,
+    )
+    start, body = messages
+    return start["status"], dict(start["headers"]), body["body"]
+
+
+@pytest.fixture
+def redis():
+    return AsyncRedisMock()
+
+
+@pytest.fixture
+def huey_application():
+    return flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+
+
+@pytest.fixture
+def huey_asgi(huey_application, redis):
+    application = flasynk.asgi.AsyncStatusApplication(huey_application, redis)
+    application.asynchronous_route(
+        "/foo/bar",
+        serializer=Model("BarModel", {"foo": fields.String}),
+    )
+    application.asynchronous_route(
+        "/foo/<int:factor>/list",
+        serializer=[Model("BarModel", {"foo": fields.Integer})],
+        to_response=lambda result, factor: [
+            {"foo": value * factor} for value in result
+        ],
+    )
+    return application
+
+
+def _store_huey_result(huey_application, redis, task_id: str, result):
+    redis.hashes.setdefault(huey_application.storage.result_key, {})[
+        task_id
+    ] = huey_application.serializer.serialize(result)
+
+
+def test_huey_status_and_result(huey_asgi, huey_application, redis):
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42")
+    assert status == 200
+    assert json.loads(body) == {"state": "PENDING"}
+    # Ends with a new line as Flask JSON responses
+    assert body.endswith(b"\n")
+    assert headers[b"retry-after"] == b"1"
+
+    _store_huey_result(huey_application, redis, "42", {"foo": "bar", "other": 1})
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42")
+    assert status == 303
+    assert headers[b"location"] == b"http://localhost/foo/bar/result/42"
+
+    status, headers, body = _request(huey_asgi, "/foo/bar/result/42")
+    assert status == 200
+    assert headers[b"content-type"] == b"application/json"
+    assert json.loads(body) == {"foo": "bar"}
+    # Huey results can only be read once
+    status, headers, body = _request(huey_asgi, "/foo/bar/result/42")
+    assert status == 202
+    assert headers[b"location"] == b"http://localhost/foo/bar/status/42"
+
+
+def test_huey_result_with_path_parameters(huey_asgi, huey_application, redis):
+    _store_huey_result(huey_application, redis, "42", [1, 2])
+    status, headers, body = _request(huey_asgi, "/foo/3/list/result/42")
+    assert status == 200
+    assert json.loads(body) == [{"foo": 3}, {"foo": 6}]
+
+
+def test_huey_exception_is_propagated(huey_asgi, huey_application, redis):
+    _store_huey_result(
+        huey_application,
+        redis,
+        "42",
+        huey.utils.Error({"error": "CustomException('Custom message')"}),
+    )
+    status, headers, body = _request(huey_asgi, "/foo/bar/result/42")
+    assert status == 500
+    assert json.loads(body) == {"message": "Custom message"}
+
+
+def test_huey_expiring_result(redis):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}},
+        storage_class=huey.storage.RedisExpireStorage,
+    )
+    application = flasynk.asgi.AsyncStatusApplication(huey_application, redis)
+    application.asynchronous_route("/foo/bar")
+    storage = huey_application.storage
+    assert _request(application, "/foo/bar/status/42")[0] == 200
+    assert _request(application, "/foo/bar/result/42")[0] == 202
+    redis.values[storage.result_key("42")] = huey_application.serializer.serialize(
+        "value"
+    )
+    assert _request(application, "/foo/bar/status/42")[0] == 303
+    assert json.loads(_request(application, "/foo/bar/result/42")[2]) == "value"
+    # Expiring results can be read many times
+    assert json.loads(_request(application, "/foo/bar/result/42")[2]) == "value"
+
+
+def test_huey_result_removed_after_reads(huey_application, redis):
+    application = flasynk.asgi.AsyncStatusApplication(huey_application, redis)
+    application.asynchronous_route(
+        "/foo/bar", retention=flasynk.retention.DeleteAfterReads(2)
+    )
+    _store_huey_result(huey_application, redis, "42", "value")
+    assert json.loads(_request(application, "/foo/bar/result/42")[2]) == "value"
+    assert json.loads(_request(application, "/foo/bar/result/42")[2]) == "value"
+    assert "42" not in redis.hashes[huey_application.storage.result_key]
+    assert redis.hashes[f"huey.flasynk.{huey_application.name}.42"]["reads"] == 2
+    # Missing results are not counted as read
+    assert _request(application, "/foo/bar/result/42")[0] == 202
+    assert redis.hashes[f"huey.flasynk.{huey_application.name}.42"]["reads"] == 2
+
+
+def test_huey_expiring_result_retention(redis):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/", "result_expiry": 3600}}
+    )
+    application = flasynk.asgi.AsyncStatusApplication(huey_application, redis)
+    application.asynchronous_route("/foo/bar", retention=flasynk.retention.KeepFor(60))
+    application.asynchronous_route(
+        "/foo/once", retention=flasynk.retention.DeleteOnRead()
+    )
+    storage = huey_application.storage
+    redis.values[storage.result_key("42")] = huey_application.serializer.serialize(
+        "value"
+    )
+    assert json.loads(_request(application, "/foo/bar/result/42")[2]) == "value"
+    assert redis.expiries[storage.result_key("42")] == 60
+    assert json.loads(_request(application, "/foo/once/result/42")[2]) == "value"
+    assert storage.result_key("42") not in redis.values
+
+
+def test_celery_retention_is_not_supported(celery_application, redis):
+    application = flasynk.asgi.AsyncStatusApplication(celery_application, redis)
+    with pytest.raises(ValueError):
+        application.asynchronous_route(
+            "/foo/bar", retention=flasynk.retention.DeleteOnRead()
+        )
+
+
+def test_waiting_for_result(huey_asgi, huey_application, redis):
+    async def store_result_later():
+        await asyncio.sleep(0.2)
+        _store_huey_result(huey_application, redis, "42", "value")
+
+    async def wait_for_result():
+        return await asyncio.gather(
+            _arequest(huey_asgi, "/foo/bar/status/42", b"wait=5"),
+            store_result_later(),
+        )
+
+    start = time.monotonic()
+    (status, headers, body), _ = asyncio.get_event_loop().run_until_complete(
+        wait_for_result()
+    )
+    assert status == 303
+    assert time.monotonic() - start < 5
+
+
+def test_waiting_for_result_timeout(huey_asgi):
+    start = time.monotonic()
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42", b"wait=0.2")
+    assert time.monotonic() - start >= 0.2
+    assert status == 200
+
+
+def test_many_concurrent_polls_do_not_hold_threads(huey_asgi, huey_application, redis):
+    async def store_results_later():
+        await asyncio.sleep(0.3)
+        for task_id in range(2000):
+            _store_huey_result(huey_application, redis, str(task_id), "value")
+
+    async def poll():
+        return await asyncio.gather(
+            *[
+                _arequest(huey_asgi, f"/foo/bar/status/{task_id}", b"wait=10")
+                for task_id in range(2000)
+            ],
+            store_results_later(),
+        )
+
+    start = time.monotonic()
+    replies = asyncio.get_event_loop().run_until_complete(poll())[:-1]
+    assert time.monotonic() - start < 10
+    assert {status for status, _, _ in replies} == {303}
+
+
+def test_unknown_route(huey_asgi):
+    status, headers, body = _request(huey_asgi, "/foo/unknown/status/42")
+    assert status == 404
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42", method="POST")
+    assert status == 405
+
+
+def test_base_url_behind_reverse_proxy():
+    assert (
+        flasynk.asgi._base_url(
+            {
+                "scheme": "https",
+                "path": "/foo/bar/status/42",
+                "server": ("localhost", 8080),
+                "headers": [
+                    (b"X-Original-Request-Uri", b"/api/foo/bar/status/42?wait=1")
+                ],
+            }
+        )
+        == "https://localhost:8080/api/foo/bar/status/42"
+    )
+
+
+def test_invalid_wait():
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=invalid"}, 30) == 0
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=60"}, 30) == 30
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=nan"}, 30) == 0
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=inf"}, 30) == 0
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=1e400"}, 30) == 0
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=-1"}, 30) == 0
+    assert flasynk.asgi._requested_wait({"query_string": b"wait=2.5"}, 30) == 2.5
+    assert flasynk.asgi._requested_wait({}, 30) == 0
+
+
+def test_lifespan(huey_asgi):
+    messages = [{"type": "lifespan.startup"}, {"type": "lifespan.shutdown"}]
+    sent = []
+
+    async def receive():
+        return messages.pop(0)
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.get_event_loop().run_until_complete(
+        huey_asgi({"type": "lifespan"}, receive, send)
+    )
+    assert sent == [
+        {"type": "lifespan.startup.complete"},
+        {"type": "lifespan.shutdown.complete"},
+    ]
+
+
+@pytest.fixture
+def celery_application():
+    return flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "redis://localhost/"}}
+    )
+
+
+@pytest.fixture
+def celery_asgi(celery_application, redis):
+    application = flasynk.asgi.AsyncStatusApplication(celery_application, redis)
+    application.asynchronous_route("/foo/bar")
+    return application
+
+
+def _store_celery_result(celery_application, redis, task_id: str, state, result):
+    backend = celery_application.backend
+    redis.values[backend.get_key_for_task(task_id)] = backend.encode(
+        backend._get_result_meta(result, state, None, None)
+    )
+
+
+def test_celery_status_and_result(celery_asgi, celery_application, redis):
+    status, headers, body = _request(celery_asgi, "/foo/bar/status/42")
+    assert status == 200
+    assert json.loads(body) == {"state": "PENDING"}
+
+    _store_celery_result(celery_application, redis, "42", states.STARTED, None)
+    assert json.loads(_request(celery_asgi, "/foo/bar/status/42")[2]) == {
+        "state": "STARTED"
+    }
+    status, headers, body = _request(celery_asgi, "/foo/bar/result/42")
+    assert status == 202
+    assert dict(headers)[b"location"] == b"http://localhost/foo/bar/status/42"
+    assert json.loads(body) == {
+        "task_id": "42",
+        "url": "http://localhost/foo/bar/status/42",
+    }
+
+    _store_celery_result(celery_application, redis, "42", states.SUCCESS, 3)
+    status, headers, body = _request(celery_asgi, "/foo/bar/status/42")
+    assert status == 303
+    assert json.loads(_request(celery_asgi, "/foo/bar/result/42")[2]) == 3
+
+
+def test_celery_exception_is_propagated(celery_asgi, celery_application, redis):
+    _store_celery_result(
+        celery_application,
+        redis,
+        "42",
+        states.FAILURE,
+        celery_application.backend.prepare_exception(ValueError("Invalid value")),
+    )
+    status, headers, body = _request(celery_asgi, "/foo/bar/result/42")
+    assert status == 500
+    assert json.loads(body) == {"message": "Invalid value"}
+
+
+def test_huey_progress(huey_asgi, huey_application, redis):
+    redis.hashes[f"huey.flasynk.{huey_application.name}.42"] = {
+        "progress": b'{"percent": 50}'
+    }
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42")
+    assert status == 200
+    assert json.loads(body) == {"state": "PENDING", "progress": {"percent": 50}}
+
+
+def test_celery_progress(celery_asgi, celery_application, redis):
+    backend = celery_application.backend
+    redis.values[backend.get_key_for_task("42", "-details")] = backend.encode(
+        {"progress": {"stage": "download"}}
+    )
+    status, headers, body = _request(celery_asgi, "/foo/bar/status/42")
+    assert status == 200
+    assert json.loads(body) == {"state": "PENDING", "progress": {"stage": "download"}}
+
+
+def test_huey_eta(huey_asgi, huey_application, redis):
+    now = time.time()
+    redis.hashes[f"huey.flasynk.{huey_application.name}.42"] = {
+        b"name": b"tests.task",
+        b"enqueued": str(now - 1).encode(),
+    }
+    window = int(now // 3600)
+    # Median waiting time is 5 seconds and median running time is 1 second
+    redis.hashes[
+        f"huey.flasynk.{huey_application.name}.durations.tests.task.{window - 1}"
+    ] = {b"wait:5": b"1", b"run:3": b"1"}
+    status, headers, body = _request(huey_asgi, "/foo/bar/status/42")
+    assert status == 200
+    state = json.loads(body)
+    assert sorted(state) == ["enqueued", "eta", "state"]
+    assert datetime.fromisoformat(state["eta"]).timestamp() == pytest.approx(now + 5)
+    # Client is advised to check again once task should be computed
+    assert headers[b"retry-after"] == b"5"
+
+    # Durations recently read are not read again
+    redis.commands = 0
+    assert _request(huey_asgi, "/foo/bar/status/42")[0] == 200
+    assert redis.commands == 2
+
+
+def test_celery_eta(celery_asgi, celery_application, redis):
+    backend = celery_application.backend
+    now = time.time()
+    redis.values[backend.get_key_for_task("42", "-details")] = backend.encode(
+        {"name": "tests.task", "started": now - 1, "updated": now - 1}
+    )
+    window = int(now // 3600)
+    # Task is already running for longer than the median running time
+    redis.hashes[f"celery-flasynk-durations-tests.task-{window}"] = {b"run:0": b"1"}
+    status, headers, body = _request(celery_asgi, "/foo/bar/status/42")
+    assert status == 200
+    state = json.loads(body)
+    assert sorted(state) == ["eta", "started", "state", "updated"]
+    assert datetime.fromisoformat(state["eta"]).timestamp() == pytest.approx(now, abs=1)
+    assert headers[b"retry-after"] == b"1"
+
+    # Task state and details are retrieved at once, durations recently read are not read again
+    redis.commands = 0
+    assert _request(celery_asgi, "/foo/bar/status/42")[0] == 200
+    assert redis.commands == 1
@@ -1,16 +1,34 @@
 import unittest.mock as mock
+import gzip
+import json
 import os
 import datetime
 import re
+import sys
+import time
 
+import celery.exceptions
+import celery.result
+import celery.states
 import pytest
 from flask import Flask, make_response
 from flask_restplus import Api, Resource, fields
 
 import flasynk
+import flasynk._durations
 import flasynk.celery_specifics
 import flasynk.celery_mock
-from tests.enhanced_flask_testing import assert_202_regex, assert_303_regex
+import flasynk.exceptions
+from flasynk.admission import MaxQueueLength, TokenBucket
+from flasynk.retention import DeleteOnRead
+from tests import enhanced_flask_testing
+from tests.enhanced_flask_testing import (
+    assert_202_regex,
+    assert_303_regex,
+    assert_result_url,
+    server_sent_event,
+)
+from tests.test_metrics import RecordingSink, metric_labels
 
 
 class UTCDateTimeMock:
@@ -130,7 +148,7 @@ def app():
     return application
 
 
-def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
+def test_async_ns_proxy_creates_extra_endpoints_per_declared_endpoint(client):
     response = client.get("/swagger.json")
     assert response.status_code == 200
     assert response.json == {
@@ -155,6 +173,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/bar/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar/result/{task_id}": {
                 "parameters": [
                     {
@@ -169,7 +211,19 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Success",
                             "schema": {"$ref": "#/definitions/BarModel"},
-                        }
+                        },
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
                     },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_result",
@@ -185,6 +239,29 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
+            "/foo/bar/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar/status/{task_id}": {
                 "parameters": [
                     {
@@ -199,6 +276,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -216,6 +299,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -237,6 +328,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/bar2/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint2_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar2/result/{task_id}": {
                 "parameters": [
                     {
@@ -254,7 +369,19 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                                 "type": "array",
                                 "items": {"$ref": "#/definitions/Bar2Model"},
                             },
-                        }
+                        },
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
                     },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint2_result",
@@ -270,6 +397,29 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
+            "/foo/bar2/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint2_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar2/status/{task_id}": {
                 "parameters": [
                     {
@@ -284,6 +434,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -301,6 +457,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint2_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -322,6 +486,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/csv/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_no_serialization_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/csv/result/{task_id}": {
                 "parameters": [
                     {
@@ -332,12 +520,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_no_serialization_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/csv/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_no_serialization_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/csv/status/{task_id}": {
                 "parameters": [
                     {
@@ -352,6 +577,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -369,6 +600,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_no_serialization_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -390,6 +629,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/exception/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_exception_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/exception/result/{task_id}": {
                 "parameters": [
                     {
@@ -400,12 +663,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_exception_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/exception/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_exception_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/exception/status/{task_id}": {
                 "parameters": [
                     {
@@ -420,6 +720,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -437,6 +743,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_exception_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -458,6 +772,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/modified_task_result/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_modified_task_result_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/modified_task_result/result/{task_id}": {
                 "parameters": [
                     {
@@ -468,12 +806,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_modified_task_result_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/modified_task_result/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_modified_task_result_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/modified_task_result/status/{task_id}": {
                 "parameters": [
                     {
@@ -488,6 +863,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -505,6 +886,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_modified_task_result_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -540,7 +929,7 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
-            "/foo/path_parameters/{str_value}/{int_value}/result/{task_id}": {
+            "/foo/path_parameters/{str_value}/{int_value}/events": {
                 "parameters": [
                     {
                         "name": "str_value",
@@ -554,21 +943,31 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "required": True,
                         "type": "integer",
                     },
-                    {
-                        "name": "task_id",
-                        "in": "path",
-                        "required": True,
-                        "type": "string",
-                    },
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
-                    "summary": "Retrieve result for provided task",
-                    "operationId": "get_test_endpoint_with_path_parameter_result",
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_with_path_parameter_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
-            "/foo/path_parameters/{str_value}/{int_value}/status/{task_id}": {
+            "/foo/path_parameters/{str_value}/{int_value}/result/{task_id}": {
                 "parameters": [
                     {
                         "name": "str_value",
@@ -591,30 +990,123 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                 ],
                 "get": {
                     "responses": {
-                        "200": {
-                            "description": "Task is still computing.",
-                            "schema": {"$ref": "#/definitions/CurrentAsyncState"},
-                        },
-                        "303": {
-                            "description": "Result is available.",
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
                             "headers": {
                                 "location": {
-                                    "description": "URL to fetch results from.",
+                                    "description": "URL to fetch computation status from.",
                                     "type": "string",
                                 }
                             },
                         },
-                        "500": {
-                            "description": "An unexpected error occurred.",
-                            "schema": {"type": "string", "description": "Stack trace."},
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
                         },
                     },
-                    "summary": "Retrieve status for provided task",
-                    "operationId": "get_test_endpoint_with_path_parameter_status",
+                    "summary": "Retrieve result for provided task",
+                    "operationId": "get_test_endpoint_with_path_parameter_result",
                     "tags": ["Test space"],
                 },
             },
-        },
+            "/foo/path_parameters/{str_value}/{int_value}/status": {
+                "parameters": [
+                    {
+                        "name": "str_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    },
+                    {
+                        "name": "int_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "integer",
+                    },
+                ],
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_with_path_parameter_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                },
+            },
+            "/foo/path_parameters/{str_value}/{int_value}/status/{task_id}": {
+                "parameters": [
+                    {
+                        "name": "str_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    },
+                    {
+                        "name": "int_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "integer",
+                    },
+                    {
+                        "name": "task_id",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    },
+                ],
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Task is still computing.",
+                            "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "303": {
+                            "description": "Result is available.",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch results from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "An unexpected error occurred.",
+                            "schema": {"type": "string", "description": "Stack trace."},
+                        },
+                    },
+                    "summary": "Retrieve status for provided task",
+                    "operationId": "get_test_endpoint_with_path_parameter_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                },
+            },
+        },
         "info": {"title": "API", "version": "1.0"},
         "produces": ["application/json"],
         "consumes": ["application/json"],
@@ -642,6 +1134,58 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "type": "string",
                         "description": "Indicates current computation state.",
                         "example": "PENDING",
+                    },
+                    "progress": {
+                        "description": "Progress reported by the task (if any).",
+                        "allOf": [{"$ref": "#/definitions/AsyncProgress"}],
+                    },
+                    "enqueued": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task was sent (if known).",
+                    },
+                    "started": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task started computing (if started).",
+                    },
+                    "updated": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task state or progress last changed (if known).",
+                    },
+                    "eta": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Estimated time at which result will be available (according to the duration of recent tasks).",
+                    },
+                },
+                "type": "object",
+            },
+            "AsyncProgress": {
+                "properties": {
+                    "percent": {
+                        "type": "number",
+                        "description": "Percentage of the computation that is done.",
+                    },
+                    "stage": {
+                        "type": "string",
+                        "description": "Current computation stage.",
+                    },
+                    "counters": {
+                        "type": "object",
+                        "description": "Any other progress indicator.",
+                    },
+                },
+                "type": "object",
+            },
+            "AsyncTasksStatusRequestModel": {
+                "required": ["task_ids"],
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "description": "Tasks Ids.",
+                        "items": {"type": "string"},
                     }
                 },
                 "type": "object",
@@ -823,3 +1367,763 @@ def test_health_details_ping_exception(client, monkeypatch):
             "time": "2018-10-11T15:05:05.663979",
         }
     }
+
+
+def test_async_call_task_waiting_for_result(client):
+    response = client.get("/foo/bar")
+    status_url = assert_202_regex(response, "/foo/bar/status/.*")
+    status_reply = client.get(f"{status_url}?wait=5")
+    result_url = assert_303_regex(status_reply, "/foo/bar/result/.*")
+    result_reply = client.get(result_url)
+    assert result_reply.status_code == 200
+    assert result_reply.json == {"status": "why not", "foo": "bar"}
+
+
+def test_async_call_task_without_endpoint_call_waiting_for_result(client):
+    status_reply = client.get("/foo/bar/status/42?wait=0.2")
+    assert status_reply.status_code == 200
+    assert status_reply.json == {"state": "PENDING"}
+
+
+def test_async_call_task_events(client):
+    task_id = client.get("/foo/bar").json["task_id"]
+    events_reply = client.get(
+        f"/foo/bar/events?task_id={task_id}&task_id=42", buffered=False
+    )
+    assert events_reply.status_code == 200
+    events = iter(events_reply.response)
+    assert next(events) == b"retry: 1000\n\n"
+    assert server_sent_event(next(events)) == {
+        "event": "result-ready",
+        "data": {
+            "task_id": task_id,
+            "url": f"http://localhost/foo/bar/result/{task_id}",
+        },
+    }
+    assert server_sent_event(next(events)) == {
+        "event": "state",
+        "data": {"task_id": "42", "state": "PENDING"},
+    }
+    events_reply.close()
+
+
+def test_async_call_task_events_until_result_is_ready(client):
+    events_reply = client.get("/foo/bar/events?task_id=events-42", buffered=False)
+    events = iter(events_reply.response)
+    assert next(events) == b"retry: 1000\n\n"
+    assert server_sent_event(next(events)) == {
+        "event": "state",
+        "data": {"task_id": "events-42", "state": "PENDING"},
+    }
+    celery.current_app.backend.store_result("events-42", 3, celery.states.SUCCESS)
+    assert [server_sent_event(event) for event in events] == [
+        {
+            "event": "result-ready",
+            "data": {
+                "task_id": "events-42",
+                "url": "http://localhost/foo/bar/result/events-42",
+            },
+        }
+    ]
+
+
+def test_async_call_tasks_events_until_results_are_ready(client):
+    events_reply = client.get(
+        "/foo/bar/events?task_id=events-43&task_id=events-44", buffered=False
+    )
+    events = iter(events_reply.response)
+    assert next(events) == b"retry: 1000\n\n"
+    assert server_sent_event(next(events)) == {
+        "event": "state",
+        "data": {"task_id": "events-43", "state": "PENDING"},
+    }
+    assert server_sent_event(next(events)) == {
+        "event": "state",
+        "data": {"task_id": "events-44", "state": "PENDING"},
+    }
+    celery.current_app.backend.store_result("events-43", 3, celery.states.SUCCESS)
+    celery.current_app.backend.store_result("events-44", 3, celery.states.SUCCESS)
+    assert [server_sent_event(event) for event in events] == [
+        {
+            "event": "result-ready",
+            "data": {
+                "task_id": task_id,
+                "url": f"http://localhost/foo/bar/result/{task_id}",
+            },
+        }
+        for task_id in ("events-43", "events-44")
+    ]
+
+
+def test_async_call_task_still_computing_after_waiting_for_result(client, monkeypatch):
+    class StillComputingTask:
+        def get(self, timeout, propagate):
+            raise celery.exceptions.TimeoutError()
+
+    monkeypatch.setattr(
+        celery.result, "AsyncResult", lambda celery_task_id, app: StillComputingTask()
+    )
+    celery.current_app.backend.store_result("42", None, celery.states.STARTED)
+    status_reply = client.get("/foo/bar/status/42?wait=0.2")
+    assert status_reply.status_code == 200
+    assert status_reply.json == {"state": "STARTED"}
+
+
+def test_async_call_tasks_status(client):
+    task_id = client.get("/foo/bar").json["task_id"]
+    status_reply = client.post(
+        "/foo/bar/status", json={"task_ids": [task_id, "unknown"]}
+    )
+    assert status_reply.status_code == 200
+    assert status_reply.json == {
+        task_id: {"url": f"http://localhost/foo/bar/result/{task_id}"},
+        "unknown": {"state": "PENDING"},
+    }
+
+
+def test_async_call_tasks_status_without_task_ids(client):
+    status_reply = client.post("/foo/bar/status", json={"task_ids": "unknown"})
+    assert status_reply.status_code == 400
+    assert status_reply.json == {"message": "task_ids must be a list of task ids."}
+
+
+def test_tasks_are_retrieved_one_by_one_without_bulk_support(client, monkeypatch):
+    backend = celery.current_app.backend
+
+    def mget_not_supported(keys):
+        raise NotImplementedError("Does not support get_many")
+
+    monkeypatch.setattr(backend, "mget", mget_not_supported)
+    backend.store_result("bulk-42", 3, celery.states.SUCCESS)
+    flasynk.celery_mock._stores[celery.current_app._get_current_object()].add(
+        celery.result.EagerResult("bulk-42", 3, celery.states.SUCCESS)
+    )
+    celery_tasks = flasynk.celery_specifics._get_asynchronous_tasks(
+        ["bulk-42", "bulk-43"], celery.current_app
+    )
+    assert [celery_task.state for celery_task in celery_tasks] == [
+        "SUCCESS",
+        "PENDING",
+    ]
+
+
+def test_tasks_are_retrieved_one_by_one_without_key_value_backend(client):
+    celery_app = celery.Celery(
+        "rpc_backend",
+        broker="memory://localhost/",
+        backend="rpc://",
+        set_as_current=False,
+    )
+    celery_tasks = flasynk.celery_specifics._get_asynchronous_tasks(
+        ["rpc-42"], celery_app
+    )
+    assert [celery_task.state for celery_task in celery_tasks] == ["PENDING"]
+
+
+def test_backend_is_resolved_once_per_proxy(monkeypatch):
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "memory://"}}
+    )
+    module = mock.Mock(wraps=flasynk._asynchronous._module)
+    monkeypatch.setattr(flasynk._asynchronous, "_module", module)
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"), celery_application
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    client = application.test_client()
+    client.get("/foo/bar/status/42")
+    client.post("/foo/bar/status", json={"task_ids": ["42"]})
+    module.assert_called_once_with(celery_application)
+
+
+def test_celery_backend_does_not_import_huey(monkeypatch):
+    monkeypatch.delitem(sys.modules, "huey", raising=False)
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "memory://"}}
+    )
+    assert flasynk._asynchronous._module(celery_application) is flasynk.celery_specifics
+    assert "huey" not in sys.modules
+
+
+def test_result_of_pending_task_provides_status_url(client):
+    result_reply = client.get("/foo/bar/result/unknown")
+    assert_202_regex(result_reply, "/foo/bar/status/unknown$")
+    assert result_reply.json == {
+        "task_id": "unknown",
+        "url": "http://localhost/foo/bar/status/unknown",
+    }
+
+
+def _application_waiting_for_result(max_result_wait: float):
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "cache+memory://"}}
+    )
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"),
+        celery_application,
+        max_result_wait=max_result_wait,
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    return celery_application, application.test_client()
+
+
+def test_result_is_waited_for(monkeypatch):
+    celery_application, client = _application_waiting_for_result(0.5)
+
+    def compute_while_waiting(celery_task_id, celery_app, timeout):
+        assert timeout == 0.5
+        celery_app.backend.store_result(celery_task_id, 3, celery.states.SUCCESS)
+        return celery.result.EagerResult(celery_task_id, 3, celery.states.SUCCESS)
+
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_wait_for_asynchronous_task", compute_while_waiting
+    )
+    result_reply = client.get("/foo/bar/result/42")
+    assert result_reply.status_code == 200
+    assert result_reply.json == 3
+
+
+def test_result_still_computing_after_waiting(monkeypatch):
+    celery_application, client = _application_waiting_for_result(0.1)
+    celery_application.backend.store_result("42", None, celery.states.STARTED)
+    assert_202_regex(client.get("/foo/bar/result/42"), "/foo/bar/status/42$")
+
+
+def test_result_is_read_without_key_value_backend():
+    celery_app = celery.Celery(
+        "rpc_backend",
+        broker="memory://localhost/",
+        backend="rpc://",
+        set_as_current=False,
+    )
+    with pytest.raises(flasynk.exceptions.ResultNotAvailable) as exception_info:
+        flasynk.celery_specifics._get_asynchronous_result(celery_app, "rpc-42")
+    assert exception_info.value.state == "PENDING"
+
+
+def test_progress_is_provided_with_status():
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "cache+memory://"}}
+    )
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50, stage="download", files=3)
+
+    report_progress.apply(task_id="progress-42")
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"), celery_application
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    # Task result is not stored by apply
+    response = application.test_client().get("/foo/bar/status/progress-42")
+    assert response.status_code == 200
+    status = response.json
+    assert status.pop("state") == "PENDING"
+    assert status.pop("progress") == {
+        "percent": 50,
+        "stage": "download",
+        "counters": {"files": 3},
+    }
+    # Task was applied (not sent) so enqueue time is unknown
+    assert sorted(status) == ["started", "updated"]
+    assert status["started"] <= status["updated"]
+    response = application.test_client().get("/foo/bar/status/progress-43")
+    assert response.json == {"state": "PENDING"}
+
+
+def test_progress_is_not_reported_without_key_value_backend():
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "rpc://"}}
+    )
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    report_progress.apply(task_id="rpc-progress-42")
+    assert _task_details(celery_application, "rpc-progress-42") == {}
+
+
+def _task_details(celery_application, celery_task_id: str, recent_histograms=None):
+    return flasynk.celery_specifics._get_task_details(
+        celery_application,
+        flasynk.celery_specifics._get_asynchronous_task(
+            celery_task_id, celery_application
+        ),
+        recent_histograms,
+    )
+
+
+def _task_details_application(**changes):
+    return flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "cache+memory://"}},
+        changes=changes,
+    )
+
+
+def test_progress_is_not_reported_when_task_is_called_directly():
+    celery_application = _task_details_application()
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    # Not within a worker (no current task)
+    report_progress()
+    flasynk.celery_specifics.report_progress(percent=50)
+
+
+def test_task_details_are_not_recorded_when_result_is_ignored():
+    celery_application = _task_details_application()
+
+    @celery_application.task(ignore_result=True)
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    report_progress.apply(task_id="ignored-42")
+    assert _task_details(celery_application, "ignored-42") == {}
+
+
+def test_task_details_recording_can_be_disabled():
+    celery_application = _task_details_application(flasynk_task_details=False)
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    report_progress.apply(task_id="disabled-42")
+    assert _task_details(celery_application, "disabled-42") == {}
+
+
+def test_task_details_are_not_recorded_for_other_applications():
+    # Ensure handlers are connected
+    _task_details_application()
+    celery_application = celery.Celery(
+        "other_application",
+        broker="memory://localhost/",
+        backend="cache+memory://",
+        set_as_current=False,
+    )
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    report_progress.apply(task_id="other-42")
+    assert _task_details(celery_application, "other-42") == {}
+
+
+def _redis_backend_application():
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "redis://localhost/"}}
+    )
+    celery_application.backend.client = mock.MagicMock()
+    return celery_application
+
+
+def test_task_durations_are_recorded():
+    celery_application = _redis_backend_application()
+
+    @celery_application.task
+    def timed_task():
+        pass
+
+    sent = time.time() - 4
+    timed_task.apply(task_id="timed-42", headers={"flasynk_sent": sent})
+    pipeline = celery_application.backend.client.pipeline.return_value
+    window = int(time.time() // 3600)
+    key = f"celery-flasynk-durations-{timed_task.name}-{window}"
+    # Task waited 4 seconds in queue (2.5 < wait <= 5) and computed almost instantly
+    pipeline.hincrby.assert_has_calls(
+        [mock.call(key, "wait:5", 1), mock.call(key, "run:0", 1)]
+    )
+    pipeline.expire.assert_called_with(key, 2 * 3600)
+    pipeline.execute.assert_called_once_with()
+
+
+def test_eta_is_provided_with_status():
+    celery_application = _redis_backend_application()
+    backend = celery_application.backend
+    now = time.time()
+    backend.client.mget.return_value = [
+        None,
+        backend.encode(
+            {
+                "name": "tests.task",
+                "enqueued": now - 3,
+                "started": now - 2,
+                "updated": now,
+            }
+        ),
+    ]
+    pipeline = backend.client.pipeline.return_value
+    # Median running time is 10 seconds (5 < run <= 10)
+    pipeline.execute.return_value = [{b"run:6": b"2"}, {b"run:3": b"1"}]
+
+    details = _task_details(celery_application, "42")
+    assert sorted(details) == ["enqueued", "eta", "started", "updated"]
+    assert details["eta"].timestamp() == pytest.approx(now + 8)
+    # Task state and details are retrieved at once
+    backend.client.mget.assert_called_once_with(
+        [backend.get_key_for_task("42"), backend.get_key_for_task("42", "-details")]
+    )
+    backend.client.get.assert_not_called()
+    window = int(now // 3600)
+    pipeline.hgetall.assert_has_calls(
+        [
+            mock.call(f"celery-flasynk-durations-tests.task-{window}"),
+            mock.call(f"celery-flasynk-durations-tests.task-{window - 1}"),
+        ]
+    )
+
+
+def test_recent_durations_are_not_read_again():
+    celery_application = _redis_backend_application()
+    backend = celery_application.backend
+    backend.client.mget.return_value = [
+        None,
+        backend.encode({"name": "tests.task", "started": time.time()}),
+    ]
+    pipeline = backend.client.pipeline.return_value
+    pipeline.execute.return_value = [{b"run:6": b"2"}, {}]
+    recent_histograms = flasynk._durations.RecentHistograms()
+
+    first = _task_details(celery_application, "42", recent_histograms)
+    assert _task_details(celery_application, "42", recent_histograms) == first
+    pipeline.execute.assert_called_once_with()
+
+
+def test_task_details_are_read_when_not_retrieved_alongside_state(monkeypatch):
+    celery_application = _task_details_application()
+
+    @celery_application.task
+    def report_progress():
+        flasynk.celery_specifics.report_progress(percent=50)
+
+    report_progress.apply(task_id="no-mget-42")
+
+    def not_implemented(keys):
+        raise NotImplementedError()
+
+    monkeypatch.setattr(celery_application.backend, "mget", not_implemented)
+    assert _task_details(celery_application, "no-mget-42")["progress"] == {
+        "percent": 50
+    }
+
+
+@pytest.fixture
+def sink():
+    return RecordingSink()
+
+
+@pytest.fixture
+def policies():
+    return {
+        "length": MaxQueueLength(2, retry_after=10, refresh_interval=0),
+        "rate": TokenBucket(rate=0.001, capacity=1),
+    }
+
+
+@pytest.fixture
+def features_client(sink, policies):
+    celery_application = flasynk.celery_mock.CeleryMock(
+        flasynk.celery_specifics.build_async_application(
+            {"celery": {"broker": "memory://localhost/", "backend": "memory://"}}
+        )
+    )
+    return enhanced_flask_testing.features_client(
+        celery_application,
+        celery_application.task(queue=celery_application.namespace),
+        lambda task: task.apply_async(),
+        sink,
+        policies,
+    )
+
+
+def test_streamed_result_is_identical_to_buffered_result(features_client):
+    streamed = features_client.get(assert_result_url(features_client, "/foo/streamed"))
+    buffered = features_client.get(assert_result_url(features_client, "/foo/buffered"))
+    assert streamed.status_code == 200
+    assert streamed.is_streamed
+    assert "Content-Length" not in streamed.headers
+    assert streamed.headers["Content-Type"] == "application/json"
+    assert (
+        streamed.json[:2]
+        == buffered.json
+        == [
+            {"id": 0, "name": "row 0"},
+            {"id": 1, "name": "row 1"},
+        ]
+    )
+    assert streamed.json[2] == {"id": 2, "name": "row 2"}
+    assert streamed.get_data(as_text=True).endswith("]\n")
+
+
+def test_streamed_result_with_mask(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/streamed"),
+        headers={"X-Fields": "name"},
+    )
+    assert response.json == [{"name": "row 0"}, {"name": "row 1"}, {"name": "row 2"}]
+
+
+def test_streamed_result_from_generator(features_client):
+    response = features_client.get(assert_result_url(features_client, "/foo/generated"))
+    assert response.json == [{"id": 0, "name": None}, {"id": 1, "name": None}]
+
+
+def test_result_is_compressed_when_accepted(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/big"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == ["a repetitive value"] * 100
+    assert response.headers["ETag"].endswith('-gzip"')
+
+
+def test_compressed_result_is_not_retrieved_again_if_not_modified(features_client):
+    result_url = assert_result_url(features_client, "/foo/big")
+    etag = features_client.get(result_url, headers={"Accept-Encoding": "gzip"}).headers[
+        "ETag"
+    ]
+    response = features_client.get(
+        result_url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_result_is_not_compressed_when_not_accepted(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/big"),
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert response.json == ["a repetitive value"] * 100
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_small_result_is_not_compressed(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/small"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.json == "small"
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compression_can_be_disabled(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/bar/big"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.json == ["a repetitive value"] * 100
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+def test_statuses_are_compressed(features_client):
+    response = features_client.post(
+        "/foo/big/status",
+        json={"task_ids": [f"task {i}" for i in range(10)]},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data))["task 0"] == {"state": "PENDING"}
+
+
+def test_result_with_status_code_is_marshalled(features_client):
+    response = features_client.get(assert_result_url(features_client, "/foo/created"))
+    assert response.status_code == 201
+    assert response.json == {"a": "1", "b": "2"}
+
+
+def test_masked_result_is_marshalled(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/created"), headers={"X-Fields": "b"}
+    )
+    assert response.json == {"b": "2"}
+
+
+def test_calls_are_shed_when_queue_is_too_long(features_client, policies, monkeypatch):
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_queue_status", lambda celery_app: (1, None)
+    )
+    assert_202_regex(features_client.get("/foo/big"), "/foo/big/status/.*")
+
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_queue_status", lambda celery_app: (2, None)
+    )
+    response = features_client.get("/foo/big")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "10"
+    assert response.json == {"message": "Too many tasks are waiting to be computed."}
+    assert policies["length"].statistics() == {"admitted": 1, "shed": 1}
+
+
+def test_calls_are_admitted_with_actual_queue_status(features_client, policies):
+    assert_202_regex(features_client.get("/foo/big"), "/foo/big/status/.*")
+    assert policies["length"].statistics() == {"admitted": 1, "shed": 0}
+
+
+def test_calls_are_shed_when_too_many_tasks_were_requested(features_client):
+    assert_202_regex(features_client.get("/foo/streamed"), "/foo/streamed/status/.*")
+    response = features_client.get("/foo/streamed")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 900
+    assert response.json == {"message": "Too many tasks were requested."}
+
+
+def test_route_measures(features_client, sink):
+    response = features_client.get(assert_result_url(features_client, "/foo/buffered"))
+    assert response.json == [{"id": 0, "name": "row 0"}, {"id": 1, "name": "row 1"}]
+
+    assert sink.counters == {
+        ("flasynk_tasks_accepted_total", metric_labels("/buffered")): 1,
+        (
+            "flasynk_status_polls_total",
+            metric_labels("/buffered", outcome="available"),
+        ): 1,
+        ("flasynk_results_total", metric_labels("/buffered", code="200")): 1,
+    }
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [1]
+    assert sink.observations[
+        ("flasynk_response_bytes", metric_labels("/buffered"))
+    ] == [len(response.data)]
+    for name, labels in (
+        ("flasynk_backend_seconds", metric_labels("/buffered", operation="get_task")),
+        (
+            "flasynk_backend_seconds",
+            metric_labels("/buffered", operation="get_result"),
+        ),
+        ("flasynk_marshalling_seconds", metric_labels("/buffered")),
+        ("flasynk_to_response_seconds", metric_labels("/buffered")),
+    ):
+        assert len(sink.observations[(name, labels)]) == 1
+        assert sink.observations[(name, labels)][0] >= 0
+
+
+def test_polls_per_task(features_client, sink, monkeypatch):
+    status_url = assert_202_regex(
+        features_client.get("/foo/buffered"), "/foo/buffered/status/.*"
+    )
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_result_is_available", lambda t: False
+    )
+    assert features_client.get(status_url).status_code == 200
+    assert features_client.get(status_url).status_code == 200
+    monkeypatch.undo()
+    assert_303_regex(features_client.get(status_url), ".*")
+    assert (
+        sink.counters[
+            (
+                "flasynk_status_polls_total",
+                metric_labels("/buffered", outcome="computing"),
+            )
+        ]
+        == 2
+    )
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [3]
+
+
+def test_polls_of_forgotten_tasks(features_client, sink, monkeypatch):
+    monkeypatch.setattr(flasynk._asynchronous._RouteMetrics, "_MAX_TRACKED_TASKS", 1)
+    first_status_url = assert_202_regex(features_client.get("/foo/buffered"), ".*")
+    second_status_url = assert_202_regex(features_client.get("/foo/buffered"), ".*")
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_result_is_available", lambda t: False
+    )
+    features_client.get(first_status_url)
+    features_client.get(second_status_url)
+    monkeypatch.setattr(
+        flasynk.celery_specifics, "_result_is_available", lambda t: True
+    )
+    features_client.get(first_status_url)
+    features_client.get(second_status_url)
+    # First task was forgotten
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [1, 2]
+
+
+def test_streamed_route_measures(features_client, sink):
+    status_url = assert_202_regex(
+        features_client.get("/foo/streamed"), "/foo/streamed/status/.*"
+    )
+    assert features_client.get("/foo/streamed").status_code == 429
+    result_url = assert_303_regex(features_client.get(status_url), ".*")
+    assert len(features_client.get(result_url).json) == 3
+    for decision in ("admitted", "shed"):
+        assert (
+            sink.counters[
+                (
+                    "flasynk_admissions_total",
+                    metric_labels("/streamed", decision=decision),
+                )
+            ]
+            == 1
+        )
+    assert (
+        sink.counters[("flasynk_tasks_accepted_total", metric_labels("/streamed"))] == 1
+    )
+    assert (
+        len(
+            sink.observations[
+                ("flasynk_marshalling_seconds", metric_labels("/streamed"))
+            ]
+        )
+        == 1
+    )
+    # Size of streamed responses is unknown
+    assert (
+        "flasynk_response_bytes",
+        metric_labels("/streamed"),
+    ) not in sink.observations
+
+
+def test_failed_result_is_measured(features_client, sink):
+    response = features_client.get(assert_result_url(features_client, "/foo/failure"))
+    assert response.status_code == 500
+    assert (
+        sink.counters[("flasynk_results_total", metric_labels("/failure", code="500"))]
+        == 1
+    )
+
+
+def test_retention_is_not_supported_with_celery():
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://localhost/", "backend": "cache+memory://"}}
+    )
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(Flask(__name__)).namespace("Test space", path="/foo"), celery_application
+    )
+    with pytest.raises(ValueError) as exception_info:
+        ns.asynchronous_route("/bar", retention=DeleteOnRead())
+    assert (
+        str(exception_info.value)
+        == "Celery results are kept according to result_expires, retention policies only apply to Huey."
+    )
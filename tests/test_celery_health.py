@@ -1,5 +1,7 @@
 import unittest.mock as mock
 import os
+import time
+import uuid
 
 import pytest
 from flask import Flask, make_response
@@ -183,3 +185,121 @@ def test_health_details_ping_exception(client, monkeypatch):
             "time": "2018-10-11T15:05:05.663979",
         }
     }
+
+
+@pytest.fixture
+def celery_application(monkeypatch):
+    from celery.task import control
+
+    monkeypatch.setattr(
+        control,
+        "ping",
+        lambda destination: [{worker: {"pong": "ok"}} for worker in destination],
+        raising=False,
+    )
+    celery_application = flasynk.celery_specifics.build_async_application(
+        {"celery": {"broker": "memory://", "backend": "cache+memory://"}}
+    )
+    yield celery_application
+    # In memory broker is shared by all applications
+    with celery_application.connection_for_write() as connection:
+        connection.default_channel.queue_purge(flasynk.celery_specifics._queue())
+
+
+def _send_task(celery_application):
+    # Task message is sent as apply_async would (without relying on AsyncResult)
+    amqp = celery_application.amqp
+    with celery_application.producer_or_acquire() as producer:
+        amqp.send_task_message(
+            producer,
+            "queued_task",
+            amqp.create_task_message(str(uuid.uuid4()), "queued_task", (), {}),
+        )
+
+
+def test_health_details_with_empty_queue(celery_application):
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "pass"
+    assert details["celery:queueLength"]["observedValue"] == 0
+    assert details["celery:queueWait"]["observedValue"] == 0
+    assert details["celery:queueWait"]["observedUnit"] == "s"
+    assert details["celery:brokerResponseTime"]["observedUnit"] == "ms"
+    assert details["celery:backendResponseTime"]["observedUnit"] == "ms"
+    assert {detail["status"] for detail in details.values()} == {"pass"}
+
+
+def test_health_details_with_queued_tasks(celery_application):
+    _send_task(celery_application)
+    _send_task(celery_application)
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "pass"
+    assert details["celery:queueLength"]["observedValue"] == 2
+    # Age of the oldest message is only known with a Redis broker
+    assert "celery:queueWait" not in details
+
+
+def test_sent_time_is_provided_to_workers(celery_application):
+    before = time.time()
+    _send_task(celery_application)
+    with celery_application.connection_for_read() as connection:
+        message = connection.default_channel.basic_get(
+            flasynk.celery_specifics._queue()
+        )
+    assert before <= message.headers["flasynk_sent"] <= time.time()
+
+
+def test_oldest_message_wait_with_redis_broker():
+    connection = mock.Mock()
+    connection.transport.driver_type = "redis"
+    channel = mock.Mock()
+    channel.client.lindex.return_value = '{"headers": {"flasynk_sent": 10.5}}'
+    assert (
+        flasynk.celery_specifics._oldest_message_sent_time(connection, channel) == 10.5
+    )
+    channel.client.lindex.assert_called_once_with(flasynk.celery_specifics._queue(), -1)
+
+    # Message consumed in the meantime
+    channel.client.lindex.return_value = None
+    assert (
+        flasynk.celery_specifics._oldest_message_sent_time(connection, channel) is None
+    )
+
+
+def test_health_details_with_queue_wait(celery_application, monkeypatch):
+    _send_task(celery_application)
+    monkeypatch.setattr(
+        flasynk.celery_specifics,
+        "_oldest_message_sent_time",
+        lambda connection, channel: time.time() - 5,
+    )
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "pass"
+    assert details["celery:queueWait"]["observedValue"] == pytest.approx(5, abs=1)
+
+
+def test_health_details_without_broker(celery_application, monkeypatch):
+    def connection_failure():
+        raise ConnectionError("Broker is down")
+
+    monkeypatch.setattr(celery_application, "connection_for_read", connection_failure)
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "fail"
+    assert details["celery:ping"]["status"] == "pass"
+    assert details["celery:brokerResponseTime"]["output"] == "Broker is down"
+
+
+def test_health_details_without_result_backend(celery_application, monkeypatch):
+    def backend_failure(key):
+        raise ConnectionError("Backend is down")
+
+    monkeypatch.setattr(celery_application.backend, "get", backend_failure)
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "fail"
+    assert details["celery:backendResponseTime"]["output"] == "Backend is down"
+
+
+def test_health_details_without_key_value_result_backend(celery_application):
+    celery_application.conf.result_backend = "rpc://"
+    status, details = flasynk.celery_specifics.health_details(celery_application)
+    assert status == "pass"
+    assert "celery:backendResponseTime" not in details
@@ -70,3 +70,96 @@ def test_celery_task_call_async_with_exception(client):
         client.get("/test_celery_async_with_exception")
 
     assert str(exception_info.value) == "Exception in Celery task"
+
+
+def _celery_mock(**kwargs):
+    celery_mock = flasynk.celery_mock.CeleryMock(
+        celery.Celery("celery_server", set_as_current=False), **kwargs
+    )
+
+    @celery_mock.task()
+    def compute(value):
+        return value
+
+    return celery_mock, compute
+
+
+def _stored_in_backend(celery_mock, task_id) -> bool:
+    backend = celery_mock.backend
+    return backend.get(backend.get_key_for_task(task_id)) is not None
+
+
+def test_results_are_kept_per_mock():
+    first_mock, first_compute = _celery_mock()
+    second_mock, second_compute = _celery_mock()
+    task_id = first_compute.apply_async(args=(3,)).id
+    assert celery.result.AsyncResult(task_id, app=first_mock).result == 3
+    assert celery.result.AsyncResult(task_id, app=second_mock).state == "PENDING"
+    assert second_mock.results.statistics()["entries"] == 0
+
+
+def test_least_recently_used_results_are_evicted():
+    celery_mock, compute = _celery_mock(results_max_bytes=1000)
+    task_ids = [compute.apply_async(args=("x" * 300,)).id for _ in range(4)]
+    statistics = celery_mock.results.statistics()
+    assert statistics["entries"] < 4
+    assert statistics["size"] <= 1000
+    assert statistics["evictions"] > 0
+    assert celery.result.AsyncResult(task_ids[0], app=celery_mock).state == "PENDING"
+    assert celery.result.AsyncResult(task_ids[-1], app=celery_mock).result == "x" * 300
+    # Result backend does not keep evicted results
+    assert not _stored_in_backend(celery_mock, task_ids[0])
+    assert _stored_in_backend(celery_mock, task_ids[-1])
+
+
+def test_result_too_big_is_kept_alone(caplog):
+    celery_mock, compute = _celery_mock(results_max_bytes=100)
+    small_task_id = compute.apply_async(args=("x",)).id
+    task_id = compute.apply_async(args=("x" * 300,)).id
+    statistics = celery_mock.results.statistics()
+    assert statistics["entries"] == 1
+    assert statistics["size"] > 100
+    assert statistics["evictions"] == 1
+    assert celery.result.AsyncResult(task_id, app=celery_mock).result == "x" * 300
+    assert _stored_in_backend(celery_mock, task_id)
+    assert celery.result.AsyncResult(small_task_id, app=celery_mock).state == "PENDING"
+    assert not _stored_in_backend(celery_mock, small_task_id)
+    assert (
+        f"{task_id} result is bigger than 100 bytes, every other result is evicted to keep it."
+        in caplog.messages
+    )
+    # Next result evicts it
+    next_task_id = compute.apply_async(args=("x",)).id
+    assert celery_mock.results.statistics()["entries"] == 1
+    assert celery.result.AsyncResult(next_task_id, app=celery_mock).result == "x"
+
+
+def test_expired_results_are_not_provided():
+    celery_mock, compute = _celery_mock(results_ttl=-1)
+    task_id = compute.apply_async(args=(3,)).id
+    assert celery.result.AsyncResult(task_id, app=celery_mock).state == "PENDING"
+    assert not _stored_in_backend(celery_mock, task_id)
+
+
+def test_results_can_be_cleared():
+    celery_mock, compute = _celery_mock()
+    task_id = compute.apply_async(args=(3,)).id
+    assert celery_mock.results.statistics()["entries"] == 1
+    assert _stored_in_backend(celery_mock, task_id)
+    celery_mock.results.clear()
+    assert celery_mock.results.statistics()["size"] == 0
+    assert not _stored_in_backend(celery_mock, task_id)
+    assert celery.result.AsyncResult(task_id, app=celery_mock).state == "PENDING"
+
+
+def test_results_of_unknown_application_are_pending():
+    assert (
+        celery.result.AsyncResult("42", app=celery.Celery(set_as_current=False)).state
+        == "PENDING"
+    )
+
+
+def test_result_of_unknown_application_is_pending(app):
+    celery_result = celery.result.AsyncResult("42", app=celery.Celery("unknown"))
+    assert celery_result.state == celery.states.PENDING
+    assert not celery_result.ready()
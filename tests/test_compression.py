@@ -0,0 +1,50 @@
+import sys
+import unittest.mock as mock
+
+import pytest
+from flask import Flask, Response
+
+import flasynk._compression
+from flasynk.result_cache import ResultCache
+
+
+@pytest.fixture
+def result_cache():
+    return ResultCache()
+
+
+def test_compressed_body_is_cached(result_cache, monkeypatch):
+    gzip_encoder = mock.Mock(return_value=b"compressed")
+    monkeypatch.setitem(flasynk._compression.encoders, "gzip", gzip_encoder)
+    with Flask(__name__).test_request_context(headers={"Accept-Encoding": "gzip"}):
+        for _ in range(2):
+            response = flasynk._compression.compress(
+                Response(b"1" * 10), min_size=1, level=6, result_cache=result_cache
+            )
+            assert response.data == b"compressed"
+    gzip_encoder.assert_called_once_with(b"1" * 10, 6)
+    assert result_cache.hits == 1
+
+
+def test_already_encoded_response_is_not_compressed():
+    with Flask(__name__).test_request_context(headers={"Accept-Encoding": "gzip"}):
+        response = Response(b"1" * 10, headers={"Content-Encoding": "br"})
+        response = flasynk._compression.compress(
+            response, min_size=1, level=6, result_cache=None
+        )
+        assert response.data == b"1" * 10
+
+
+def test_optional_encoders(monkeypatch):
+    brotli = mock.Mock()
+    zstandard = mock.Mock()
+    monkeypatch.setitem(sys.modules, "brotli", brotli)
+    monkeypatch.setitem(sys.modules, "zstandard", zstandard)
+    encoders = flasynk._compression._available_encoders()
+    assert list(encoders) == ["br", "zstd", "gzip"]
+
+    encoders["br"](b"data", 20)
+    brotli.compress.assert_called_once_with(b"data", quality=11)
+    encoders["zstd"](b"data", 20)
+    zstandard.ZstdCompressor.assert_called_once_with(level=20)
+    zstandard.ZstdCompressor.return_value.compress.assert_called_once_with(b"data")
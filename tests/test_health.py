@@ -0,0 +1,89 @@
+import time
+
+import pytest
+
+from flasynk.health import CachedHealthDetails
+
+
+class HealthDetailsMock:
+    def __init__(self, *statuses):
+        self.statuses = list(statuses)
+        self.calls = 0
+
+    def __call__(self):
+        self.calls += 1
+        status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+        if isinstance(status, Exception):
+            raise status
+        return status, {"celery:ping": {"status": status}}
+
+
+@pytest.fixture
+def health():
+    cached_health = None
+
+    def build(*args, **kwargs):
+        nonlocal cached_health
+        cached_health = CachedHealthDetails(*args, **kwargs)
+        return cached_health
+
+    yield build
+    cached_health.stop()
+
+
+def test_health_is_checked_once_per_interval(health):
+    health_details = HealthDetailsMock("pass")
+    cached_health = health(health_details, interval=60)
+    for _ in range(100):
+        status, details = cached_health()
+        assert status == "pass"
+    assert health_details.calls == 1
+    assert details["celery:ping"] == {"status": "pass"}
+    assert details["health:age"]["status"] == "pass"
+    assert details["health:age"]["observedUnit"] == "s"
+    assert 0 <= details["health:age"]["observedValue"] < 60
+
+
+def test_health_is_refreshed_in_background(health):
+    health_details = HealthDetailsMock("pass", "fail")
+    cached_health = health(health_details, interval=0.01)
+    cached_health.start()
+    assert cached_health()[0] == "pass"
+    while health_details.calls < 2:
+        time.sleep(0.01)
+    status, details = cached_health()
+    assert status == "fail"
+    assert details["celery:ping"] == {"status": "fail"}
+    # Last passing check is recent enough
+    assert details["health:age"]["status"] == "pass"
+
+
+def test_health_never_passing(health):
+    status, details = health(HealthDetailsMock("fail"))()
+    assert status == "fail"
+    assert details["health:age"]["status"] == "fail"
+    assert details["health:age"]["observedValue"] is None
+
+
+def test_stale_health_is_failing(health):
+    health_details = HealthDetailsMock("pass", ValueError("refresh failure"))
+    cached_health = health(health_details, interval=0.01, stale_after=0.05)
+    assert cached_health()[0] == "pass"
+    time.sleep(0.1)
+    status, details = cached_health()
+    assert status == "fail"
+    assert details["celery:ping"] == {"status": "pass"}
+    assert details["health:age"]["status"] == "fail"
+    assert details["health:age"]["observedValue"] > 0.05
+
+
+def test_health_refresher_can_be_restarted(health):
+    health_details = HealthDetailsMock("pass")
+    cached_health = health(health_details)
+    cached_health.start()
+    cached_health.start()
+    cached_health.stop()
+    cached_health.stop()
+    assert health_details.calls == 1
+    cached_health()
+    assert health_details.calls == 2
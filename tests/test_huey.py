@@ -1,12 +1,34 @@
+import gzip
+import json
+import os
 import re
+import threading
+import time
+import unittest.mock as mock
+from datetime import datetime, timezone
 
+import huey
 import pytest
+import redis
 from flask import Flask, make_response
 from flask_restplus import Api, Resource, fields
 
 import flasynk
+import flasynk._details
+import flasynk._durations
+import flasynk.exceptions
 import flasynk.huey_specifics
-from tests.enhanced_flask_testing import assert_303_regex, assert_202_regex
+from flasynk.admission import MaxQueueLength, TokenBucket
+from flasynk.result_cache import ResultCache
+from flasynk.retention import DeleteAfterReads, DeleteOnRead, KeepFor
+from tests import enhanced_flask_testing
+from tests.enhanced_flask_testing import (
+    assert_303_regex,
+    assert_202_regex,
+    assert_result_url,
+    server_sent_event,
+)
+from tests.test_metrics import RecordingSink, metric_labels
 
 
 class CustomException(Exception):
@@ -158,7 +180,7 @@ def app():
     return application
 
 
-def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
+def test_async_ns_proxy_creates_extra_endpoints_per_declared_endpoint(client):
     response = client.get("/swagger.json")
     assert response.status_code == 200
     assert response.json == {
@@ -183,6 +205,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/bar/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar/result/{task_id}": {
                 "parameters": [
                     {
@@ -197,7 +243,19 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Success",
                             "schema": {"$ref": "#/definitions/BarModel"},
-                        }
+                        },
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
                     },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_result",
@@ -213,6 +271,29 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
+            "/foo/bar/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar/status/{task_id}": {
                 "parameters": [
                     {
@@ -227,6 +308,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -244,6 +331,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -265,6 +360,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/bar2/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint2_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar2/result/{task_id}": {
                 "parameters": [
                     {
@@ -282,7 +401,19 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                                 "type": "array",
                                 "items": {"$ref": "#/definitions/Bar2Model"},
                             },
-                        }
+                        },
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
                     },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint2_result",
@@ -298,6 +429,29 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
+            "/foo/bar2/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint2_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/bar2/status/{task_id}": {
                 "parameters": [
                     {
@@ -312,6 +466,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -329,6 +489,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint2_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -350,6 +518,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/csv/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_no_serialization_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/csv/result/{task_id}": {
                 "parameters": [
                     {
@@ -360,12 +552,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_no_serialization_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/csv/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_no_serialization_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/csv/status/{task_id}": {
                 "parameters": [
                     {
@@ -380,6 +609,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -397,6 +632,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_no_serialization_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -418,6 +661,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/custom_exception/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_custom_endpoint_exception_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/custom_exception/result/{task_id}": {
                 "parameters": [
                     {
@@ -428,12 +695,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_custom_endpoint_exception_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/custom_exception/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_custom_endpoint_exception_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/custom_exception/status/{task_id}": {
                 "parameters": [
                     {
@@ -448,6 +752,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -465,6 +775,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_custom_endpoint_exception_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -486,6 +804,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/custom_unhandled_exception/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_custom_unhandled_endpoint_exception_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/custom_unhandled_exception/result/{task_id}": {
                 "parameters": [
                     {
@@ -496,12 +838,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_custom_unhandled_endpoint_exception_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/custom_unhandled_exception/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_custom_unhandled_endpoint_exception_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/custom_unhandled_exception/status/{task_id}": {
                 "parameters": [
                     {
@@ -516,6 +895,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -533,6 +918,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_custom_unhandled_endpoint_exception_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -554,23 +947,31 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
-            "/foo/exception/result/{task_id}": {
-                "parameters": [
-                    {
-                        "name": "task_id",
-                        "in": "path",
-                        "required": True,
-                        "type": "string",
-                    }
-                ],
+            "/foo/exception/events": {
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
-                    "summary": "Retrieve result for provided task",
-                    "operationId": "get_test_endpoint_exception_result",
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_exception_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
                     "tags": ["Test space"],
-                },
+                }
             },
-            "/foo/exception/status/{task_id}": {
+            "/foo/exception/result/{task_id}": {
                 "parameters": [
                     {
                         "name": "task_id",
@@ -581,26 +982,93 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                 ],
                 "get": {
                     "responses": {
-                        "200": {
-                            "description": "Task is still computing.",
-                            "schema": {"$ref": "#/definitions/CurrentAsyncState"},
-                        },
-                        "303": {
-                            "description": "Result is available.",
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
                             "headers": {
                                 "location": {
-                                    "description": "URL to fetch results from.",
+                                    "description": "URL to fetch computation status from.",
                                     "type": "string",
                                 }
                             },
                         },
-                        "500": {
-                            "description": "An unexpected error occurred.",
-                            "schema": {"type": "string", "description": "Stack trace."},
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
+                    "summary": "Retrieve result for provided task",
+                    "operationId": "get_test_endpoint_exception_result",
+                    "tags": ["Test space"],
+                },
+            },
+            "/foo/exception/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_exception_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
+            "/foo/exception/status/{task_id}": {
+                "parameters": [
+                    {
+                        "name": "task_id",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    }
+                ],
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Task is still computing.",
+                            "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "303": {
+                            "description": "Result is available.",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch results from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "500": {
+                            "description": "An unexpected error occurred.",
+                            "schema": {"type": "string", "description": "Stack trace."},
                         },
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_exception_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -622,6 +1090,30 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 }
             },
+            "/foo/modified_task_result/events": {
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_modified_task_result_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/modified_task_result/result/{task_id}": {
                 "parameters": [
                     {
@@ -632,12 +1124,49 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     }
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_modified_task_result_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/modified_task_result/status": {
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_modified_task_result_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                }
+            },
             "/foo/modified_task_result/status/{task_id}": {
                 "parameters": [
                     {
@@ -652,6 +1181,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -669,6 +1204,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_modified_task_result_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -704,6 +1247,44 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     "tags": ["Test space"],
                 },
             },
+            "/foo/path_parameters/{str_value}/{int_value}/events": {
+                "parameters": [
+                    {
+                        "name": "str_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    },
+                    {
+                        "name": "int_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "integer",
+                    },
+                ],
+                "get": {
+                    "responses": {
+                        "200": {
+                            "description": "Server-Sent Events stream. A state event is sent on every task state transition and a result-ready event (containing the URL to fetch results from) once result is available."
+                        },
+                        "400": {"description": "No task_id was provided."},
+                    },
+                    "summary": "Stream status changes for provided tasks",
+                    "operationId": "get_test_endpoint_with_path_parameter_events",
+                    "parameters": [
+                        {
+                            "description": "Task Id. Can be provided multiple times.",
+                            "type": "array",
+                            "items": {"type": "string"},
+                            "collectionFormat": "multi",
+                            "in": "query",
+                            "required": True,
+                            "name": "task_id",
+                        }
+                    ],
+                    "tags": ["Test space"],
+                },
+            },
             "/foo/path_parameters/{str_value}/{int_value}/result/{task_id}": {
                 "parameters": [
                     {
@@ -726,12 +1307,63 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                 ],
                 "get": {
-                    "responses": {"200": {"description": "Success"}},
+                    "responses": {
+                        "200": {"description": "Success"},
+                        "202": {
+                            "description": "Task is still computing (or unknown).",
+                            "headers": {
+                                "location": {
+                                    "description": "URL to fetch computation status from.",
+                                    "type": "string",
+                                }
+                            },
+                        },
+                        "304": {
+                            "description": "Result was not modified since provided ETag (If-None-Match)."
+                        },
+                    },
                     "summary": "Retrieve result for provided task",
                     "operationId": "get_test_endpoint_with_path_parameter_result",
                     "tags": ["Test space"],
                 },
             },
+            "/foo/path_parameters/{str_value}/{int_value}/status": {
+                "parameters": [
+                    {
+                        "name": "str_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "string",
+                    },
+                    {
+                        "name": "int_value",
+                        "in": "path",
+                        "required": True,
+                        "type": "integer",
+                    },
+                ],
+                "post": {
+                    "responses": {
+                        "200": {
+                            "description": "Status of every requested task (per task id). URL to fetch results from is provided if result is available, current state otherwise."
+                        },
+                        "400": {"description": "task_ids is not a list of task ids."},
+                    },
+                    "summary": "Retrieve status for provided tasks",
+                    "operationId": "get_test_endpoint_with_path_parameter_statuses",
+                    "parameters": [
+                        {
+                            "name": "payload",
+                            "required": True,
+                            "in": "body",
+                            "schema": {
+                                "$ref": "#/definitions/AsyncTasksStatusRequestModel"
+                            },
+                        }
+                    ],
+                    "tags": ["Test space"],
+                },
+            },
             "/foo/path_parameters/{str_value}/{int_value}/status/{task_id}": {
                 "parameters": [
                     {
@@ -758,6 +1390,12 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "200": {
                             "description": "Task is still computing.",
                             "schema": {"$ref": "#/definitions/CurrentAsyncState"},
+                            "headers": {
+                                "Retry-After": {
+                                    "description": "Number of seconds to wait before checking status again.",
+                                    "type": "string",
+                                }
+                            },
                         },
                         "303": {
                             "description": "Result is available.",
@@ -775,6 +1413,14 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                     },
                     "summary": "Retrieve status for provided task",
                     "operationId": "get_test_endpoint_with_path_parameter_status",
+                    "parameters": [
+                        {
+                            "name": "wait",
+                            "in": "query",
+                            "type": "number",
+                            "description": "Number of seconds to wait for the result to be available. Up to 30 seconds.",
+                        }
+                    ],
                     "tags": ["Test space"],
                 },
             },
@@ -806,6 +1452,58 @@ def test_async_ns_proxy_creates_2_extra_endpoints_per_declared_endpoint(client):
                         "type": "string",
                         "description": "Indicates current computation state.",
                         "example": "PENDING",
+                    },
+                    "progress": {
+                        "description": "Progress reported by the task (if any).",
+                        "allOf": [{"$ref": "#/definitions/AsyncProgress"}],
+                    },
+                    "enqueued": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task was sent (if known).",
+                    },
+                    "started": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task started computing (if started).",
+                    },
+                    "updated": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Time at which task state or progress last changed (if known).",
+                    },
+                    "eta": {
+                        "type": "string",
+                        "format": "date-time",
+                        "description": "Estimated time at which result will be available (according to the duration of recent tasks).",
+                    },
+                },
+                "type": "object",
+            },
+            "AsyncProgress": {
+                "properties": {
+                    "percent": {
+                        "type": "number",
+                        "description": "Percentage of the computation that is done.",
+                    },
+                    "stage": {
+                        "type": "string",
+                        "description": "Current computation stage.",
+                    },
+                    "counters": {
+                        "type": "object",
+                        "description": "Any other progress indicator.",
+                    },
+                },
+                "type": "object",
+            },
+            "AsyncTasksStatusRequestModel": {
+                "required": ["task_ids"],
+                "properties": {
+                    "task_ids": {
+                        "type": "array",
+                        "description": "Tasks Ids.",
+                        "items": {"type": "string"},
                     }
                 },
                 "type": "object",
@@ -912,3 +1610,1140 @@ def test_async_call_without_serialization(client):
     result_reply = client.get(result_url)
     assert result_reply.status_code == 200
     assert result_reply.get_data(as_text=True) == "a;b;c"
+
+
+def test_async_call_task_waiting_for_result(client):
+    response = client.get("/foo/bar")
+    status_url = assert_202_regex(response, "/foo/bar/status/.*")
+    status_reply = client.get(f"{status_url}?wait=5")
+    result_url = assert_303_regex(status_reply, "/foo/bar/result/.*")
+    result_reply = client.get(result_url)
+    assert result_reply.status_code == 200
+    assert result_reply.json == {"status": "why not", "foo": "bar"}
+
+
+def test_async_call_task_without_endpoint_call_waiting_for_result(client):
+    start = time.monotonic()
+    status_reply = client.get("/foo/bar/status/42?wait=0.2")
+    assert time.monotonic() - start >= 0.2
+    assert status_reply.status_code == 200
+    assert status_reply.json == {"state": "PENDING"}
+
+
+def test_requested_wait_is_bounded(app):
+    with app.test_request_context("/foo/bar/status/42?wait=60"):
+        assert flasynk._asynchronous._requested_wait(30) == 30
+    with app.test_request_context("/foo/bar/status/42?wait=-1"):
+        assert flasynk._asynchronous._requested_wait(30) == 0
+    with app.test_request_context("/foo/bar/status/42?wait=invalid"):
+        assert flasynk._asynchronous._requested_wait(30) == 0
+    with app.test_request_context("/foo/bar/status/42?wait=nan"):
+        assert flasynk._asynchronous._requested_wait(30) == 0
+    with app.test_request_context("/foo/bar/status/42?wait=inf"):
+        assert flasynk._asynchronous._requested_wait(30) == 0
+    with app.test_request_context("/foo/bar/status/42?wait=1e400"):
+        assert flasynk._asynchronous._requested_wait(30) == 0
+
+
+def test_async_call_task_events(client):
+    first_task_id = client.get("/foo/bar").json["task_id"]
+    second_task_id = client.get("/foo/bar2").json["task_id"]
+    events_reply = client.get(
+        f"/foo/bar/events?task_id={first_task_id}&task_id={second_task_id}"
+    )
+    assert events_reply.status_code == 200
+    assert events_reply.content_type == "text/event-stream; charset=utf-8"
+    stream = events_reply.get_data(as_text=True)
+    assert stream.startswith("retry: 1000\n\n")
+    assert [server_sent_event(event) for event in stream.split("\n\n")[1:-1]] == [
+        {
+            "event": "result-ready",
+            "data": {
+                "task_id": task_id,
+                "url": f"http://localhost/foo/bar/result/{task_id}",
+            },
+        }
+        for task_id in (first_task_id, second_task_id)
+    ]
+    assert stream.endswith("\n\n")
+
+
+def test_async_call_task_events_without_endpoint_call(client):
+    events_reply = client.get("/foo/bar/events?task_id=42", buffered=False)
+    assert events_reply.status_code == 200
+    events = iter(events_reply.response)
+    assert next(events) == b"retry: 1000\n\n"
+    assert server_sent_event(next(events)) == {
+        "event": "state",
+        "data": {"task_id": "42", "state": "PENDING"},
+    }
+    events_reply.close()
+
+
+def test_async_call_task_events_without_task_id(client):
+    events_reply = client.get("/foo/bar/events")
+    assert events_reply.status_code == 400
+    assert events_reply.json == {"message": "At least one task_id must be provided."}
+
+
+def _events_client(**settings):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"),
+        huey_application,
+        **settings,
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    return application.test_client(), huey_application
+
+
+def _events(client, query_string: str):
+    events = iter(
+        client.get(f"/foo/bar/events?{query_string}", buffered=False).response
+    )
+    next(events)  # retry
+    return events
+
+
+def test_events_streams_share_the_same_polling(monkeypatch):
+    get_tasks = mock.Mock(wraps=flasynk.huey_specifics._get_asynchronous_tasks)
+    monkeypatch.setattr(flasynk.huey_specifics, "_get_asynchronous_tasks", get_tasks)
+    client, huey_application = _events_client(events_interval=0.01)
+    subscribed = threading.Barrier(3)
+    streams = {}
+
+    def stream(query_string: str, initial_events: int):
+        # Each stream is consumed by its own thread, as it would be by a server
+        events = _events(client, query_string)
+        streams[query_string] = [next(events) for _ in range(initial_events)]
+        subscribed.wait()
+        streams[query_string].extend(events)
+
+    threads = [
+        threading.Thread(target=stream, args=("task_id=first", 1)),
+        threading.Thread(target=stream, args=("task_id=first&task_id=second", 2)),
+    ]
+    for thread in threads:
+        thread.start()
+    subscribed.wait()
+    huey_application.put_result("first", 1)
+    huey_application.put_result("second", 2)
+    for thread in threads:
+        thread.join()
+
+    assert [server_sent_event(event) for event in streams["task_id=first"]] == [
+        {"event": "state", "data": {"task_id": "first", "state": "PENDING"}},
+        {
+            "event": "result-ready",
+            "data": {
+                "task_id": "first",
+                "url": "http://localhost/foo/bar/result/first",
+            },
+        },
+    ]
+    assert [
+        server_sent_event(event)["event"]
+        for event in streams["task_id=first&task_id=second"]
+    ] == ["state", "state", "result-ready", "result-ready"]
+    polls = [args[0] for args, _ in get_tasks.call_args_list]
+    # Both streams checked their tasks once when starting, then every watched task is polled at once
+    assert sorted(polls[:2]) == [["first"], ["first", "second"]]
+    assert polls[2] == ["first", "second"]
+    assert all(poll in (["first", "second"], ["second"]) for poll in polls[3:])
+
+
+def test_events_polling_failure_ends_stream(monkeypatch):
+    client, huey_application = _events_client(events_interval=0.01)
+    events = _events(client, "task_id=first")
+    assert server_sent_event(next(events))["data"]["state"] == "PENDING"
+    monkeypatch.setattr(
+        flasynk.huey_specifics,
+        "_get_asynchronous_tasks",
+        mock.Mock(side_effect=ConnectionError("Redis is down")),
+    )
+    with pytest.raises(ConnectionError):
+        next(events)
+
+
+def test_events_stream_ends_after_max_duration():
+    client, huey_application = _events_client(events_interval=60, max_status_wait=0.1)
+    events = _events(client, "task_id=first")
+    assert [server_sent_event(event)["data"] for event in events] == [
+        {"task_id": "first", "state": "PENDING"}
+    ]
+
+
+def test_exception_raised_while_waiting_for_result(client):
+    response = client.get("/foo/exception")
+    status_url = assert_202_regex(response, ".*")
+    status_reply = client.get(f"{status_url}?wait=5")
+    result_url = assert_303_regex(status_reply, ".*")
+    result = client.get(result_url)
+    assert result.status_code == 500
+    assert result.json == {"message": "Exception"}
+
+
+def test_async_call_tasks_status(client):
+    task_id = client.get("/foo/bar").json["task_id"]
+    status_reply = client.post(
+        "/foo/bar/status", json={"task_ids": [task_id, "unknown"]}
+    )
+    assert status_reply.status_code == 200
+    assert status_reply.json == {
+        task_id: {"url": f"http://localhost/foo/bar/result/{task_id}"},
+        "unknown": {"state": "PENDING"},
+    }
+
+
+def test_async_call_tasks_status_without_body(client):
+    status_reply = client.post("/foo/bar/status")
+    assert status_reply.status_code == 400
+    assert status_reply.json == {"message": "task_ids must be a list of task ids."}
+
+
+@pytest.mark.parametrize(
+    "huey_class, expected_call",
+    [
+        (huey.RedisHuey, mock.call.hexists("huey.results.test", "42")),
+        (huey.RedisExpireHuey, mock.call.exists(b"huey.r.test.42")),
+    ],
+)
+def test_redis_results_are_checked_in_a_single_round_trip(huey_class, expected_call):
+    huey_application = huey_class("test", url="redis://localhost/")
+    huey_application.storage.conn = mock.MagicMock()
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [
+        1,
+        {b"state": b"SUCCESS"},
+        0,
+        {b"state": b"STARTED", b"progress": b'{"percent": 50}'},
+    ]
+    huey_tasks = flasynk.huey_specifics._get_asynchronous_tasks(
+        ["42", "43"], huey_application
+    )
+    assert [(huey_task.available, huey_task.state) for huey_task in huey_tasks] == [
+        (True, "SUCCESS"),
+        (False, "STARTED"),
+    ]
+    assert huey_tasks[1].details == {"state": "STARTED", "progress": {"percent": 50}}
+    assert pipeline.mock_calls[0] == expected_call
+    assert pipeline.mock_calls[1] == mock.call.hgetall("huey.flasynk.test.42")
+    assert pipeline.execute.call_count == 1
+
+
+def test_result_is_not_deserialized_while_checking_status():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    huey_application.put_result("42", {"status": "why not"})
+    huey_application.serializer = mock.Mock(wraps=huey_application.serializer)
+    assert flasynk.huey_specifics._get_asynchronous_task("42", huey_application)
+    assert flasynk.huey_specifics._wait_for_asynchronous_task("42", huey_application, 1)
+    huey_application.serializer.deserialize.assert_not_called()
+    assert flasynk.huey_specifics._get_asynchronous_result(huey_application, "42") == {
+        "status": "why not"
+    }
+
+
+def test_result_is_not_retrieved_again_if_not_modified(client):
+    response = client.get("/foo/bar")
+    status_url = assert_202_regex(response, "/foo/bar/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/foo/bar/result/.*")
+    result_reply = client.get(result_url)
+    assert result_reply.status_code == 200
+    assert (
+        result_reply.headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    )
+    etag = result_reply.headers["ETag"]
+
+    # Huey result cannot be read twice, so backend is not queried
+    not_modified_reply = client.get(result_url, headers={"If-None-Match": etag})
+    assert not_modified_reply.status_code == 304
+    assert not_modified_reply.headers["ETag"] == etag
+    assert not_modified_reply.get_data() == b""
+
+
+def test_result_etag_depends_on_serializer_and_requested_fields(app):
+    etag = flasynk._asynchronous._result_etag
+    with app.test_request_context("/foo/bar/result/42"):
+        unmasked_etag = etag("42", "bar", "X-Fields")
+        assert unmasked_etag != etag("42", "bar2", "X-Fields")
+        assert unmasked_etag != etag("43", "bar", "X-Fields")
+        unserialized_etag = etag("42", "", None)
+    with app.test_request_context("/foo/bar/result/42", headers={"X-Fields": "status"}):
+        assert etag("42", "bar", "X-Fields") != unmasked_etag
+        # Requested fields are not considered if result is not serialized
+        assert etag("42", "", None) == unserialized_etag
+
+
+def test_masked_result_varies_on_requested_fields(client):
+    response = client.get("/foo/bar")
+    status_url = assert_202_regex(response, "/foo/bar/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/foo/bar/result/.*")
+    result_reply = client.get(result_url, headers={"X-Fields": "status"})
+    assert result_reply.json == {"status": "why not"}
+    assert "X-Fields" in result_reply.vary
+    assert "ETag" in result_reply.headers
+
+
+def test_unavailable_result_is_not_cached(client):
+    result_reply = client.get("/foo/bar/result/42")
+    assert_202_regex(result_reply, "/foo/bar/status/42")
+    assert "ETag" not in result_reply.headers
+    assert "Cache-Control" not in result_reply.headers
+
+
+def test_result_already_read_is_not_available(client):
+    response = client.get("/foo/bar")
+    status_url = assert_202_regex(response, "/foo/bar/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/foo/bar/result/.*")
+    assert client.get(result_url).status_code == 200
+    assert_202_regex(client.get(result_url), "/foo/bar/status/.*")
+
+
+def test_exception_is_not_cached(client):
+    response = client.get("/foo/exception")
+    status_url = assert_202_regex(response, ".*")
+    result_url = assert_303_regex(client.get(status_url), ".*")
+    result = client.get(result_url)
+    assert result.status_code == 500
+    assert "ETag" not in result.headers
+    assert "Cache-Control" not in result.headers
+
+
+def test_status_advises_when_to_check_again(client):
+    status_reply = client.get("/foo/bar/status/42")
+    assert status_reply.status_code == 200
+    assert status_reply.headers["Retry-After"] == "1"
+
+
+def test_retry_after_follows_estimated_end(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1000)
+    retry_after = flasynk._asynchronous._retry_after
+    # No estimate
+    assert retry_after({}, floor=1, ceiling=60) == 1
+    assert retry_after({"eta": _utc(1010)}, floor=1, ceiling=60) == 10
+    assert retry_after({"eta": _utc(1005.5)}, floor=1, ceiling=60) == 6
+    # Running for longer than estimated
+    assert retry_after({"eta": _utc(1000)}, floor=1, ceiling=60) == 1
+    assert retry_after({"eta": _utc(4600)}, floor=1, ceiling=60) == 60
+
+
+def test_retry_after_follows_fast_tasks_once_a_slow_one_is_computed(monkeypatch):
+    monkeypatch.setattr(time, "time", lambda: 1000)
+    histogram = {}
+    pipeline = mock.MagicMock()
+    pipeline.hincrby.side_effect = lambda key, field, count: histogram.update(
+        {field: histogram.get(field, 0) + count}
+    )
+
+    def retry_after() -> int:
+        details = flasynk._details.status_details({"started": 1000}, [histogram], 1000)
+        return flasynk._asynchronous._retry_after(details, floor=1, ceiling=60)
+
+    flasynk._durations.record(pipeline, "durations", "run", 30)
+    assert retry_after() == 30
+    for _ in range(3):
+        flasynk._durations.record(pipeline, "durations", "run", 2)
+    assert retry_after() == 3
+
+
+def _utc(timestamp: float) -> datetime:
+    return datetime.fromtimestamp(timestamp, timezone.utc)
+
+
+def _fake_connection(**kwargs):
+    connection = mock.MagicMock(pid=os.getpid())
+    connection.can_read.return_value = False
+    return connection
+
+
+def test_connection_pool_settings():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {
+            "asynchronous": {
+                "broker": "redis://localhost/",
+                "max_connections": 2,
+                "socket_timeout": 5,
+                "socket_connect_timeout": 1,
+                "health_check_interval": 30,
+            }
+        }
+    )
+    pool = huey_application.storage.pool
+    assert isinstance(pool, redis.ConnectionPool)
+    assert not isinstance(pool, redis.BlockingConnectionPool)
+    assert pool.max_connections == 2
+    assert pool.connection_kwargs["socket_timeout"] == 5
+    assert pool.connection_kwargs["socket_connect_timeout"] == 1
+    assert pool.connection_kwargs["health_check_interval"] == 30
+
+
+def test_connection_pool_statistics(monkeypatch):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/", "max_connections": 2}}
+    )
+    pool = huey_application.storage.pool
+    monkeypatch.setattr(pool, "connection_class", _fake_connection)
+    first = pool.get_connection("GET")
+    pool.get_connection("GET")
+    pool.release(first)
+    statistics = flasynk.huey_specifics.pool_statistics(huey_application)
+    assert statistics.pop("acquisition_time") >= 0
+    assert statistics.pop("max_acquisition_time") >= 0
+    assert statistics == {
+        "max_connections": 2,
+        "in_use": 1,
+        "idle": 1,
+        "acquisitions": 2,
+    }
+
+
+def test_blocking_connection_pool_statistics(monkeypatch):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {
+            "asynchronous": {
+                "broker": "redis://localhost/",
+                "max_connections": 1,
+                "blocking_pool": True,
+                "pool_timeout": 0.1,
+            }
+        }
+    )
+    pool = huey_application.storage.pool
+    assert isinstance(pool, redis.BlockingConnectionPool)
+    monkeypatch.setattr(pool, "connection_class", _fake_connection)
+    connection = pool.get_connection("GET")
+    with pytest.raises(redis.ConnectionError):
+        pool.get_connection("GET")
+    assert flasynk.huey_specifics.pool_statistics(huey_application)["in_use"] == 1
+    pool.release(connection)
+    statistics = flasynk.huey_specifics.pool_statistics(huey_application)
+    assert statistics["in_use"] == 0
+    assert statistics["idle"] == 1
+    assert statistics["acquisitions"] == 1
+
+
+def _huey_application_with_mocked_redis():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    huey_application.storage.conn = mock.MagicMock()
+    return huey_application
+
+
+def test_progress_is_reported():
+    huey_application = _huey_application_with_mocked_redis()
+    flasynk.huey_specifics.report_progress(
+        huey_application, "42", percent=50, stage="download", files=3
+    )
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    key = f"huey.flasynk.{huey_application.name}.42"
+    pipeline.hset.assert_any_call(
+        key,
+        "progress",
+        '{"percent": 50, "stage": "download", "counters": {"files": 3}}',
+    )
+    assert pipeline.hset.call_args[0][:2] == (key, "updated")
+    assert pipeline.hset.call_args[0][2] == pytest.approx(time.time(), abs=5)
+    pipeline.expire.assert_called_once_with(key, 24 * 60 * 60)
+    pipeline.execute.assert_called_once_with()
+
+
+def test_falsy_progress_is_reported():
+    huey_application = _huey_application_with_mocked_redis()
+    flasynk.huey_specifics.report_progress(huey_application, "42", percent=0, stage="")
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.hset.assert_any_call(
+        f"huey.flasynk.{huey_application.name}.42",
+        "progress",
+        '{"percent": 0, "stage": ""}',
+    )
+
+
+def test_progress_is_provided_with_status():
+    huey_application = _huey_application_with_mocked_redis()
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [0, {b"progress": b'{"percent": 50}'}]
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"), huey_application
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    response = application.test_client().get("/foo/bar/status/42")
+    assert response.status_code == 200
+    assert response.json == {"state": "PENDING", "progress": {"percent": 50}}
+    pipeline.hgetall.assert_called_once_with(f"huey.flasynk.{huey_application.name}.42")
+
+    pipeline.execute.return_value = [0, {}]
+    response = application.test_client().get("/foo/bar/status/42")
+    assert response.json == {"state": "PENDING"}
+
+
+def test_progress_is_not_reported_in_immediate_mode():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    flasynk.huey_specifics.report_progress(huey_application, "42", percent=50)
+    huey_task = flasynk.huey_specifics._get_asynchronous_task("42", huey_application)
+    assert flasynk.huey_specifics._get_task_details(huey_application, huey_task) == {}
+
+
+def _recorded_states(huey_application) -> list:
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    return [
+        (name, args[2])
+        for name, args, _ in pipeline.mock_calls
+        if name in ("hset", "hsetnx") and args[1] == "state"
+    ]
+
+
+def test_task_states_are_recorded():
+    huey_application = _huey_application_with_mocked_redis()
+
+    @huey_application.task()
+    def succeeding_task():
+        return 1
+
+    # Task is not revoked
+    huey_application.storage.peek_data = mock.Mock(
+        return_value=huey.constants.EmptyData
+    )
+    huey_application.storage.pop_data = mock.Mock(return_value=huey.constants.EmptyData)
+    # Timestamps are not stored by mocked Redis
+    huey_application.storage.conn.hmget.return_value = [None, None]
+    task = succeeding_task.s()
+    huey_application.enqueue(task)
+    huey_application.execute(task)
+    assert _recorded_states(huey_application) == [
+        ("hsetnx", "PENDING"),
+        ("hset", "STARTED"),
+        ("hset", "SUCCESS"),
+    ]
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.expire.assert_called_with(
+        f"huey.flasynk.{huey_application.name}.{task.id}", 24 * 60 * 60
+    )
+
+
+def test_retried_task_state_is_recorded():
+    huey_application = _huey_application_with_mocked_redis()
+
+    @huey_application.task(retries=1)
+    def failing_task():
+        raise Exception("Failure")
+
+    # Task is not revoked
+    huey_application.storage.peek_data = mock.Mock(
+        return_value=huey.constants.EmptyData
+    )
+    huey_application.storage.pop_data = mock.Mock(return_value=huey.constants.EmptyData)
+    task = failing_task.s()
+    huey_application.execute(task)
+    # Requeued task keeps its RETRY state
+    assert _recorded_states(huey_application) == [
+        ("hset", "STARTED"),
+        ("hset", "FAILURE"),
+        ("hset", "RETRY"),
+        ("hsetnx", "PENDING"),
+    ]
+
+
+def test_every_huey_signal_is_recorded():
+    assert set(flasynk.huey_specifics._SIGNAL_STATES) == {
+        value
+        for name, value in vars(huey.signals).items()
+        if name.startswith("SIGNAL_")
+    }
+
+
+def test_task_state_is_provided_with_status():
+    huey_application = _huey_application_with_mocked_redis()
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [0, {b"state": b"STARTED"}]
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"), huey_application
+    )
+
+    @ns.asynchronous_route("/bar")
+    class TestEndpoint(Resource):
+        pass
+
+    response = application.test_client().get("/foo/bar/status/42")
+    assert response.status_code == 200
+    assert response.json == {"state": "STARTED"}
+    # Result existence and task details are retrieved in a single round trip
+    pipeline.hgetall.assert_called_once_with(f"huey.flasynk.{huey_application.name}.42")
+    pipeline.execute.assert_called_once_with()
+    huey_application.storage.conn.hgetall.assert_not_called()
+
+
+def test_task_timestamps_and_durations_are_recorded():
+    huey_application = _huey_application_with_mocked_redis()
+
+    @huey_application.task()
+    def timed_task():
+        pass
+
+    task = timed_task.s()
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    key = f"huey.flasynk.{huey_application.name}.{task.id}"
+    flasynk.huey_specifics._task_signal(
+        huey_application, huey.signals.SIGNAL_ENQUEUED, task
+    )
+    pipeline.hset.assert_any_call(key, "name", task.name)
+    flasynk.huey_specifics._task_signal(
+        huey_application, huey.signals.SIGNAL_EXECUTING, task
+    )
+    assert [args[1] for args, _ in pipeline.hset.call_args_list] == [
+        "enqueued",
+        "name",
+        "updated",
+        "state",
+        "started",
+        "updated",
+    ]
+
+    now = time.time()
+    # Task waited 20 seconds in queue (10 < wait <= 30) and is computing for 2 seconds (1 < run <= 2.5)
+    huey_application.storage.conn.hmget.return_value = [
+        str(now - 22).encode(),
+        str(now - 2).encode(),
+    ]
+    flasynk.huey_specifics._task_signal(
+        huey_application, huey.signals.SIGNAL_COMPLETE, task
+    )
+    huey_application.storage.conn.hmget.assert_called_once_with(
+        key, "enqueued", "started"
+    )
+    durations_key = (
+        f"huey.flasynk.{huey_application.name}.durations.{task.name}.{int(now // 3600)}"
+    )
+    pipeline.hincrby.assert_has_calls(
+        [mock.call(durations_key, "wait:7", 1), mock.call(durations_key, "run:4", 1)]
+    )
+    pipeline.expire.assert_called_with(durations_key, 2 * 3600)
+
+
+def test_eta_is_provided_with_status():
+    huey_application = _huey_application_with_mocked_redis()
+    now = time.time()
+    task_details = {
+        b"name": b"tests.task",
+        b"state": b"STARTED",
+        b"enqueued": str(now - 3).encode(),
+        b"started": str(now - 2).encode(),
+        b"updated": str(now - 2).encode(),
+    }
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    # No durations for the current window, median running time is 5 seconds
+    histograms = [{}, {b"run:5": b"3", b"run:14": b"2"}]
+    pipeline.execute.side_effect = [[0, task_details], histograms]
+    recent_histograms = flasynk._durations.RecentHistograms()
+
+    huey_task = flasynk.huey_specifics._get_asynchronous_task("42", huey_application)
+    details = flasynk.huey_specifics._get_task_details(
+        huey_application, huey_task, recent_histograms
+    )
+    assert details["enqueued"].timestamp() == pytest.approx(now - 3)
+    assert details["started"].timestamp() == pytest.approx(now - 2)
+    assert details["updated"].timestamp() == pytest.approx(now - 2)
+    assert details["eta"].timestamp() == pytest.approx(now + 3)
+    window = int(now // 3600)
+    pipeline.hgetall.assert_has_calls(
+        [
+            mock.call(
+                f"huey.flasynk.{huey_application.name}.durations.tests.task.{window}"
+            ),
+            mock.call(
+                f"huey.flasynk.{huey_application.name}.durations.tests.task.{window - 1}"
+            ),
+        ]
+    )
+
+    # Recently read durations are not read again
+    assert (
+        flasynk.huey_specifics._get_task_details(
+            huey_application, huey_task, recent_histograms
+        )["eta"]
+        == details["eta"]
+    )
+    assert pipeline.execute.call_count == 2
+
+
+@pytest.fixture
+def sink():
+    return RecordingSink()
+
+
+@pytest.fixture
+def policies():
+    return {
+        "length": MaxQueueLength(2, retry_after=10, refresh_interval=0),
+        "rate": TokenBucket(rate=0.001, capacity=1),
+    }
+
+
+@pytest.fixture
+def features_client(sink, policies):
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    return enhanced_flask_testing.features_client(
+        huey_application,
+        huey_application.task(),
+        lambda task: task(),
+        sink,
+        policies,
+    )
+
+
+def test_streamed_result_is_identical_to_buffered_result(features_client):
+    streamed = features_client.get(assert_result_url(features_client, "/foo/streamed"))
+    buffered = features_client.get(assert_result_url(features_client, "/foo/buffered"))
+    assert streamed.status_code == 200
+    assert streamed.is_streamed
+    assert "Content-Length" not in streamed.headers
+    assert streamed.headers["Content-Type"] == "application/json"
+    assert (
+        streamed.json[:2]
+        == buffered.json
+        == [
+            {"id": 0, "name": "row 0"},
+            {"id": 1, "name": "row 1"},
+        ]
+    )
+    assert streamed.json[2] == {"id": 2, "name": "row 2"}
+    assert streamed.get_data(as_text=True).endswith("]\n")
+
+
+def test_streamed_result_with_mask(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/streamed"),
+        headers={"X-Fields": "name"},
+    )
+    assert response.json == [{"name": "row 0"}, {"name": "row 1"}, {"name": "row 2"}]
+
+
+def test_streamed_result_from_generator(features_client):
+    response = features_client.get(assert_result_url(features_client, "/foo/generated"))
+    assert response.json == [{"id": 0, "name": None}, {"id": 1, "name": None}]
+
+
+def test_streamed_result_is_documented_as_a_list(features_client):
+    paths = features_client.get("/swagger.json").json["paths"]
+    assert (
+        paths["/foo/streamed/result/{task_id}"]["get"]["responses"]["200"]
+        == paths["/foo/buffered/result/{task_id}"]["get"]["responses"]["200"]
+        == {
+            "description": "Success",
+            "schema": {"type": "array", "items": {"$ref": "#/definitions/RowModel"}},
+        }
+    )
+
+
+def test_only_lists_can_be_streamed():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(Flask(__name__)).namespace("Test space", path="/foo"), huey_application
+    )
+    with pytest.raises(ValueError) as exception_info:
+        ns.asynchronous_route("/bar", stream=True)
+    assert (
+        str(exception_info.value)
+        == "Only results serialized as a list can be streamed."
+    )
+
+
+def _immediate_application():
+    return flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+
+
+def test_measured_backend_provides_every_backend_attribute():
+    sink = RecordingSink()
+    backend = flasynk._asynchronous._Backend(_immediate_application())
+    measured_backend = flasynk._asynchronous._MeasuredBackend(
+        backend, flasynk._asynchronous._RouteMetrics(sink, "/bar")
+    )
+    assert measured_backend.async_app is backend.async_app
+    assert measured_backend.module is flasynk.huey_specifics
+    assert measured_backend.result_read_is_destructive()
+    assert not measured_backend.get_task("42").available
+    assert list(sink.observations) == [
+        ("flasynk_backend_seconds", metric_labels("/bar", operation="get_task"))
+    ]
+
+
+def test_result_is_compressed_when_accepted(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/big"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.status_code == 200
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert int(response.headers["Content-Length"]) == len(response.data)
+    assert json.loads(gzip.decompress(response.data)) == ["a repetitive value"] * 100
+    assert response.headers["ETag"].endswith('-gzip"')
+
+
+def test_compressed_result_is_not_retrieved_again_if_not_modified(features_client):
+    result_url = assert_result_url(features_client, "/foo/big")
+    etag = features_client.get(result_url, headers={"Accept-Encoding": "gzip"}).headers[
+        "ETag"
+    ]
+    response = features_client.get(
+        result_url, headers={"Accept-Encoding": "gzip", "If-None-Match": etag}
+    )
+    assert response.status_code == 304
+    assert response.headers["ETag"] == etag
+
+
+def test_result_is_not_compressed_when_not_accepted(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/big"),
+        headers={"Accept-Encoding": "identity"},
+    )
+    assert response.json == ["a repetitive value"] * 100
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+
+
+def test_small_result_is_not_compressed(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/small"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.json == "small"
+    assert "Content-Encoding" not in response.headers
+
+
+def test_compression_can_be_disabled(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/bar/big"),
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.json == ["a repetitive value"] * 100
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+def test_statuses_are_compressed(features_client):
+    response = features_client.post(
+        "/foo/big/status",
+        json={"task_ids": [f"task {i}" for i in range(10)]},
+        headers={"Accept-Encoding": "gzip"},
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(response.data))["task 0"] == {"state": "PENDING"}
+
+
+def test_result_with_status_code_is_marshalled(features_client):
+    response = features_client.get(assert_result_url(features_client, "/foo/created"))
+    assert response.status_code == 201
+    assert response.json == {"a": "1", "b": "2"}
+
+
+def test_masked_result_is_marshalled(features_client):
+    response = features_client.get(
+        assert_result_url(features_client, "/foo/created"), headers={"X-Fields": "b"}
+    )
+    assert response.json == {"b": "2"}
+
+
+def test_calls_are_shed_when_queue_is_too_long(features_client, policies, monkeypatch):
+    monkeypatch.setattr(
+        flasynk.huey_specifics, "_queue_status", lambda huey_app: (1, None)
+    )
+    assert_202_regex(features_client.get("/foo/big"), "/foo/big/status/.*")
+
+    monkeypatch.setattr(
+        flasynk.huey_specifics, "_queue_status", lambda huey_app: (2, None)
+    )
+    response = features_client.get("/foo/big")
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "10"
+    assert response.json == {"message": "Too many tasks are waiting to be computed."}
+    assert policies["length"].statistics() == {"admitted": 1, "shed": 1}
+
+
+def test_calls_are_admitted_with_actual_queue_status(features_client, policies):
+    assert_202_regex(features_client.get("/foo/big"), "/foo/big/status/.*")
+    assert policies["length"].statistics() == {"admitted": 1, "shed": 0}
+
+
+def test_calls_are_shed_when_too_many_tasks_were_requested(features_client):
+    assert_202_regex(features_client.get("/foo/streamed"), "/foo/streamed/status/.*")
+    response = features_client.get("/foo/streamed")
+    assert response.status_code == 429
+    assert int(response.headers["Retry-After"]) > 900
+    assert response.json == {"message": "Too many tasks were requested."}
+
+
+def test_admission_is_documented(features_client):
+    paths = features_client.get("/swagger.json").json["paths"]
+    assert paths["/foo/big"]["get"]["responses"]["503"] == {
+        "description": "Too many tasks are waiting to be computed.",
+        "headers": {
+            "Retry-After": {
+                "description": "Number of seconds to wait before calling again.",
+                "type": "string",
+            }
+        },
+    }
+    assert "202" in paths["/foo/big"]["get"]["responses"]
+    assert "429" in paths["/foo/streamed"]["get"]["responses"]
+
+
+def test_route_measures(features_client, sink):
+    response = features_client.get(assert_result_url(features_client, "/foo/buffered"))
+    assert response.json == [{"id": 0, "name": "row 0"}, {"id": 1, "name": "row 1"}]
+
+    assert sink.counters == {
+        ("flasynk_tasks_accepted_total", metric_labels("/buffered")): 1,
+        (
+            "flasynk_status_polls_total",
+            metric_labels("/buffered", outcome="available"),
+        ): 1,
+        ("flasynk_results_total", metric_labels("/buffered", code="200")): 1,
+    }
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [1]
+    assert sink.observations[
+        ("flasynk_response_bytes", metric_labels("/buffered"))
+    ] == [len(response.data)]
+    for name, labels in (
+        ("flasynk_backend_seconds", metric_labels("/buffered", operation="get_task")),
+        (
+            "flasynk_backend_seconds",
+            metric_labels("/buffered", operation="get_result"),
+        ),
+        ("flasynk_marshalling_seconds", metric_labels("/buffered")),
+        ("flasynk_to_response_seconds", metric_labels("/buffered")),
+    ):
+        assert len(sink.observations[(name, labels)]) == 1
+        assert sink.observations[(name, labels)][0] >= 0
+
+
+def test_polls_per_task(features_client, sink, monkeypatch):
+    status_url = assert_202_regex(
+        features_client.get("/foo/buffered"), "/foo/buffered/status/.*"
+    )
+    monkeypatch.setattr(flasynk.huey_specifics, "_result_is_available", lambda t: False)
+    assert features_client.get(status_url).status_code == 200
+    assert features_client.get(status_url).status_code == 200
+    monkeypatch.undo()
+    assert_303_regex(features_client.get(status_url), ".*")
+    assert (
+        sink.counters[
+            (
+                "flasynk_status_polls_total",
+                metric_labels("/buffered", outcome="computing"),
+            )
+        ]
+        == 2
+    )
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [3]
+
+
+def test_polls_of_forgotten_tasks(features_client, sink, monkeypatch):
+    monkeypatch.setattr(flasynk._asynchronous._RouteMetrics, "_MAX_TRACKED_TASKS", 1)
+    first_status_url = assert_202_regex(features_client.get("/foo/buffered"), ".*")
+    second_status_url = assert_202_regex(features_client.get("/foo/buffered"), ".*")
+    monkeypatch.setattr(flasynk.huey_specifics, "_result_is_available", lambda t: False)
+    features_client.get(first_status_url)
+    features_client.get(second_status_url)
+    monkeypatch.setattr(flasynk.huey_specifics, "_result_is_available", lambda t: True)
+    features_client.get(first_status_url)
+    features_client.get(second_status_url)
+    # First task was forgotten
+    assert sink.observations[
+        ("flasynk_status_polls_per_task", metric_labels("/buffered"))
+    ] == [1, 2]
+
+
+def test_streamed_route_measures(features_client, sink):
+    status_url = assert_202_regex(
+        features_client.get("/foo/streamed"), "/foo/streamed/status/.*"
+    )
+    assert features_client.get("/foo/streamed").status_code == 429
+    result_url = assert_303_regex(features_client.get(status_url), ".*")
+    assert len(features_client.get(result_url).json) == 3
+    for decision in ("admitted", "shed"):
+        assert (
+            sink.counters[
+                (
+                    "flasynk_admissions_total",
+                    metric_labels("/streamed", decision=decision),
+                )
+            ]
+            == 1
+        )
+    assert (
+        sink.counters[("flasynk_tasks_accepted_total", metric_labels("/streamed"))] == 1
+    )
+    assert (
+        len(
+            sink.observations[
+                ("flasynk_marshalling_seconds", metric_labels("/streamed"))
+            ]
+        )
+        == 1
+    )
+    # Size of streamed responses is unknown
+    assert (
+        "flasynk_response_bytes",
+        metric_labels("/streamed"),
+    ) not in sink.observations
+
+
+def test_failed_result_is_measured(features_client, sink):
+    response = features_client.get(assert_result_url(features_client, "/foo/failure"))
+    assert response.status_code == 500
+    assert (
+        sink.counters[("flasynk_results_total", metric_labels("/failure", code="500"))]
+        == 1
+    )
+
+
+def _retention_client(huey_application, retention, result_cache=None):
+    application = Flask(__name__)
+    ns = flasynk.AsyncNamespaceProxy(
+        Api(application).namespace("Test space", path="/foo"),
+        huey_application,
+        result_cache=result_cache,
+    )
+
+    @huey_application.task()
+    def compute():
+        return 3
+
+    @ns.asynchronous_route("/bar", retention=retention)
+    class TestEndpoint(Resource):
+        def get(self):
+            return flasynk.how_to_get_asynchronous_status(compute())
+
+    return application.test_client()
+
+
+def test_result_is_removed_after_reads():
+    huey_application = _immediate_application()
+    client = _retention_client(huey_application, DeleteAfterReads(2))
+    result_url = assert_result_url(client, "/foo/bar")
+    assert client.get(result_url).json == 3
+    assert huey_application.storage.has_data_for_key(result_url.split("/")[-1])
+    # Client can retry (after a dropped connection for instance)
+    assert client.get(result_url).json == 3
+    assert not huey_application.storage.has_data_for_key(result_url.split("/")[-1])
+
+
+def test_result_served_from_cache_is_counted_as_read():
+    huey_application = _immediate_application()
+    client = _retention_client(
+        huey_application, DeleteOnRead(), result_cache=ResultCache()
+    )
+    result_url = assert_result_url(client, "/foo/bar")
+    assert client.get(result_url).json == 3
+    assert not huey_application.storage.has_data_for_key(result_url.split("/")[-1])
+
+
+def test_result_is_kept_for_some_time_once_read():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/", "result_expiry": 3600}}
+    )
+    assert isinstance(huey_application, huey.RedisExpireHuey)
+    assert huey_application.storage._expire_time == 3600
+    huey_application.storage.conn = mock.MagicMock()
+    huey_application.storage.peek_data = mock.Mock(
+        return_value=huey_application.serializer.serialize(3)
+    )
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    details_key = f"huey.flasynk.{huey_application.name}.42"
+    retention = KeepFor(60)
+
+    pipeline.execute.return_value = [1, True]
+    assert (
+        flasynk.huey_specifics._get_retained_result(huey_application, "42", retention)
+        == 3
+    )
+    pipeline.hincrby.assert_called_once_with(details_key, "reads", 1)
+    huey_application.storage.conn.expire.assert_called_once_with(
+        huey_application.storage.result_key("42"), 60
+    )
+
+    # Expiry is only set once
+    pipeline.execute.return_value = [2, True]
+    assert (
+        flasynk.huey_specifics._get_retained_result(huey_application, "42", retention)
+        == 3
+    )
+    huey_application.storage.conn.expire.assert_called_once()
+
+
+def test_redis_result_is_removed_once_read():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    huey_application.storage.conn = mock.MagicMock()
+    huey_application.storage.peek_data = mock.Mock(
+        return_value=huey_application.serializer.serialize(
+            huey.utils.Error({"error": "ValueError('Invalid value')"})
+        )
+    )
+    huey_application.storage.conn.pipeline.return_value.execute.return_value = [
+        1,
+        True,
+    ]
+    with pytest.raises(ValueError, match="Invalid value"):
+        flasynk.huey_specifics._get_retained_result(
+            huey_application, "42", DeleteOnRead()
+        )
+    huey_application.storage.conn.hdel.assert_called_once_with(
+        huey_application.storage.result_key, "42"
+    )
+
+
+def test_missing_result_is_not_counted_as_read():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    huey_application.storage.conn = mock.MagicMock()
+    huey_application.storage.peek_data = mock.Mock(
+        return_value=huey.constants.EmptyData
+    )
+    with pytest.raises(flasynk.exceptions.ResultNotAvailable):
+        flasynk.huey_specifics._get_retained_result(
+            huey_application, "42", DeleteOnRead()
+        )
+    huey_application.storage.conn.pipeline.assert_not_called()
+
+
+def test_keep_for_requires_results_expiry():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    with pytest.raises(ValueError) as exception_info:
+        _retention_client(huey_application, KeepFor(60))
+    assert (
+        str(exception_info.value)
+        == "KeepFor requires results to be stored with an expiry (result_expiry)."
+    )
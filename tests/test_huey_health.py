@@ -0,0 +1,98 @@
+import time
+import unittest.mock as mock
+
+import pytest
+import redis
+
+import flasynk.huey_specifics
+
+
+@pytest.fixture
+def huey_application():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    huey_application.storage.conn = mock.MagicMock()
+    return huey_application
+
+
+def _queued_task(huey_application):
+    @huey_application.task()
+    def queued_task():
+        pass
+
+    return queued_task.s()
+
+
+def test_enqueue_time_is_recorded(huey_application):
+    task = _queued_task(huey_application)
+    huey_application.enqueue(task)
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    key = f"huey.flasynk.{huey_application.name}.{task.id}"
+    assert pipeline.hset.call_args_list[0][0][:2] == (key, "enqueued")
+    assert pipeline.hset.call_args_list[0][0][2] == pytest.approx(time.time(), abs=5)
+    pipeline.expire.assert_called_once_with(key, 24 * 60 * 60)
+    pipeline.execute.assert_called_once_with()
+
+
+def test_enqueue_time_is_not_recorded_in_immediate_mode():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+    huey_application.enqueue(_queued_task(huey_application))
+
+
+def test_health_details_with_queued_tasks(huey_application):
+    task = _queued_task(huey_application)
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [2, huey_application.serialize_task(task)]
+    huey_application.storage.conn.hget.return_value = str(time.time() - 5).encode()
+
+    status, details = flasynk.huey_specifics.health_details(huey_application)
+    assert status == "pass"
+    pipeline.llen.assert_called_once_with(huey_application.storage.queue_key)
+    pipeline.lindex.assert_called_once_with(huey_application.storage.queue_key, -1)
+    huey_application.storage.conn.hget.assert_called_once_with(
+        f"huey.flasynk.{huey_application.name}.{task.id}", "enqueued"
+    )
+    assert details["huey:queueLength"]["observedValue"] == 2
+    assert details["huey:queueWait"]["observedValue"] == pytest.approx(5, abs=1)
+    assert details["huey:queueWait"]["observedUnit"] == "s"
+    assert details["huey:responseTime"]["observedValue"] >= 0
+    assert details["huey:responseTime"]["observedUnit"] == "ms"
+    assert {detail["status"] for detail in details.values()} == {"pass"}
+
+
+def test_health_details_with_empty_queue(huey_application):
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [0, None]
+
+    status, details = flasynk.huey_specifics.health_details(huey_application)
+    assert status == "pass"
+    assert details["huey:queueLength"]["observedValue"] == 0
+    assert details["huey:queueWait"]["observedValue"] == 0
+    huey_application.storage.conn.hget.assert_not_called()
+
+
+def test_health_details_with_unknown_enqueue_time(huey_application):
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.return_value = [
+        1,
+        huey_application.serialize_task(_queued_task(huey_application)),
+    ]
+    huey_application.storage.conn.hget.return_value = None
+
+    status, details = flasynk.huey_specifics.health_details(huey_application)
+    assert status == "pass"
+    assert details["huey:queueLength"]["observedValue"] == 1
+    assert "huey:queueWait" not in details
+
+
+def test_health_details_without_redis(huey_application):
+    pipeline = huey_application.storage.conn.pipeline.return_value
+    pipeline.execute.side_effect = redis.ConnectionError("Redis is down")
+
+    status, details = flasynk.huey_specifics.health_details(huey_application)
+    assert status == "fail"
+    assert details["huey:responseTime"]["status"] == "fail"
+    assert details["huey:responseTime"]["output"] == "Redis is down"
@@ -0,0 +1,68 @@
+import subprocess
+import sys
+
+import pytest
+
+
+def _import(module: str) -> (int, set):
+    """
+    Import module in a new interpreter.
+    :return: Import time (in microseconds) of flasynk own modules and every imported module.
+    Time spent importing third party modules (such as celery) is not counted as it depends on the machine load.
+    """
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            f"import sys, {module}; print(' '.join(sys.modules))",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    import_times = [
+        line[len("import time:") :].split("|")
+        for line in process.stderr.splitlines()
+        if line.startswith("import time:")
+    ]
+    flasynk_time = sum(
+        int(self_time)
+        for self_time, _, name in import_times
+        if name.strip().split(".")[0] == "flasynk"
+    )
+    return flasynk_time, set(process.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "module, not_imported",
+    [
+        ("flasynk", {"flask", "flask_restplus", "celery", "huey"}),
+        ("flasynk.celery_specifics", {"flask", "huey", "celery.task"}),
+        ("flasynk.celery_mock", {"flask", "huey", "celery.task"}),
+        ("flasynk.huey_specifics", {"flask", "celery"}),
+    ],
+)
+def test_import_time_budget(module, not_imported):
+    import_time, imported_modules = _import(module)
+    # Generous budget, flasynk modules only define functions and classes
+    assert import_time < 100_000
+    assert not imported_modules & not_imported
+
+
+def test_async_result_is_only_mocked_once_celery_mock_is_used():
+    process = subprocess.run(
+        [
+            sys.executable,
+            "-c",
+            "import celery, celery.result, flasynk.celery_mock; "
+            "print(celery.result.AsyncResult is flasynk.celery_mock._async_result_stub); "
+            "flasynk.celery_mock.CeleryMock(celery.Celery()); "
+            "print(celery.result.AsyncResult is flasynk.celery_mock._async_result_stub)",
+        ],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout.split() == ["False", "True"]
@@ -0,0 +1,129 @@
+import datetime
+import decimal
+import sys
+import unittest.mock as mock
+import uuid
+
+import pytest
+from flask import Flask
+from flask_restplus import Api, Resource
+
+import flasynk
+import flasynk.celery_mock
+import flasynk.celery_specifics
+import flasynk.json_encoding
+from tests.enhanced_flask_testing import assert_202_regex, assert_303_regex
+
+
+@pytest.fixture
+def app():
+    application = Flask(__name__)
+    application.testing = True
+    api = Api(application)
+    celery_application = flasynk.celery_mock.CeleryMock(
+        flasynk.celery_specifics.build_async_application(
+            {"celery": {"broker": "memory://localhost/", "backend": "memory://"}}
+        )
+    )
+    namespace = flasynk.AsyncNamespaceProxy(
+        api.namespace("Foo", path="/foo"), celery_application
+    )
+
+    @namespace.asynchronous_route("/values")
+    class ValuesEndpoint(Resource):
+        def get(self):
+            @celery_application.task(queue=celery_application.namespace)
+            def fetch_the_answer():
+                return {
+                    "datetime": datetime.datetime(2020, 1, 2, 3, 4, 5),
+                    "date": datetime.date(2020, 1, 2),
+                    "time": datetime.time(3, 4, 5),
+                    "uuid": uuid.UUID("12345678123456781234567812345678"),
+                    "decimal": decimal.Decimal("1.10"),
+                }
+
+            return flasynk.how_to_get_asynchronous_status(
+                fetch_the_answer.apply_async()
+            )
+
+    return application
+
+
+@pytest.fixture
+def json_dumps():
+    stdlib_dumps = flasynk.json_encoding.dumps
+    json_dumps = mock.Mock(wraps=stdlib_dumps)
+    flasynk.json_encoding.set_dumps(json_dumps)
+    yield json_dumps
+    flasynk.json_encoding.set_dumps(stdlib_dumps)
+
+
+def test_extra_types_are_encoded(client):
+    status_url = assert_202_regex(client.get("/foo/values"), "/foo/values/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/foo/values/result/.*")
+    response = client.get(result_url)
+    assert response.headers["Content-Type"] == "application/json"
+    assert response.get_data(as_text=True).endswith("\n")
+    assert response.json == {
+        "datetime": "2020-01-02T03:04:05",
+        "date": "2020-01-02",
+        "time": "03:04:05",
+        "uuid": "12345678-1234-5678-1234-567812345678",
+        "decimal": "1.10",
+    }
+
+
+def test_provided_encoder_is_used_for_every_response(client, json_dumps):
+    response = client.get("/foo/values")
+    status_url = assert_202_regex(response, "/foo/values/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/foo/values/result/.*")
+    client.get(result_url)
+    client.get("/foo/values/status/unknown")
+    client.post("/foo/values/status", json={"task_ids": ["unknown"]})
+    assert [call.args[0] for call in json_dumps.call_args_list] == [
+        response.json,
+        mock.ANY,
+        {"state": "PENDING"},
+        {"unknown": {"state": "PENDING"}},
+    ]
+
+
+def test_extra_types_are_encoded_by_standard_json_module():
+    assert (
+        flasynk.json_encoding.stdlib_dumps(
+            {"date": datetime.date(2020, 1, 2), "decimal": decimal.Decimal("1.10")}
+        )
+        == '{"date": "2020-01-02", "decimal": "1.10"}'
+    )
+
+
+def test_unknown_types_are_not_encoded():
+    with pytest.raises(TypeError) as exception_info:
+        flasynk.json_encoding.stdlib_dumps({"value": object()})
+    assert str(exception_info.value) == "Object of type object is not JSON serializable"
+
+
+def test_orjson_is_used_if_installed(monkeypatch):
+    orjson = mock.Mock()
+    orjson.dumps.return_value = b'{"value":1}'
+    monkeypatch.setitem(sys.modules, "orjson", orjson)
+    json_dumps = flasynk.json_encoding._fastest_dumps()
+    assert json_dumps({"value": 1}) == '{"value":1}'
+    orjson.dumps.assert_called_once_with(
+        {"value": 1},
+        default=flasynk.json_encoding._default,
+        option=orjson.OPT_NON_STR_KEYS,
+    )
+
+
+def test_stdlib_is_used_if_orjson_cannot_encode(monkeypatch):
+    orjson = mock.Mock()
+    orjson.dumps.side_effect = TypeError("Integer exceeds 64-bit range")
+    monkeypatch.setitem(sys.modules, "orjson", orjson)
+    json_dumps = flasynk.json_encoding._fastest_dumps()
+    assert json_dumps({1: 2**64}) == '{"1": 18446744073709551616}'
+
+
+def test_stdlib_is_used_if_orjson_is_not_installed(monkeypatch):
+    monkeypatch.setitem(sys.modules, "orjson", None)
+    assert flasynk.json_encoding._fastest_dumps() is flasynk.json_encoding.stdlib_dumps
@@ -0,0 +1,118 @@
+import collections
+import datetime
+import timeit
+
+import pytest
+from flask_restplus import Api, Mask, fields, marshal
+
+import flasynk._marshalling
+
+
+api = Api()
+address_model = api.model(
+    "Address", {"street": fields.String, "number": fields.Integer(default=1)}
+)
+person_model = api.model(
+    "Person",
+    {
+        "name": fields.String(required=True),
+        "age": fields.Integer,
+        "ratio": fields.Float,
+        "active": fields.Boolean,
+        "birth": fields.DateTime(dt_format="iso8601"),
+        "city": fields.String(attribute="address.city"),
+        "computed": fields.String(attribute=lambda person: "computed"),
+        "address": fields.Nested(address_model, allow_null=True),
+        "previous_address": fields.Nested(address_model, skip_none=True),
+        "default_address": fields.Nested(address_model, default={"street": "none"}),
+        "addresses": fields.List(fields.Nested(address_model)),
+        "tags": fields.List(fields.String),
+        "price": fields.Fixed(decimals=2),
+        "raw": {"inner": fields.String(attribute="name")},
+        "masked": fields.Raw(mask=Mask("a")),
+    },
+)
+employee_model = api.inherit("Employee", person_model, {"company": fields.String})
+tree_model = api.model(
+    "Tree", {"name": fields.String, "kind": fields.String(discriminator=True)}
+)
+tree_model["children"] = fields.List(fields.Nested(tree_model))
+wildcard_model = api.model("Wildcard", {"*": fields.Wildcard(fields.String)})
+masked_model = api.model("Masked", {"a": fields.String, "b": fields.String}, mask="a")
+
+
+def _person(index: int) -> dict:
+    return {
+        "name": f"person {index}",
+        "age": str(index),
+        "ratio": index / 3,
+        "active": index % 2,
+        "birth": datetime.datetime(2020, 1, 2, 3, 4, 5),
+        "address": {"street": "Main street", "number": index, "city": "Paris"}
+        if index % 3
+        else None,
+        "previous_address": {"street": None},
+        "addresses": [{"street": "First"}, {"street": "Second", "number": 3}],
+        "tags": {"a"} if index % 2 else ["a", 2, None],
+        "price": index * 1.5,
+        "company": "company",
+        "masked": {"a": 1, "b": 2},
+    }
+
+
+@pytest.mark.parametrize("model", [person_model, employee_model])
+@pytest.mark.parametrize("ordered", [False, True])
+def test_compiled_marshalling_is_identical(model, ordered):
+    persons = [_person(index) for index in range(10)]
+    compiled = flasynk._marshalling.compile_model(model, ordered=ordered)
+    assert compiled(persons) == marshal(persons, model, ordered=ordered)
+    assert compiled(persons[1]) == marshal(persons[1], model, ordered=ordered)
+    assert isinstance(compiled(persons[1]), collections.OrderedDict) == ordered
+
+
+def test_compiled_marshalling_of_missing_values():
+    compiled = flasynk._marshalling.compile_model(person_model, skip_none=True)
+    assert compiled({"name": "a", "addresses": {"street": "single"}}) == marshal(
+        {"name": "a", "addresses": {"street": "single"}}, person_model, skip_none=True
+    )
+    assert compiled(None) == marshal(None, person_model, skip_none=True)
+
+
+def test_compiled_marshalling_of_objects():
+    class Address:
+        street = "Main street"
+        number = 3
+
+    compiled = flasynk._marshalling.compile_model(address_model)
+    assert compiled(Address()) == marshal(Address(), address_model)
+
+
+def test_compiled_marshalling_of_recursive_model():
+    tree = {"name": "root", "children": [{"name": "leaf", "children": []}]}
+    compiled = flasynk._marshalling.compile_model(tree_model)
+    assert compiled(tree) == marshal(tree, tree_model)
+
+
+@pytest.mark.parametrize("model", [wildcard_model, masked_model])
+def test_wildcards_and_masks_are_not_compiled(model):
+    compiled = flasynk._marshalling.compile_model(model)
+    assert compiled({"a": "1", "b": "2"}) == marshal({"a": "1", "b": "2"}, model)
+
+
+def test_compiled_marshalling_errors_are_identical():
+    compiled = flasynk._marshalling.compile_model(address_model)
+    with pytest.raises(fields.MarshallingError) as compiled_error:
+        compiled({"number": "not a number"})
+    with pytest.raises(fields.MarshallingError) as standard_error:
+        marshal({"number": "not a number"}, address_model)
+    assert str(compiled_error.value) == str(standard_error.value)
+
+
+def test_compiled_marshalling_is_faster():
+    persons = [_person(index) for index in range(500)]
+    compiled = flasynk._marshalling.compile_model(employee_model)
+    compiled_duration = min(timeit.repeat(lambda: compiled(persons), number=3))
+    standard_duration = min(
+        timeit.repeat(lambda: marshal(persons, employee_model), number=3)
+    )
+    assert compiled_duration < standard_duration
@@ -0,0 +1,77 @@
+import flask
+
+from flasynk.metrics import MetricsSink, PrometheusMetrics
+
+
+class RecordingSink(MetricsSink):
+    def __init__(self):
+        self.counters = {}
+        self.observations = {}
+
+    def increment(self, name: str, labels: dict, value: float = 1):
+        key = (name, tuple(sorted(labels.items())))
+        self.counters[key] = self.counters.get(key, 0) + value
+
+    def observe(self, name: str, labels: dict, value: float):
+        key = (name, tuple(sorted(labels.items())))
+        self.observations.setdefault(key, []).append(value)
+
+
+def metric_labels(route: str, **labels) -> tuple:
+    return tuple(sorted({"route": route, **labels}.items()))
+
+
+def test_prometheus_exposition():
+    metrics = PrometheusMetrics()
+    metrics.increment("flasynk_results_total", {"route": "/bar", "code": "200"})
+    metrics.increment("flasynk_results_total", {"route": "/bar", "code": "200"}, 2)
+    metrics.increment("custom_total", {})
+    metrics.observe("flasynk_status_polls_per_task", {"route": '/b"a\\r\n'}, 4)
+    metrics.observe("flasynk_status_polls_per_task", {"route": '/b"a\\r\n'}, 150)
+    assert metrics.exposition() == (
+        "# TYPE custom_total counter\n"
+        "custom_total 1\n"
+        "# TYPE flasynk_results_total counter\n"
+        'flasynk_results_total{code="200",route="/bar"} 3\n'
+        "# TYPE flasynk_status_polls_per_task histogram\n"
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="1"} 0\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="2"} 0\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="3"} 0\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="5"} 1\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="10"} 1\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="20"} 1\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="50"} 1\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="100"} 1\n'
+        'flasynk_status_polls_per_task_bucket{route="/b\\"a\\\\r\\n",le="+Inf"} 2\n'
+        'flasynk_status_polls_per_task_sum{route="/b\\"a\\\\r\\n"} 154\n'
+        'flasynk_status_polls_per_task_count{route="/b\\"a\\\\r\\n"} 2\n'
+    )
+
+
+def test_prometheus_buckets():
+    metrics = PrometheusMetrics()
+    metrics.observe("flasynk_backend_seconds", {}, 0.001)
+    metrics.observe("flasynk_response_bytes", {}, 300)
+    exposition = metrics.exposition()
+    assert 'flasynk_backend_seconds_bucket{le="0.001"} 1\n' in exposition
+    assert 'flasynk_response_bytes_bucket{le="256"} 0\n' in exposition
+    assert 'flasynk_response_bytes_bucket{le="1024"} 1\n' in exposition
+
+
+def test_prometheus_endpoint():
+    application = flask.Flask(__name__)
+    metrics = PrometheusMetrics()
+    metrics.expose(application)
+    metrics.increment("custom_total", {"route": "/bar"})
+    response = application.test_client().get("/metrics")
+    assert response.status_code == 200
+    assert response.content_type == "text/plain; version=0.0.4; charset=utf-8"
+    assert response.get_data(as_text=True) == (
+        '# TYPE custom_total counter\ncustom_total{route="/bar"} 1\n'
+    )
+
+
+def test_default_sink_ignores_measures():
+    sink = MetricsSink()
+    sink.increment("custom_total", {})
+    sink.observe("custom_seconds", {}, 1)
@@ -0,0 +1,242 @@
+import time
+import unittest.mock as mock
+
+import pytest
+from flask import Flask
+from flask_restplus import Api, Resource, fields
+
+import flasynk
+import flasynk.celery_mock
+import flasynk.celery_specifics
+import flasynk.huey_specifics
+import flasynk.result_cache
+from flasynk.result_cache import ResultCache
+from tests.enhanced_flask_testing import assert_202_regex, assert_303_regex
+
+
+@pytest.fixture
+def result_cache():
+    return ResultCache()
+
+
+@pytest.fixture
+def huey_application():
+    return flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}, immediate=True
+    )
+
+
+@pytest.fixture
+def app(result_cache, huey_application):
+    application = Flask(__name__)
+    application.config["PROPAGATE_EXCEPTIONS"] = False
+    application.testing = True
+    api = Api(application)
+
+    huey_ns = flasynk.AsyncNamespaceProxy(
+        api.namespace("Huey", path="/huey"),
+        huey_application,
+        result_cache=result_cache,
+    )
+
+    @huey_ns.asynchronous_route(
+        "/bar",
+        serializer=api.model(
+            "BarModel", {"status": fields.String, "foo": fields.String}
+        ),
+    )
+    class HueyEndpoint(Resource):
+        def get(self):
+            @huey_application.task()
+            def HueyEndpoint_fetch_the_answer():
+                return {"status": "why not", "foo": "bar"}
+
+            return flasynk.how_to_get_asynchronous_status(
+                HueyEndpoint_fetch_the_answer()
+            )
+
+    @huey_ns.errorhandler(Exception)
+    def handle_exception(exception):
+        return {"message": str(exception)}, 500
+
+    @huey_ns.asynchronous_route("/exception")
+    class HueyEndpointException(Resource):
+        def get(self):
+            @huey_application.task()
+            def HueyEndpointException_fetch_the_answer():
+                raise Exception("Exception")
+
+            return flasynk.how_to_get_asynchronous_status(
+                HueyEndpointException_fetch_the_answer()
+            )
+
+    celery_application = flasynk.celery_mock.CeleryMock(
+        flasynk.celery_specifics.build_async_application(
+            {
+                "celery": {
+                    "broker": "memory://localhost/",
+                    "backend": "memory://localhost/",
+                }
+            }
+        )
+    )
+    celery_ns = flasynk.AsyncNamespaceProxy(
+        api.namespace("Celery", path="/celery"),
+        celery_application,
+        result_cache=result_cache,
+    )
+
+    @celery_ns.asynchronous_route("/bar")
+    class CeleryEndpoint(Resource):
+        def get(self):
+            @celery_application.task(queue=celery_application.namespace)
+            def fetch_the_answer():
+                return 3
+
+            return flasynk.how_to_get_asynchronous_status(
+                fetch_the_answer.apply_async()
+            )
+
+    return application
+
+
+def test_huey_result_is_served_from_cache(client, result_cache, huey_application):
+    response = client.get("/huey/bar")
+    status_url = assert_202_regex(response, "/huey/bar/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/huey/bar/result/.*")
+    assert result_cache.statistics()["entries"] == 1
+    # Result is still stored in backend until requested
+    task_id = response.json["task_id"]
+    assert huey_application.storage.has_data_for_key(task_id)
+
+    huey_application.serializer = mock.Mock(wraps=huey_application.serializer)
+    result_reply = client.get(result_url)
+    assert result_reply.status_code == 200
+    assert result_reply.json == {"status": "why not", "foo": "bar"}
+    huey_application.serializer.deserialize.assert_not_called()
+
+    # Huey results can only be read once
+    assert not huey_application.storage.has_data_for_key(task_id)
+    assert result_cache.statistics()["entries"] == 0
+    assert result_cache.hits == 1
+
+
+def test_huey_failure_is_not_cached(client, result_cache):
+    response = client.get("/huey/exception")
+    status_url = assert_202_regex(response, ".*")
+    result_url = assert_303_regex(client.get(status_url), ".*")
+    assert result_cache.statistics()["entries"] == 0
+    result_reply = client.get(result_url)
+    assert result_reply.status_code == 500
+    assert result_reply.json == {"message": "Exception"}
+    assert result_cache.misses == 1
+
+
+def test_celery_result_is_served_from_cache_until_expiry(
+    client, result_cache, monkeypatch
+):
+    response = client.get("/celery/bar")
+    status_url = assert_202_regex(response, "/celery/bar/status/.*")
+    result_url = assert_303_regex(client.get(status_url), "/celery/bar/result/.*")
+    assert client.get(result_url).get_data(as_text=True) == "3\n"
+    assert client.get(result_url).get_data(as_text=True) == "3\n"
+    assert result_cache.hits == 2
+
+    # Cached result expired before status is checked again
+    now = time.monotonic()
+    monkeypatch.setattr(flasynk.result_cache.time, "monotonic", lambda: now + 61)
+    result_cache.ttl = -1
+    assert_303_regex(client.get(status_url), "/celery/bar/result/.*")
+    assert client.get(result_url).get_data(as_text=True) == "3\n"
+    assert result_cache.misses == 1
+
+
+def test_least_recently_used_results_are_evicted():
+    result_cache = ResultCache(max_bytes=10, sizeof=len)
+    assert result_cache.put("1", "1234")
+    assert result_cache.put("2", "1234")
+    assert result_cache.get("1") == "1234"
+    assert result_cache.put("3", "1234")
+    assert result_cache.get("2") is None
+    assert result_cache.get("1") == "1234"
+    assert result_cache.get("3") == "1234"
+    assert result_cache.statistics() == {
+        "entries": 2,
+        "size": 8,
+        "max_bytes": 10,
+        "hits": 3,
+        "misses": 1,
+        "evictions": 1,
+    }
+
+
+def test_results_bigger_than_cache_are_not_cached():
+    result_cache = ResultCache(max_bytes=10, sizeof=len)
+    assert not result_cache.put("1", "12345678901")
+    assert result_cache.pop("1", "default") == "default"
+
+
+def test_cached_result_replacement():
+    result_cache = ResultCache(max_bytes=10, sizeof=len)
+    result_cache.put("1", "1234")
+    result_cache.put("1", "123")
+    assert result_cache.statistics()["size"] == 3
+    result_cache.clear()
+    assert result_cache.statistics()["size"] == 0
+    assert result_cache.get("1") is None
+
+
+def test_default_result_size():
+    result_cache = ResultCache()
+    item = {"name": "x" * 1000}
+    assert result_cache.put("1", [item, item])
+    # Content is counted (once)
+    assert 1000 < result_cache.statistics()["size"] < 2000
+    assert result_cache.put("2", lambda: None)
+    assert result_cache.statistics()["entries"] == 2
+
+
+def test_cached_result_membership_is_not_counted():
+    result_cache = ResultCache(sizeof=len)
+    result_cache.put("1", "1234")
+    assert "1" in result_cache
+    assert "2" not in result_cache
+    assert result_cache.hits == result_cache.misses == 0
+    result_cache.ttl = -1
+    result_cache.put("1", "1234")
+    assert "1" not in result_cache
+
+
+def test_cached_result_is_not_retrieved_again_on_status(
+    client, result_cache, monkeypatch
+):
+    peek = mock.Mock(wraps=flasynk.celery_specifics._peek_asynchronous_result)
+    monkeypatch.setattr(flasynk.celery_specifics, "_peek_asynchronous_result", peek)
+    response = client.get("/celery/bar")
+    status_url = assert_202_regex(response, "/celery/bar/status/.*")
+    assert_303_regex(client.get(status_url), "/celery/bar/result/.*")
+    assert_303_regex(client.get(status_url), "/celery/bar/result/.*")
+    peek.assert_called_once_with(mock.ANY, response.json["task_id"])
+    assert result_cache.hits == result_cache.misses == 0
+
+
+def test_huey_redis_result_is_discarded_without_transfer():
+    huey_application = flasynk.huey_specifics.build_async_application(
+        {"asynchronous": {"broker": "redis://localhost/"}}
+    )
+    huey_application.storage.conn = mock.MagicMock()
+    flasynk.huey_specifics._discard_asynchronous_result(huey_application, "42")
+    huey_application.storage.conn.hdel.assert_called_once_with(
+        huey_application.storage.result_key, "42"
+    )
+
+
+def test_expired_results_are_removed_when_caching():
+    result_cache = ResultCache(ttl=-1, sizeof=len)
+    result_cache.put("1", "1234")
+    result_cache.ttl = 60
+    result_cache.put("2", "12")
+    assert result_cache.statistics()["entries"] == 1
+    assert result_cache.statistics()["size"] == 2
+    result_cache.put("3", "1")
+    assert result_cache.statistics()["entries"] == 2
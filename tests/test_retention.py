@@ -0,0 +1,13 @@
+import pytest
+
+from flasynk.retention import DeleteAfterReads, DeleteOnRead, KeepFor, RetentionPolicy
+
+
+def test_policies():
+    assert KeepFor(60).after_read(1) == 60
+    assert KeepFor(60).after_read(2) is None
+    assert DeleteAfterReads(2).after_read(1) is None
+    assert DeleteAfterReads(2).after_read(2) == 0
+    assert DeleteOnRead().after_read(1) == 0
+    with pytest.raises(NotImplementedError):
+        RetentionPolicy().after_read(1)